@@ -0,0 +1,99 @@
+"""
+Benchmark of :mod:`prometeo.sat.parser` on synthetic CFDI 4.0 xmls.
+
+Compares a naive DOM parse with ``parse_cfdi`` and the process pool mode of
+``parse_many``::
+
+    python benchmarks/cfdi_parser.py --bills 5000 --concepts 20
+"""
+
+import argparse
+import os
+import sys
+import time
+from xml.dom import minidom
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from prometeo.sat.parser import parse_many  # noqa: E402
+
+
+CONCEPT = (
+    '<cfdi:Concepto ClaveProdServ="43232408" Cantidad="{quantity}" '
+    'ClaveUnidad="E48" Descripcion="Producto {index}" ValorUnitario="100.00" '
+    'Importe="{amount}.00" ObjetoImp="02"><cfdi:Impuestos><cfdi:Traslados>'
+    '<cfdi:Traslado Base="{amount}.00" Impuesto="002" TipoFactor="Tasa" '
+    'TasaOCuota="0.160000" Importe="16.00"/></cfdi:Traslados></cfdi:Impuestos>'
+    "</cfdi:Concepto>"
+)
+
+BILL = (
+    '<?xml version="1.0" encoding="UTF-8"?>'
+    '<cfdi:Comprobante xmlns:cfdi="http://www.sat.gob.mx/cfd/4" '
+    'xmlns:tfd="http://www.sat.gob.mx/TimbreFiscalDigital" Version="4.0" '
+    'Folio="{index}" Fecha="2023-03-14T10:21:05" SubTotal="1000.00" '
+    'Moneda="MXN" Total="1160.00" TipoDeComprobante="I" LugarExpedicion="06600">'
+    '<cfdi:Emisor Rfc="EKU9003173C9" Nombre="EMISOR" RegimenFiscal="601"/>'
+    '<cfdi:Receptor Rfc="XAXX010101000" Nombre="RECEPTOR" UsoCFDI="G03"/>'
+    "<cfdi:Conceptos>{concepts}</cfdi:Conceptos>"
+    '<cfdi:Impuestos TotalImpuestosTrasladados="160.00"><cfdi:Traslados>'
+    '<cfdi:Traslado Base="1000.00" Impuesto="002" TipoFactor="Tasa" '
+    'TasaOCuota="0.160000" Importe="160.00"/></cfdi:Traslados></cfdi:Impuestos>'
+    '<cfdi:Complemento><tfd:TimbreFiscalDigital Version="1.1" '
+    'UUID="00000000-0000-4000-8000-{index:012d}" '
+    'FechaTimbrado="2023-03-14T10:21:09" RfcProvCertif="SAT970701NN3"/>'
+    "</cfdi:Complemento></cfdi:Comprobante>"
+)
+
+
+def make_bills(count, concepts):
+    return [
+        BILL.format(
+            index=index,
+            concepts="".join(
+                CONCEPT.format(index=i, quantity=i + 1, amount=(i + 1) * 100)
+                for i in range(concepts)
+            ),
+        ).encode()
+        for index in range(count)
+    ]
+
+
+def dom_parse(content):
+    document = minidom.parseString(content)
+    root = document.documentElement
+    concepts = [
+        dict(concept.attributes.items())
+        for concept in root.getElementsByTagName("cfdi:Concepto")
+    ]
+    stamp = root.getElementsByTagName("tfd:TimbreFiscalDigital")[0]
+    return stamp.getAttribute("UUID"), dict(root.attributes.items()), concepts
+
+
+def measure(name, count, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<28} {elapsed:8.3f}s {count / elapsed:10.0f} bills/s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bills", type=int, default=2000)
+    parser.add_argument("--concepts", type=int, default=20)
+    parser.add_argument("--processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    bills = make_bills(args.bills, args.concepts)
+    print(f"{args.bills} bills with {args.concepts} concepts each")
+    measure("minidom", args.bills, lambda: [dom_parse(bill) for bill in bills])
+    measure("parse_many", args.bills, lambda: list(parse_many(bills)))
+    measure(
+        f"parse_many processes={args.processes}",
+        args.bills,
+        lambda: list(parse_many(bills, processes=args.processes)),
+    )
+
+
+if __name__ == "__main__":
+    main()
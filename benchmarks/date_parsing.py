@@ -0,0 +1,55 @@
+"""
+Microbenchmark of :func:`prometeo.utils.parse_date` against
+``datetime.strptime`` on a movements payload where dates repeat across rows::
+
+    python benchmarks/date_parsing.py --rows 100000 --days 365
+"""
+
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from prometeo import utils  # noqa: E402
+
+
+def make_dates(rows, days, fmt):
+    start = datetime(2019, 1, 1)
+    return [(start + timedelta(days=row % days)).strftime(fmt) for row in range(rows)]
+
+
+def measure(name, rows, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<36} {elapsed:8.3f}s {elapsed / rows * 1e9:8.0f} ns/row")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--days", type=int, default=365)
+    args = parser.parse_args()
+
+    for fmt in ["%d/%m/%Y", "%Y-%m-%dT%H:%M:%S"]:
+        dates = make_dates(args.rows, args.days, fmt)
+        print(f"{args.rows} rows, {args.days} distinct dates, format {fmt}")
+        measure(
+            "strptime", args.rows, lambda: [datetime.strptime(d, fmt) for d in dates]
+        )
+        measure(
+            "parse_date uncached",
+            args.rows,
+            lambda: [utils.parse_date.__wrapped__(d, fmt) for d in dates],
+        )
+        utils.parse_date.cache_clear()
+        measure(
+            "parse_date", args.rows, lambda: [utils.parse_date(d, fmt) for d in dates]
+        )
+
+
+if __name__ == "__main__":
+    main()
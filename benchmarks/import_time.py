@@ -0,0 +1,77 @@
+"""
+Import time of the ``prometeo`` package and of each API, measured in fresh
+interpreters with ``python -X importtime``::
+
+    python benchmarks/import_time.py --runs 10
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+TARGETS = [
+    "prometeo",
+    "prometeo.curp",
+    "prometeo.banking",
+    "prometeo.dian",
+    "prometeo.sat",
+    "prometeo.payment",
+    "prometeo.account_validation",
+    "prometeo.crossborder",
+]
+
+EVERY_API = "import " + ", ".join(TARGETS[1:])
+
+
+def import_time(code):
+    """
+    Total microseconds spent importing modules when running ``code``, and the
+    number of modules imported.
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total = 0
+    modules = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        # Only the top level imports, their cumulative time includes the rest
+        if not name[1:].startswith(" "):
+            total += int(cumulative)
+        modules += 1
+    return total, modules
+
+
+def measure(name, code, runs):
+    times = []
+    for _ in range(runs):
+        total, modules = import_time(code)
+        times.append(total)
+    median = statistics.median(times) / 1000
+    print(f"{name:<36} {median:8.1f} ms {modules:6} modules")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"median of {args.runs} runs")
+    for target in TARGETS:
+        measure(f"import {target}", f"import {target}", args.runs)
+    measure("every API", EVERY_API, args.runs)
+
+
+if __name__ == "__main__":
+    main()
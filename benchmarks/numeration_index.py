@@ -0,0 +1,77 @@
+"""
+Benchmark of :class:`prometeo.dian.NumerationIndex` lookups against a linear
+scan over the numeration ranges::
+
+    python benchmarks/numeration_index.py --ranges 1000 --numbers 100000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from prometeo.dian import NumerationIndex  # noqa: E402
+from prometeo.dian.models import NumerationRange  # noqa: E402
+
+
+def make_ranges(count, rng):
+    ranges = []
+    start = 1
+    for _ in range(count):
+        start += rng.randint(1, 500)
+        end = start + rng.randint(0, 5000)
+        ranges.append(
+            NumerationRange(
+                from_number=start,
+                to_number=end,
+                mode="COMPUTADOR",
+                establishment="Main",
+                prefix="",
+                type="AUTORIZACIÓN",
+            )
+        )
+        start = end + 1
+    return ranges
+
+
+def linear_find(ranges, number):
+    for range in ranges:
+        if range.from_number <= number <= range.to_number:
+            return range
+    return None
+
+
+def measure(name, rows, func):
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{name:<24} {elapsed:8.3f}s {elapsed / rows * 1e9:10.0f} ns/number")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--ranges", type=int, default=1000)
+    parser.add_argument("--numbers", type=int, default=100000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    ranges = make_ranges(args.ranges, rng)
+    top = ranges[-1].to_number
+    numbers = [rng.randint(0, top) for _ in range(args.numbers)]
+
+    print(f"{args.ranges} ranges, {args.numbers} numbers")
+    measure("build index", args.ranges, lambda: NumerationIndex(ranges))
+    index = NumerationIndex(ranges)
+    measure("index.find_many", args.numbers, lambda: index.find_many(numbers))
+    measure(
+        "linear scan",
+        args.numbers,
+        lambda: [linear_find(ranges, number) for number in numbers],
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,28 @@
+import importlib
+
 from .client import Client
 
 __all__ = ["Client"]
+
+# Imported on first access, like the properties of Client
+_SUBPACKAGES = frozenset(
+    [
+        "account_validation",
+        "banking",
+        "crossborder",
+        "curp",
+        "dian",
+        "payment",
+        "sat",
+    ]
+)
+
+
+def __getattr__(name):
+    if name in _SUBPACKAGES:
+        return importlib.import_module("." + name, __name__)
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+def __dir__():
+    return sorted(set(globals()) | _SUBPACKAGES)
@@ -1,4 +1,8 @@
+import asyncio
+from enum import Enum
+
 from prometeo import exceptions, base_client, utils
+from prometeo.models import BatchResult
 from .exceptions import (
     InvalidAccountError,
     PendingValidationError,
@@ -11,6 +15,7 @@ from .exceptions import (
 from .codes import BankCodes, ISOCode, AccountType
 from typing import Optional, Union, List, Tuple
 from .models import AccountData
+from . import prevalidation
 import re
 
 
@@ -18,6 +23,19 @@ PRODUCTION_URL = "https://account-validation.prometeoapi.net"
 BETA_URL = "https://account-validation.beta.prometeoapi.com"
 SANDBOX_URL = "https://account-validation.sandbox.prometeoapi.com"
 
+DEFAULT_PENDING_CHECKS = 10
+
+VALIDATE_FIELDS = (
+    "account_number",
+    "country_code",
+    "bank_code",
+    "document_number",
+    "document_type",
+    "branch_code",
+    "account_type",
+    "beneficiary_name",
+)
+
 
 class AccountValidationAPIClient(base_client.BaseClient):
     """
@@ -86,6 +104,7 @@ class AccountValidationAPIClient(base_client.BaseClient):
         branch_code: Optional[str] = None,
         account_type: Optional[Union[str, AccountType]] = None,
         beneficiary_name: Optional[str] = None,
+        prevalidate: bool = False,
     ) -> AccountData:
         """
         Validate bank account information.
@@ -114,10 +133,16 @@ class AccountValidationAPIClient(base_client.BaseClient):
         :param beneficiary_name: Account owner's name.
         :type beneficiary_name: Optional[str]
 
+        :param prevalidate: Check the account number locally first, see
+            :func:`~prometeo.account_validation.prevalidation.prevalidate`.
+        :type prevalidate: bool
+
         :return: An object containing validated account information.
         :rtype: AccountData
         :raises: Any exceptions raised during the validation process.
         """
+        if prevalidate:
+            prevalidation.prevalidate(account_number, country_code, bank_code)
 
         data = await self.call_api(
             "POST",
@@ -135,3 +160,130 @@ class AccountValidationAPIClient(base_client.BaseClient):
         )
 
         return AccountData(**data.get("data"))
+
+    async def validate_many(
+        self,
+        rows,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        rate_limiter=None,
+        cache=None,
+        backoff=None,
+        max_pending_checks=DEFAULT_PENDING_CHECKS,
+        prevalidate=True,
+    ):
+        """
+        Validate many accounts concurrently, yielding the results as they
+        complete. Rows with the same arguments are validated once and get
+        the same result.
+
+        Validations answered with
+        :class:`~prometeo.account_validation.exceptions.PendingValidationError`
+        are checked again after a growing interval, without holding one of
+        the ``concurrency`` slots while they wait. A row that fails doesn't
+        stop the others.
+
+        This is an async generator, use it with ``async for``.
+
+        :param rows: ``(row_id, arguments)`` pairs, where arguments is a dict
+                     of the keyword arguments of :meth:`validate`
+        :type rows: iterable
+
+        :param concurrency: Maximum number of requests at the same time
+        :type concurrency: int
+
+        :param rate_limiter: Limits the number of requests per second
+        :type rate_limiter: :class:`~prometeo.utils.RateLimiter`
+
+        :param cache: Cache of previous results, valid accounts and
+                      :class:`~prometeo.account_validation.exceptions.InvalidAccountError`
+                      are kept in it
+        :type cache: :class:`~prometeo.utils.TTLCache`
+
+        :param backoff: Intervals between checks of pending validations,
+                        defaults to ``Backoff()``
+        :type backoff: :class:`~prometeo.utils.Backoff`
+
+        :param max_pending_checks: Times a pending validation is checked
+                                   before reporting it as pending
+        :type max_pending_checks: int
+
+        :param prevalidate: Check the account numbers locally first
+        :type prevalidate: bool
+
+        :rtype: async iterator of :class:`~prometeo.models.BatchResult`, keyed
+                by row id
+        """
+        backoff = backoff or utils.Backoff()
+        groups = {}
+        rejected = []
+        for row_id, arguments in rows:
+            unknown = set(arguments) - set(VALIDATE_FIELDS)
+            if unknown:
+                error = exceptions.InvalidParameterError(
+                    sorted(unknown), "Unknown parameters"
+                )
+                rejected.append(BatchResult(key=row_id, error=error))
+                continue
+            if prevalidate:
+                try:
+                    prevalidation.prevalidate(
+                        arguments.get("account_number", ""),
+                        arguments.get("country_code"),
+                        arguments.get("bank_code"),
+                    )
+                except (exceptions.InvalidParameterError, InvalidAccountError) as e:
+                    rejected.append(BatchResult(key=row_id, error=e))
+                    continue
+            key = tuple(
+                field_value.value if isinstance(field_value, Enum) else field_value
+                for field_value in (arguments.get(field) for field in VALIDATE_FIELDS)
+            )
+            groups.setdefault(key, (arguments, []))[1].append(row_id)
+
+        for result in rejected:
+            yield result
+
+        requests = asyncio.Semaphore(concurrency)
+
+        async def validate(key):
+            if cache is not None:
+                cached = cache.get(key)
+                if cached is not None:
+                    return cached
+            arguments = groups[key][0]
+            intervals = iter(backoff)
+            checks = 0
+            while True:
+                async with requests:
+                    if rate_limiter is not None:
+                        await rate_limiter.acquire()
+                    try:
+                        answer = (
+                            await self.validate(**arguments, prevalidate=False),
+                            None,
+                        )
+                        break
+                    except InvalidAccountError as e:
+                        answer = (None, e)
+                        break
+                    except PendingValidationError:
+                        checks += 1
+                        if checks >= max_pending_checks:
+                            raise
+                await asyncio.sleep(next(intervals))
+            if cache is not None:
+                cache.set(key, answer)
+            return answer
+
+        # Pending validations wait without a request slot, so more of them
+        # than ``concurrency`` can be in progress
+        calls = utils.iter_concurrently(validate, list(groups), concurrency * 4)
+        try:
+            async for key, answer, error in calls:
+                result = None
+                if error is None:
+                    result, error = answer
+                for row_id in groups[key][1]:
+                    yield BatchResult(key=row_id, result=result, error=error)
+        finally:
+            await calls.aclose()
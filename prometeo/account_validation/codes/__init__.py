@@ -13,6 +13,13 @@ from .bank import (
 
 from .country import ISOCode
 
+from .lookup import (
+    BankIndex,
+    find_bank,
+    find_bank_by_name,
+    find_bank_by_account_number,
+)
+
 from .account_type import (
     AccountTypeBrasil,
     AccountTypeChile,
@@ -44,6 +51,10 @@ __all__ = [
     "Ecuador",
     "BankCodes",
     "ISOCode",
+    "BankIndex",
+    "find_bank",
+    "find_bank_by_name",
+    "find_bank_by_account_number",
     "AccountTypeBrasil",
     "AccountTypeChile",
     "AccountTypeEcuador",
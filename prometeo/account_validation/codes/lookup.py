@@ -0,0 +1,211 @@
+import re
+import unicodedata
+
+from .bank import (
+    Argentina,
+    Brazil,
+    Chile,
+    Colombia,
+    Ecuador,
+    Mexico,
+    Peru,
+    Uruguay,
+    USA,
+)
+from .country import ISOCode
+
+
+COUNTRY_BANKS = {
+    ISOCode.ARGENTINA: Argentina,
+    ISOCode.BRAZIL: Brazil,
+    ISOCode.CHILE: Chile,
+    ISOCode.COLOMBIA: Colombia,
+    ISOCode.ECUADOR: Ecuador,
+    ISOCode.PERU: Peru,
+    ISOCode.URUGUAY: Uruguay,
+    ISOCode.USA: USA,
+    ISOCode.MEXICO: Mexico,
+}
+
+# Digits at the start of a CLABE, CBU or CCI that identify the bank
+PREFIX_LENGTHS = {
+    ISOCode.ARGENTINA: 3,
+    ISOCode.MEXICO: 3,
+    ISOCode.PERU: 3,
+}
+
+_NON_ALPHANUMERIC = re.compile(r"[^A-Z0-9]+")
+
+
+def normalize_name(name):
+    """
+    Normalize a bank name to the form of the enum member names, so that
+    ``"Banco de Crédito"`` becomes ``"BANCO_DE_CREDITO"``.
+
+    :type name: str
+    :rtype: str
+    """
+    decomposed = unicodedata.normalize("NFKD", name.upper())
+    ascii_name = decomposed.encode("ascii", "ignore").decode("ascii")
+    return _NON_ALPHANUMERIC.sub("_", ascii_name).strip("_")
+
+
+def account_number_prefix(country_code, account_number):
+    """
+    The digits that identify the bank in a CLABE, CBU or CCI.
+
+    :return: The prefix or ``None`` if the country doesn't have standard
+             account numbers
+    :rtype: str
+    """
+    length = PREFIX_LENGTHS.get(_country(country_code))
+    if length is None:
+        return None
+    return account_number.strip()[:length]
+
+
+def _country(country_code):
+    if isinstance(country_code, ISOCode):
+        return country_code
+    try:
+        return ISOCode(country_code.strip().upper())
+    except (AttributeError, ValueError):
+        return None
+
+
+def _strip_zeros(code):
+    return code.lstrip("0") or "0"
+
+
+class BankIndex(object):
+    """
+    Lookup tables over the bank enums of every country, to resolve a bank
+    code, name or account number prefix to its enum member with a single
+    dict access.
+
+    Use :func:`get_index` instead of building it, the index of the bundled
+    enums is built once on first use.
+
+    :param country_banks: The bank enum of each country
+    :type country_banks: dict
+    """
+
+    def __init__(self, country_banks):
+        self._by_code = {}
+        self._by_stripped_code = {}
+        self._by_name = {}
+        for country, banks in country_banks.items():
+            # Iterating the enum skips aliases, members with a repeated value
+            for bank in banks:
+                if not bank.value:
+                    continue
+                self._by_code.setdefault((country, bank.value), bank)
+                self._by_stripped_code.setdefault(
+                    (country, _strip_zeros(bank.value)), bank
+                )
+            for name, bank in banks.__members__.items():
+                if bank.value:
+                    self._by_name.setdefault((country, normalize_name(name)), bank)
+
+    def find(self, country_code, code):
+        """
+        The bank with a code, also matching codes with missing or extra
+        leading zeros, like ``"2"`` for ``"002"``.
+
+        :param country_code: The country of the bank
+        :type country_code: Union[str, ISOCode]
+
+        :param code: The bank code
+        :type code: str
+
+        :return: The enum member or ``None`` if it's unknown
+        :rtype: Enum
+        """
+        country = _country(country_code)
+        code = code.strip()
+        if not code:
+            return None
+        bank = self._by_code.get((country, code))
+        if bank is None:
+            bank = self._by_stripped_code.get((country, _strip_zeros(code)))
+        return bank
+
+    def find_by_name(self, country_code, name):
+        """
+        The bank with a name, compared ignoring case, accents and
+        punctuation.
+
+        :param country_code: The country of the bank
+        :type country_code: Union[str, ISOCode]
+
+        :param name: The name of the bank, as in the enum, like
+                     ``"Banco de la Nación"``
+        :type name: str
+
+        :return: The enum member or ``None`` if it's unknown
+        :rtype: Enum
+        """
+        return self._by_name.get((_country(country_code), normalize_name(name)))
+
+    def find_by_account_number(self, country_code, account_number):
+        """
+        The bank of a CLABE, CBU or CCI, from the prefix of the number. The
+        check digits aren't verified, see
+        :func:`~prometeo.account_validation.prevalidation.prevalidate`.
+
+        :param country_code: The country of the account
+        :type country_code: Union[str, ISOCode]
+
+        :param account_number: The account number
+        :type account_number: str
+
+        :return: The enum member or ``None`` if the country doesn't have
+                 standard account numbers or the bank is unknown
+        :rtype: Enum
+        """
+        country = _country(country_code)
+        prefix = account_number_prefix(country, account_number)
+        if prefix is None:
+            return None
+        return self._by_code.get((country, prefix))
+
+
+_index = None
+
+
+def get_index():
+    """
+    The :class:`BankIndex` of the bundled bank enums, built on first use.
+
+    :rtype: :class:`BankIndex`
+    """
+    global _index
+    if _index is None:
+        _index = BankIndex(COUNTRY_BANKS)
+    return _index
+
+
+def find_bank(country_code, code):
+    """
+    Shortcut for :meth:`BankIndex.find` on the bundled enums.
+
+    .. code-block:: python
+
+        find_bank("MX", "012")  # Mexico.BBVABANCOMER
+    """
+    return get_index().find(country_code, code)
+
+
+def find_bank_by_name(country_code, name):
+    """
+    Shortcut for :meth:`BankIndex.find_by_name` on the bundled enums.
+    """
+    return get_index().find_by_name(country_code, name)
+
+
+def find_bank_by_account_number(country_code, account_number):
+    """
+    Shortcut for :meth:`BankIndex.find_by_account_number` on the bundled
+    enums.
+    """
+    return get_index().find_by_account_number(country_code, account_number)
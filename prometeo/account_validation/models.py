@@ -1,4 +1,4 @@
-from typing import Union, List, Optional
+from typing import Any, Union, List, Optional
 from pydantic import BaseModel
 from .codes import BankCodes, ISOCode, AccountType, DocumentType
 
@@ -15,3 +15,17 @@ class AccountData(BaseModel):
     beneficiary_name: Optional[str]
     account_currency: Optional[Union[str, List[str]]]
     account_type: Optional[Union[str, AccountType]]
+
+
+class AccountNumberInfo(BaseModel):
+    """
+    What can be told about an account number without calling the API,
+    ``format`` is the name of the standard format it follows, like ``CLABE``,
+    and ``bank`` the member of the country's bank enum if it's known.
+    """
+
+    account_number: str
+    country_code: Union[str, ISOCode]
+    format: Optional[str] = None
+    bank_code: Optional[str] = None
+    bank: Optional[Any] = None
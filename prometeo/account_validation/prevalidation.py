@@ -0,0 +1,181 @@
+from enum import Enum
+
+from prometeo import exceptions
+from prometeo.models import BatchResult
+from .codes import BankCodes, ISOCode
+from .codes.lookup import (
+    account_number_prefix,
+    find_bank,
+    find_bank_by_account_number,
+)
+from .exceptions import InvalidAccountError
+from .models import AccountNumberInfo
+
+
+_SEPARATORS = str.maketrans("", "", " -.")
+
+
+def _weighted_check(digits, weights):
+    total = sum(int(digit) * weight for digit, weight in zip(digits, weights))
+    return (10 - total % 10) % 10
+
+
+def _clabe_valid(number):
+    check = _weighted_check(number[:17], [3, 7, 1] * 6)
+    return check == int(number[17])
+
+
+def _cbu_valid(number):
+    first = _weighted_check(number[:7], [7, 1, 3, 9, 7, 1, 3])
+    second = _weighted_check(number[8:21], [3, 9, 7, 1, 3, 9, 7, 1, 3, 9, 7, 1, 3])
+    return first == int(number[7]) and second == int(number[21])
+
+
+def _luhn_check(digits):
+    total = 0
+    for position, digit in enumerate(digits):
+        product = int(digit) * (1 if position % 2 == 0 else 2)
+        total += product // 10 + product % 10
+    return (10 - total % 10) % 10
+
+
+def _cci_valid(number):
+    first = _luhn_check(number[:6])
+    second = _luhn_check(number[6:18])
+    return first == int(number[18]) and second == int(number[19])
+
+
+class _Format(object):
+    def __init__(self, name, length, is_valid):
+        self.name = name
+        self.length = length
+        self.is_valid = is_valid
+
+
+FORMATS = {
+    ISOCode.MEXICO: _Format("CLABE", 18, _clabe_valid),
+    ISOCode.ARGENTINA: _Format("CBU", 22, _cbu_valid),
+    ISOCode.PERU: _Format("CCI", 20, _cci_valid),
+}
+
+
+def _country(country_code):
+    if isinstance(country_code, ISOCode):
+        return country_code
+    try:
+        return ISOCode(country_code)
+    except ValueError:
+        return None
+
+
+def _bank_mismatch(country, bank_code, bank):
+    # Only banks known on both sides are compared, so unpadded codes still
+    # match, and the sandbox provider and unlisted prefixes, like the ones
+    # of CVUs, are left for the API
+    if not bank_code or bank is None:
+        return False
+    given = find_bank(country, bank_code)
+    if given is None:
+        return False
+    test_provider = BankCodes.TEST_PROVIDER.value
+    if test_provider in (given.value, bank.value):
+        return False
+    return given != bank
+
+
+def prevalidate(account_number, country_code, bank_code=None, strict=False):
+    """
+    Check an account number locally, before validating it with the API.
+
+    Numbers that follow the standard format of their country, a Mexican
+    CLABE, an Argentine CBU or CVU or a Peruvian CCI, have their check
+    digits verified and their bank derived from the prefix. Other numbers
+    are left for the API to validate, unless ``strict`` is set.
+
+    :param account_number: The account number
+    :type account_number: str
+
+    :param country_code: The country of the account
+    :type country_code: Union[str, ISOCode]
+
+    :param bank_code: The bank of the account, checked against the one in
+                      the account number when both are known banks other
+                      than the sandbox provider
+    :type bank_code: Optional[Union[str, BankCodes]]
+
+    :param strict: Reject numbers that don't follow the standard format of
+                   their country
+    :type strict: bool
+
+    :raises: :class:`~prometeo.exceptions.InvalidParameterError` if the
+             number or the bank code are malformed,
+             :class:`~prometeo.account_validation.exceptions.InvalidAccountError`
+             if the check digits don't match
+    :rtype: :class:`~prometeo.account_validation.models.AccountNumberInfo`
+    """
+    country = _country(country_code)
+    number = account_number.translate(_SEPARATORS)
+    info = AccountNumberInfo(account_number=number, country_code=country_code)
+    number_format = FORMATS.get(country)
+    if number_format is None:
+        return info
+    if not (number.isdigit() and len(number) == number_format.length):
+        if strict:
+            raise exceptions.InvalidParameterError(
+                ["account_number"],
+                "Invalid account_number, a {} must have {} digits".format(
+                    number_format.name, number_format.length
+                ),
+            )
+        return info
+    if not number_format.is_valid(number):
+        raise InvalidAccountError(
+            "Invalid {} {}, wrong check digit".format(number_format.name, number)
+        )
+
+    info.format = number_format.name
+    info.bank_code = account_number_prefix(country, number)
+    info.bank = find_bank_by_account_number(country, number)
+    if isinstance(bank_code, Enum):
+        bank_code = bank_code.value
+    if _bank_mismatch(country, bank_code, info.bank):
+        raise exceptions.InvalidParameterError(
+            ["bank_code"],
+            "Invalid bank_code {}, the {} belongs to bank {}".format(
+                bank_code, number_format.name, info.bank_code
+            ),
+        )
+    return info
+
+
+def prevalidate_many(accounts, strict=False):
+    """
+    Same as :func:`prevalidate` for many accounts, reporting the errors per
+    account instead of raising them.
+
+    :param accounts: Dicts with the ``account_number``, ``country_code`` and
+                     optionally ``bank_code`` of each account, other keys
+                     are ignored
+    :type accounts: iterable of dict
+
+    :param strict: Reject numbers that don't follow the standard format of
+                   their country
+    :type strict: bool
+
+    :return: One result per account, keyed by position
+    :rtype: List of :class:`~prometeo.models.BatchResult`
+    """
+    results = []
+    for index, account in enumerate(accounts):
+        try:
+            info = prevalidate(
+                account["account_number"],
+                account["country_code"],
+                account.get("bank_code"),
+                strict,
+            )
+        except (exceptions.InvalidParameterError, InvalidAccountError) as e:
+            results.append(BatchResult(key=index, error=e))
+        else:
+            results.append(BatchResult(key=index, result=info))
+    return results
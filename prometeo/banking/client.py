@@ -1,8 +1,9 @@
-from datetime import datetime
+import asyncio
 
 from prometeo import exceptions, base_client, base_session, utils
 from .models import (
     Client as Client,
+    ClientData,
     Account as AccountModel,
     Movement,
     CreditCard as CreditCardModel,
@@ -107,6 +108,77 @@ class Session(base_session.BaseSession):
         """
         await self._client.select_client(self._session_key, client.id)
 
+    @utils.adapt_async_sync
+    async def get_clients_data(self, date_start, date_end, clients=None, sessions=None):
+        """
+        Fetch the accounts and their movements of several clients.
+
+        A client must be selected before its data can be fetched, so with a
+        single session the clients are processed one after the other. Pass
+        extra sessions logged in with the same credentials, as returned by
+        :meth:`~prometeo.banking.client.BankingAPIClient.login_sessions`, to
+        process one client per session in parallel. Sessions with the same
+        key, like this one if it's passed again, are used only once.
+
+        :param date_start: Start of the date range for movements.
+        :type date_start: :class:`~datetime.datetime`
+
+        :param date_end: End of the date range for movements.
+        :type date_end: :class:`~datetime.datetime`
+
+        :param clients: The clients to fetch, defaults to all the user's clients
+        :type clients: List of :class:`~prometeo.banking.models.Client`
+
+        :param sessions: Additional sessions used to fetch clients in parallel
+        :type sessions: List of :class:`~prometeo.banking.client.Session`
+
+        :rtype: dict of client id to :class:`~prometeo.banking.models.ClientData`
+        """
+        if clients is None:
+            clients = await self.get_clients()
+        pool = asyncio.Queue()
+        keys = set()
+        for session in [self, *(sessions or [])]:
+            # A session key can only have one client selected at a time
+            key = session.get_session_key()
+            if key not in keys:
+                keys.add(key)
+                pool.put_nowait(session)
+
+        async def fetch(client):
+            session = await pool.get()
+            try:
+                return await session._get_client_data(client, date_start, date_end)
+            finally:
+                pool.put_nowait(session)
+
+        results = await utils.map_concurrently(fetch, clients, pool.qsize())
+        return {client.id: data for client, data in zip(clients, results)}
+
+    async def _get_client_data(self, client, date_start, date_end):
+        await self.select_client(client)
+        accounts = await self.get_accounts()
+        movements = {}
+        for account in accounts:
+            movements[account.number] = await account.get_movements(
+                date_start, date_end
+            )
+        return ClientData(
+            client=client,
+            accounts=[
+                AccountModel(
+                    id=account.id,
+                    name=account.name,
+                    number=account.number,
+                    branch=account.branch,
+                    currency=account.currency,
+                    balance=account.balance,
+                )
+                for account in accounts
+            ],
+            movements=movements,
+        )
+
     @utils.adapt_async_sync
     async def get_accounts(self):
         """
@@ -140,8 +212,8 @@ class Session(base_session.BaseSession):
                 id=credit_card["id"],
                 name=credit_card["name"],
                 number=credit_card["number"],
-                close_date=datetime.strptime(credit_card["close_date"], "%d/%m/%Y"),
-                due_date=datetime.strptime(credit_card["due_date"], "%d/%m/%Y"),
+                close_date=utils.parse_date(credit_card["close_date"], "%d/%m/%Y"),
+                due_date=utils.parse_date(credit_card["due_date"], "%d/%m/%Y"),
                 balance_local=credit_card["balance_local"],
                 balance_dollar=credit_card["balance_dollar"],
             )
@@ -386,6 +458,58 @@ class BankingAPIClient(base_client.BaseClient):
             headers=headers,
         )
 
+    @utils.adapt_async_sync
+    async def login_sessions(self, size, provider, username, password, **kwargs):
+        """
+        Log in up to ``size`` sessions with the same credentials, to be used
+        with :meth:`~prometeo.banking.client.Session.get_clients_data`.
+
+        Sessions are opened one at a time and the process stops at the first
+        login that fails after the first one, so providers that don't allow
+        simultaneous sessions fall back to a single session.
+
+        :param size: Maximum number of sessions to open
+        :type size: int
+
+        :rtype: List of :class:`~prometeo.banking.client.Session`
+        """
+        sessions = []
+        session = None
+        try:
+            for _ in range(size):
+                session = self.new_session()
+                try:
+                    await session.login(provider, username, password, **kwargs)
+                except exceptions.PrometeoError:
+                    if not sessions:
+                        raise
+                    break
+                if session.get_status() not in ["logged_in", "select_client"]:
+                    # Don't leave it open, it counts against the provider's
+                    # limit of simultaneous sessions
+                    await self._logout_quietly(session)
+                    session = None
+                    if not sessions:
+                        raise BankingClientError(
+                            "Login requires interaction, use Session.login instead"
+                        )
+                    break
+                sessions.append(session)
+                session = None
+        except BaseException:
+            for opened in sessions + ([session] if session is not None else []):
+                await self._logout_quietly(opened)
+            raise
+        return sessions
+
+    async def _logout_quietly(self, session):
+        if not session.get_session_key():
+            return
+        try:
+            await session.logout()
+        except Exception:
+            pass
+
     @utils.adapt_async_sync
     async def login_procedure(self, session_key, **kwargs):
         return await self.call_api(
@@ -631,7 +755,7 @@ class Account(object):
             Movement(
                 id=movement["id"],
                 reference=movement["reference"],
-                date=datetime.strptime(movement["date"], "%d/%m/%Y"),
+                date=utils.parse_date(movement["date"], "%d/%m/%Y"),
                 detail=movement["detail"],
                 debit=movement["debit"],
                 credit=movement["credit"],
@@ -682,7 +806,7 @@ class CreditCard(object):
             Movement(
                 id=movement["id"],
                 reference=movement["reference"],
-                date=datetime.strptime(movement["date"], "%d/%m/%Y"),
+                date=utils.parse_date(movement["date"], "%d/%m/%Y"),
                 detail=movement["detail"],
                 debit=movement["debit"],
                 credit=movement["credit"],
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional, Union
+from typing import Dict, List, Optional, Union
 from pydantic import BaseModel
 
 
@@ -37,6 +37,12 @@ class Movement(BaseModel):
     extra_data: Optional[dict]
 
 
+class ClientData(BaseModel):
+    client: Client
+    accounts: List[Account]
+    movements: Dict[str, List[Movement]]
+
+
 class Provider(BaseModel):
     code: str
     country: str
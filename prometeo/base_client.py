@@ -1,3 +1,7 @@
+import os
+import tempfile
+from contextlib import asynccontextmanager
+
 from six.moves.urllib.parse import urljoin
 import httpx
 
@@ -6,6 +10,9 @@ from typing import Dict
 from prometeo import exceptions, utils
 
 
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+
 class BaseClient(object):
     """
     Base client class to make api calls
@@ -16,9 +23,17 @@ class BaseClient(object):
     session_class = None
 
     def __init__(
-        self, api_key, environment, raw_responses=False, proxy=None, *args, **kwargs
+        self,
+        api_key,
+        environment,
+        raw_responses=False,
+        proxy=None,
+        *args,
+        file_cache=None,
+        **kwargs,
     ):
         self._api_key = api_key
+        self.file_cache = file_cache
         if environment not in self.ENVIRONMENTS:
             valid_envs = ", ".join(self.ENVIRONMENTS.keys())
             raise exceptions.ClientError(
@@ -33,10 +48,15 @@ class BaseClient(object):
     def _pop_nulls(self, data: Dict) -> Dict:
         return {k: v for k, v in data.items() if v is not None}
 
+    def build_url(self, url):
+        """
+        Full url of an endpoint or file in the configured environment.
+        """
+        return urljoin(self.ENVIRONMENTS[self._environment], url)
+
     @utils.adapt_async_sync
     async def make_request(self, method, url, headers=None, data=None, *args, **kwargs):
-        base_url = self.ENVIRONMENTS[self._environment]
-        full_url = urljoin(base_url, url)
+        full_url = self.build_url(url)
         headers = headers or {}
         if data:
             data = self._pop_nulls(data)
@@ -46,6 +66,20 @@ class BaseClient(object):
         )
         return response
 
+    @asynccontextmanager
+    async def stream_request(self, method, url, headers=None, *args, **kwargs):
+        """
+        Like :meth:`make_request`, but the response body isn't read upfront,
+        use it as ``async with client.stream_request(...) as response``.
+        """
+        full_url = self.build_url(url)
+        headers = headers or {}
+        headers["X-API-Key"] = self._api_key
+        async with self._client_session.stream(
+            method, full_url, headers=headers, *args, **kwargs
+        ) as response:
+            yield response
+
     def on_response(self, response_data):
         """
         Called after every 200 response
@@ -133,12 +167,88 @@ class Download(object):
         self._client = client
         self.url = url
 
+    @property
+    def full_url(self):
+        """
+        The url of the file including the environment's domain.
+
+        :rtype: str
+        """
+        return self._client.build_url(self.url)
+
     @utils.adapt_async_sync
     async def get_file(self):
         """
         Downloads the file and returns its contents.
 
-        :rtype: bytes
+        If the client has a :class:`~prometeo.file_cache.FileCache` as
+        ``file_cache``, the file is only downloaded if it isn't cached yet
+        and the contents are returned as a read-only memory mapped view.
+
+        :rtype: bytes or memoryview
         """
+        if self._client.file_cache is not None:
+            return await self._client.file_cache.fetch(self)
         resp = await self._client.make_request("GET", self.url)
         return resp.content
+
+    @utils.adapt_async_sync
+    async def write_to(self, file, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """
+        Downloads the file in chunks and writes them to ``file``, without
+        holding the whole contents in memory.
+
+        :param file: A file object opened for binary writing
+        :type file: file
+
+        :param chunk_size: Size in bytes of the chunks read from the response
+        :type chunk_size: int
+
+        :return: The number of bytes written
+        :rtype: int
+        """
+        size = 0
+        async with self._client.stream_request("GET", self.url) as response:
+            if response.status_code >= 400:
+                await response.aread()
+                try:
+                    data = response.json()
+                except ValueError:
+                    data = {}
+                self._client.on_error(response, data)
+                raise exceptions.ClientError(
+                    "Download of {} failed with status {}".format(
+                        self.url, response.status_code
+                    )
+                )
+            async for chunk in response.aiter_bytes(chunk_size):
+                file.write(chunk)
+                size += len(chunk)
+        return size
+
+    @utils.adapt_async_sync
+    async def save(self, path, chunk_size=DOWNLOAD_CHUNK_SIZE):
+        """
+        Downloads the file to ``path``. The contents are streamed to a
+        temporary ``.part`` file, unique to each call, that is renamed when
+        complete, so ``path`` only exists once fully downloaded.
+
+        :param path: Path of the file to write
+        :type path: str
+
+        :return: The number of bytes written
+        :rtype: int
+        """
+        fd, partial_path = tempfile.mkstemp(
+            suffix=".part",
+            prefix=os.path.basename(path) + ".",
+            dir=os.path.dirname(path) or None,
+        )
+        try:
+            with os.fdopen(fd, "wb") as f:
+                size = await self.write_to(f, chunk_size)
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return size
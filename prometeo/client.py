@@ -1,12 +1,3 @@
-from .banking import BankingAPIClient
-from .curp import CurpAPIClient
-from .dian import DianAPIClient
-from .sat import SatAPIClient
-from .payment import PaymentAPIClient
-from .account_validation import AccountValidationAPIClient
-from .crossborder import CrossBorderAPIClient
-
-
 class Client(object):
     def __init__(
         self,
@@ -31,9 +22,13 @@ class Client(object):
         self._args = args
         self._kwargs = kwargs
 
+    # The API clients are imported on first access, so that importing the
+    # package doesn't load the modules and models of every API
     @property
     def banking(self):
         if self._banking is None:
+            from .banking import BankingAPIClient
+
             self._banking = BankingAPIClient(
                 self._api_key,
                 self._environment,
@@ -47,6 +42,8 @@ class Client(object):
     @property
     def crossborder(self):
         if self._crossborder is None:
+            from .crossborder import CrossBorderAPIClient
+
             self._crossborder = CrossBorderAPIClient(
                 self._api_key,
                 self._environment,
@@ -60,6 +57,8 @@ class Client(object):
     @property
     def dian(self):
         if self._dian is None:
+            from .dian import DianAPIClient
+
             self._dian = DianAPIClient(
                 self._api_key,
                 self._environment,
@@ -73,6 +72,8 @@ class Client(object):
     @property
     def sat(self):
         if self._sat is None:
+            from .sat import SatAPIClient
+
             self._sat = SatAPIClient(
                 self._api_key,
                 self._environment,
@@ -86,6 +87,8 @@ class Client(object):
     @property
     def curp(self):
         if self._curp is None:
+            from .curp import CurpAPIClient
+
             self._curp = CurpAPIClient(
                 self._api_key,
                 self._environment,
@@ -99,6 +102,8 @@ class Client(object):
     @property
     def payment(self):
         if self._payment is None:
+            from .payment import PaymentAPIClient
+
             self._payment = PaymentAPIClient(
                 self._api_key,
                 self._environment,
@@ -112,6 +117,8 @@ class Client(object):
     @property
     def account_validation(self):
         if self._account_validation is None:
+            from .account_validation import AccountValidationAPIClient
+
             self._account_validation = AccountValidationAPIClient(
                 self._api_key,
                 self._environment,
@@ -1,3 +1,5 @@
 from .client import CrossBorderAPIClient
+from .payouts import PayoutBatch
+from .quotes import QuoteManager
 
-__all__ = ["CrossBorderAPIClient"]
+__all__ = ["CrossBorderAPIClient", "PayoutBatch", "QuoteManager"]
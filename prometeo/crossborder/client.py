@@ -1,5 +1,8 @@
+import asyncio
+from urllib.parse import parse_qs, urlsplit
+
 from prometeo import base_client, utils
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from .exceptions import (
     CurrencyPairNotAvailableException,
     InvalidParameterError,
@@ -155,6 +158,35 @@ class CrossBorderAPIClient(base_client.BaseClient):
         elif error_code:
             raise CrossBorderClientError(error_message)
 
+    async def _iter_pages(self, url, model, params=None):
+        params = dict(params or {})
+        page = await self.call_api("GET", url, params=params)
+        next_page = None
+        try:
+            while True:
+                if not isinstance(page, dict):
+                    # Endpoints without pagination return a plain list
+                    for item in page:
+                        yield model(**item)
+                    return
+                next_url = page.get("next")
+                if next_url:
+                    # Only the query of the next link is used, the host in
+                    # it may not be the one of the environment
+                    params = {**params, **parse_qs(urlsplit(next_url).query)}
+                    next_page = asyncio.ensure_future(
+                        self.call_api("GET", url, params=params)
+                    )
+                for item in page.get("results", []):
+                    yield model(**item)
+                if next_page is None:
+                    return
+                page = await next_page
+                next_page = None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
     @utils.adapt_async_sync
     async def create_intent(self, data: IntentDataRequest) -> IntentDataResponse:
         response = await self.call_api(
@@ -172,6 +204,22 @@ class CrossBorderAPIClient(base_client.BaseClient):
         data = await self.call_api("GET", "payin/intent")
         return [IntentData(**intent) for intent in data.get("results", [])]
 
+    def iter_intents(self, params: Optional[dict] = None) -> AsyncIterator[IntentData]:
+        """
+        Every intent, following the pagination of :meth:`list_intents`.
+
+        The pages are requested while the items of the previous one are
+        processed, and at most two pages are held in memory.
+
+        This is an async generator, use it with ``async for``.
+
+        :param params: Filters of the listing, sent as query parameters
+        :type params: dict
+
+        :rtype: AsyncIterator of :class:`~prometeo.crossborder.models.IntentData`
+        """
+        return self._iter_pages("payin/intent", IntentData, params)
+
     @utils.adapt_async_sync
     async def get_intent(self, intent_id: str) -> IntentData:
         data = await self.call_api("GET", f"payin/intent/{intent_id}")
@@ -200,6 +248,25 @@ class CrossBorderAPIClient(base_client.BaseClient):
         data = await self.call_api("GET", "payout/transfer")
         return [PayoutTransfer(**payout) for payout in data.get("results", [])]
 
+    def iter_payouts(
+        self, params: Optional[dict] = None
+    ) -> AsyncIterator[PayoutTransfer]:
+        """
+        Every payout, following the pagination of :meth:`list_payouts`.
+
+        The pages are requested while the items of the previous one are
+        processed, and at most two pages are held in memory.
+
+        This is an async generator, use it with ``async for``.
+
+        :param params: Filters of the listing, sent as query parameters
+        :type params: dict
+
+        :rtype: AsyncIterator of
+                :class:`~prometeo.crossborder.models.PayoutTransfer`
+        """
+        return self._iter_pages("payout/transfer", PayoutTransfer, params)
+
     @utils.adapt_async_sync
     async def create_customer(self, data: CustomerInput) -> CustomerResponse:
         return CustomerResponse(
@@ -215,6 +282,22 @@ class CrossBorderAPIClient(base_client.BaseClient):
         data = await self.call_api("GET", "customer", params=params)
         return [Customer(**customer) for customer in data.get("results", [])]
 
+    def iter_customers(self, params: Optional[dict] = None) -> AsyncIterator[Customer]:
+        """
+        Every customer, following the pagination of :meth:`get_customers`.
+
+        The pages are requested while the items of the previous one are
+        processed, and at most two pages are held in memory.
+
+        This is an async generator, use it with ``async for``.
+
+        :param params: Filters of the listing, sent as query parameters
+        :type params: dict
+
+        :rtype: AsyncIterator of :class:`~prometeo.crossborder.models.Customer`
+        """
+        return self._iter_pages("customer", Customer, params)
+
     @utils.adapt_async_sync
     async def update_customer(
         self, customer_id: str, data: CustomerInput
@@ -252,6 +335,20 @@ class CrossBorderAPIClient(base_client.BaseClient):
         data = await self.call_api("GET", "account")
         return [Account(**account) for account in data]
 
+    def iter_accounts(self, params: Optional[dict] = None) -> AsyncIterator[Account]:
+        """
+        Every account, following the pagination of the listing if there is
+        one, see :meth:`get_accounts`.
+
+        This is an async generator, use it with ``async for``.
+
+        :param params: Filters of the listing, sent as query parameters
+        :type params: dict
+
+        :rtype: AsyncIterator of :class:`~prometeo.crossborder.models.Account`
+        """
+        return self._iter_pages("account", Account, params)
+
     @utils.adapt_async_sync
     async def get_account(self, account_id: str) -> Account:
         return Account(**await self.call_api("GET", f"account/{account_id}"))
@@ -260,3 +357,32 @@ class CrossBorderAPIClient(base_client.BaseClient):
     async def get_account_transactions(self, account_id: str) -> List[Transaction]:
         data = await self.call_api("GET", f"account/{account_id}/transactions")
         return [Transaction(**transaction) for transaction in data.get("results", [])]
+
+    def iter_transactions(
+        self, account_id: str, params: Optional[dict] = None
+    ) -> AsyncIterator[Transaction]:
+        """
+        Every transaction of an account, following the pagination of
+        :meth:`get_account_transactions`.
+
+        The pages are requested while the items of the previous one are
+        processed, and at most two pages are held in memory.
+
+        This is an async generator, use it with ``async for``.
+
+        .. code-block:: python
+
+            async for transaction in client.iter_transactions(account_id):
+                print(transaction.id, transaction.amount)
+
+        :param account_id: The id of the account
+        :type account_id: str
+
+        :param params: Filters of the listing, sent as query parameters
+        :type params: dict
+
+        :rtype: AsyncIterator of :class:`~prometeo.crossborder.models.Transaction`
+        """
+        return self._iter_pages(
+            f"account/{account_id}/transactions", Transaction, params
+        )
@@ -1,4 +1,5 @@
-from typing import Union, List, Optional
+from collections import Counter
+from typing import Any, Dict, Union, List, Optional
 from pydantic import BaseModel, field_validator
 from enum import Enum
 from datetime import datetime
@@ -296,6 +297,7 @@ class PayoutTransfer(BaseModel):
     amount: float
     currency: Optional[str] = None
     reference: Optional[str] = None
+    external_id: Optional[str] = None
     events: List[PayoutTransferState]
 
 
@@ -362,3 +364,64 @@ class Event(BaseModel):
 class WebhookPayload(BaseModel):
     verify_token: str
     events: List[Event]
+
+
+class PayoutUpdate(BaseModel):
+    """
+    A change seen by a :class:`~prometeo.crossborder.payouts.PayoutBatch`:
+    a payout submitted or rejected, new events of a payout, the error
+    that made the batch give up on it, or that its timeout ran out before
+    the payout finished.
+    """
+
+    external_id: Any
+    payout_id: Optional[str] = None
+    payout: Optional[PayoutTransfer] = None
+    transitions: List[PayoutTransferState] = []
+    finished: bool = False
+    timed_out: bool = False
+    error: Optional[Any] = None
+
+
+class PayoutReport(BaseModel):
+    """
+    Outcome of a :class:`~prometeo.crossborder.payouts.PayoutBatch`, by
+    ``external_id``. Invalid inputs without an ``external_id`` are reported
+    in ``errors`` by their position. An input rejected because it conflicts
+    with a previous one with its ``external_id`` is in ``errors`` too, next
+    to the outcome of the first one. The payouts not finished when the
+    timeout ran out are in ``unfinished``, with their last state seen.
+    """
+
+    payout_ids: Dict[str, str] = {}
+    states: Dict[str, PayoutStatesEnum] = {}
+    errors: Dict[Any, Any] = {}
+    unfinished: Dict[str, Optional[PayoutStatesEnum]] = {}
+    seconds: float = 0
+
+    @property
+    def counts(self):
+        """
+        Number of payouts in each final state, plus the ones that failed
+        with an error under ``"error"`` and the ones not finished under
+        ``"unfinished"``.
+
+        :rtype: :class:`~collections.Counter`
+        """
+        counts = Counter(state.value for state in self.states.values())
+        counts["error"] = len(self.errors)
+        counts["unfinished"] = len(self.unfinished)
+        return counts
+
+    def with_state(self, state):
+        """
+        External ids of the payouts that finished in ``state``.
+
+        :type state: :class:`PayoutStatesEnum`
+        :rtype: List of str
+        """
+        return [
+            external_id
+            for external_id, payout_state in self.states.items()
+            if payout_state == state
+        ]
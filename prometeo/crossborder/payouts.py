@@ -0,0 +1,405 @@
+import asyncio
+import heapq
+import itertools
+
+from pydantic import ValidationError
+
+from prometeo import exceptions, utils
+from .exceptions import CrossBorderAPIException, CrossBorderClientError
+from .models import (
+    PayoutReport,
+    PayoutStatesEnum,
+    PayoutTransferInput,
+    PayoutUpdate,
+)
+
+
+TERMINAL_STATES = frozenset(
+    [PayoutStatesEnum.settled, PayoutStatesEnum.failed, PayoutStatesEnum.cancelled]
+)
+
+DEFAULT_MAX_ERRORS = 5
+
+_SUBMIT = "submit"
+
+_CHECK = "check"
+
+_RECONCILE = "reconcile"
+
+
+def _invalid(error):
+    fields = sorted({".".join(str(part) for part in e["loc"]) for e in error.errors()})
+    return exceptions.InvalidParameterError(
+        fields, "Invalid payout: {}".format(", ".join(fields))
+    )
+
+
+def _validate(payout):
+    if isinstance(payout, PayoutTransferInput):
+        return payout
+    if not isinstance(payout, dict):
+        raise exceptions.InvalidParameterError(
+            [],
+            "Invalid payout: expected a PayoutTransferInput or a dict, got {}".format(
+                type(payout).__name__
+            ),
+        )
+    try:
+        return PayoutTransferInput(**payout)
+    except ValidationError as e:
+        raise _invalid(e)
+    except TypeError as e:
+        # Keys that aren't strings
+        raise exceptions.InvalidParameterError([], "Invalid payout: {}".format(e))
+
+
+def _ambiguous(error):
+    # An error code from the API means the payout wasn't created, while a
+    # timeout or a response that can't be parsed may come after it was
+    return not isinstance(error, CrossBorderClientError) or isinstance(
+        error, CrossBorderAPIException
+    )
+
+
+class PayoutBatch(object):
+    """
+    Submits many payouts concurrently and tracks their states until they
+    are settled, failed or cancelled, all with a single scheduler.
+
+    Inputs are validated locally before anything is sent. The
+    ``external_id`` of each payout is its idempotency key: inputs with the
+    same one are submitted once, and a later input that differs from the
+    first one with its ``external_id`` is rejected. When a ``cache`` is
+    given the payouts submitted are kept in it, so running the batch again
+    only tracks them.
+    A submission that fails without an error code from the API, like a
+    timeout, may have created the payout anyway, so it's looked up by its
+    ``external_id`` before being submitted again. Each payout is checked
+    with its own growing interval, which starts over every time its state
+    changes, and at most ``concurrency`` requests are in flight at any time.
+
+    .. code-block:: python
+
+        batch = PayoutBatch(client.crossborder, rate_limiter=RateLimiter(10))
+        report = batch.run(payouts)
+        print(report.counts)
+        for external_id, error in report.errors.items():
+            print(external_id, error)
+
+    :param client: The client used to create and get the payouts
+    :type client: :class:`~prometeo.crossborder.client.CrossBorderAPIClient`
+
+    :param concurrency: Maximum number of requests at the same time
+    :type concurrency: int
+
+    :param rate_limiter: Limits the number of requests per second
+    :type rate_limiter: :class:`~prometeo.utils.RateLimiter`
+
+    :param backoff: Intervals between checks, defaults to ``Backoff()``
+    :type backoff: :class:`~prometeo.utils.Backoff`
+
+    :param cache: Ids of the payouts already submitted, keyed by
+                  ``external_id``, or ``None`` for the ones whose submission
+                  failed ambiguously and are looked up first
+    :type cache: :class:`~prometeo.utils.TTLCache`
+
+    :param terminal_states: States after which a payout isn't checked
+                            anymore
+    :type terminal_states: set of :class:`PayoutStatesEnum`
+
+    :param max_errors: Consecutive failed checks or ambiguous submissions
+                       after which the batch gives up on a payout
+    :type max_errors: int
+    """
+
+    def __init__(
+        self,
+        client,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        rate_limiter=None,
+        backoff=None,
+        cache=None,
+        terminal_states=TERMINAL_STATES,
+        max_errors=DEFAULT_MAX_ERRORS,
+    ):
+        self._client = client
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.backoff = backoff or utils.Backoff()
+        self.cache = cache
+        self.terminal_states = frozenset(terminal_states)
+        self.max_errors = max_errors
+        self._counter = itertools.count()
+        self._reset()
+
+    def _reset(self):
+        self._schedule = []
+        self._inputs = {}
+        self._payout_ids = {}
+        self._seen = {}
+        self._errors = {}
+
+    def _push(self, when, kind, external_id, intervals=None):
+        entry = (when, next(self._counter), kind, external_id, intervals)
+        heapq.heappush(self._schedule, entry)
+
+    def _add(self, payouts):
+        rejected = []
+        for index, payout in enumerate(payouts):
+            try:
+                payout = _validate(payout)
+            except exceptions.InvalidParameterError as e:
+                key = payout.get("external_id") if isinstance(payout, dict) else None
+                if not isinstance(key, str) or not key:
+                    key = index
+                rejected.append(PayoutUpdate(external_id=key, finished=True, error=e))
+                continue
+            external_id = payout.external_id
+            if external_id in self._inputs:
+                if payout != self._inputs[external_id]:
+                    error = exceptions.InvalidParameterError(
+                        ["external_id"],
+                        "Payout conflicts with a previous one with external_id "
+                        "{}".format(external_id),
+                    )
+                    rejected.append(
+                        PayoutUpdate(
+                            external_id=external_id, finished=True, error=error
+                        )
+                    )
+                continue
+            self._inputs[external_id] = payout
+            if self.cache is not None and external_id in self.cache:
+                payout_id = self.cache.get(external_id)
+                if payout_id is None:
+                    self._push(0, _RECONCILE, external_id, iter(self.backoff))
+                else:
+                    self._track(external_id, payout_id, 0)
+            else:
+                self._push(0, _SUBMIT, external_id)
+        return rejected
+
+    def _track(self, external_id, payout_id, when):
+        self._payout_ids[external_id] = payout_id
+        self._seen[external_id] = 0
+        self._errors[external_id] = 0
+        self._push(when, _CHECK, external_id, iter(self.backoff))
+
+    async def _run(self, entry):
+        _, _, kind, external_id, _ = entry
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        if kind == _SUBMIT:
+            return await self._client.create_payout(self._inputs[external_id])
+        if kind == _RECONCILE:
+            return await self._find(external_id)
+        return await self._client.get_payout(self._payout_ids[external_id])
+
+    async def _find(self, external_id):
+        payouts = self._client.iter_payouts({"external_id": external_id})
+        try:
+            async for payout in payouts:
+                if payout.external_id == external_id:
+                    return payout
+        finally:
+            await payouts.aclose()
+        return None
+
+    def _forget(self, external_id):
+        self._seen.pop(external_id, None)
+        self._errors.pop(external_id, None)
+
+    def _failed(self, external_id, error):
+        self._errors[external_id] = self._errors.get(external_id, 0) + 1
+        if self._errors[external_id] < self.max_errors:
+            return None
+        self._forget(external_id)
+        return PayoutUpdate(
+            external_id=external_id,
+            payout_id=self._payout_ids.get(external_id),
+            finished=True,
+            error=error,
+        )
+
+    def _submitted(self, external_id, payout_id, when):
+        if self.cache is not None:
+            self.cache.set(external_id, payout_id)
+        self._track(external_id, payout_id, when)
+        return PayoutUpdate(external_id=external_id, payout_id=payout_id)
+
+    def _handle(self, entry, result, error, now):
+        _, _, kind, external_id, intervals = entry
+        if kind == _SUBMIT:
+            if error is None:
+                return self._submitted(
+                    external_id, result.id, now + next(iter(self.backoff))
+                )
+            if not _ambiguous(error):
+                return PayoutUpdate(external_id=external_id, finished=True, error=error)
+            # Look the payout up before submitting it again, also on later
+            # runs if the batch gives up on it now
+            if self.cache is not None:
+                self.cache.set(external_id, None)
+            intervals = intervals or iter(self.backoff)
+            update = self._failed(external_id, error)
+            if update is None:
+                self._push(now + next(intervals), _RECONCILE, external_id, intervals)
+            return update
+
+        if kind == _RECONCILE:
+            if error is not None:
+                update = self._failed(external_id, error)
+                if update is None:
+                    self._push(
+                        now + next(intervals), _RECONCILE, external_id, intervals
+                    )
+                return update
+            if result is None:
+                self._push(now, _SUBMIT, external_id, intervals)
+                return None
+            return self._submitted(external_id, result.id, now)
+
+        payout_id = self._payout_ids[external_id]
+        if error is not None:
+            update = self._failed(external_id, error)
+            if update is None:
+                self._push(now + next(intervals), _CHECK, external_id, intervals)
+            return update
+
+        self._errors[external_id] = 0
+        seen = self._seen[external_id]
+        transitions = result.events[seen:]
+        finished = bool(result.events) and (
+            result.events[-1].state in self.terminal_states
+        )
+        if finished:
+            self._forget(external_id)
+        else:
+            self._seen[external_id] = len(result.events)
+            if transitions:
+                # The payout is moving, check it often again
+                intervals = iter(self.backoff)
+            self._push(now + next(intervals), _CHECK, external_id, intervals)
+        if not transitions and not finished:
+            return None
+        return PayoutUpdate(
+            external_id=external_id,
+            payout_id=payout_id,
+            payout=result,
+            transitions=transitions,
+            finished=finished,
+        )
+
+    async def updates(self, payouts, timeout=None):
+        """
+        Submit the payouts and check them as they're due, yielding an update
+        every time one is submitted, rejected or changes state.
+
+        When ``timeout`` runs out no more requests are started, and once the
+        ones in flight finish an update with ``timed_out`` set is yielded for
+        each payout not finished yet.
+
+        This is an async generator, use it with ``async for``.
+
+        :param payouts: The payouts, as inputs or as their keyword arguments
+        :type payouts: iterable of
+                       :class:`~prometeo.crossborder.models.PayoutTransferInput`
+                       or dict
+
+        :param timeout: Seconds to keep tracking the payouts, tracks them
+                        until they finish if ``None``
+        :type timeout: float
+
+        :rtype: async iterator of
+                :class:`~prometeo.crossborder.models.PayoutUpdate`
+        """
+        self._reset()
+        for update in self._add(payouts):
+            yield update
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        pending = {}
+        try:
+            while self._schedule or pending:
+                now = loop.time()
+                expired = deadline is not None and now >= deadline
+                if expired and not pending:
+                    break
+                while (
+                    not expired
+                    and len(pending) < self.concurrency
+                    and self._schedule
+                    and self._schedule[0][0] <= now
+                ):
+                    entry = heapq.heappop(self._schedule)
+                    pending[asyncio.ensure_future(self._run(entry))] = entry
+                wake_at = None
+                if not expired and self._schedule and len(pending) < self.concurrency:
+                    wake_at = self._schedule[0][0]
+                    if deadline is not None:
+                        wake_at = min(wake_at, deadline)
+                if not pending:
+                    await asyncio.sleep(wake_at - now)
+                    continue
+
+                done, _ = await asyncio.wait(
+                    pending.keys(),
+                    timeout=None if wake_at is None else max(wake_at - now, 0),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    entry = pending.pop(task)
+                    error = task.exception()
+                    result = None if error else task.result()
+                    update = self._handle(entry, result, error, loop.time())
+                    if update is not None:
+                        yield update
+        finally:
+            for task in pending:
+                task.cancel()
+
+        for _, _, _, external_id, _ in sorted(self._schedule):
+            yield PayoutUpdate(
+                external_id=external_id,
+                payout_id=self._payout_ids.get(external_id),
+                timed_out=True,
+            )
+
+    @utils.adapt_async_sync
+    async def run(self, payouts, timeout=None):
+        """
+        Submit the payouts and track them until all of them are finished or
+        ``timeout`` runs out.
+
+        :param payouts: The payouts, as inputs or as their keyword arguments
+        :type payouts: iterable of
+                       :class:`~prometeo.crossborder.models.PayoutTransferInput`
+                       or dict
+
+        :param timeout: Seconds to keep tracking the payouts, the ones not
+                        finished by then are reported as ``unfinished``
+        :type timeout: float
+
+        :rtype: :class:`~prometeo.crossborder.models.PayoutReport`
+        """
+        loop = asyncio.get_event_loop()
+        started = loop.time()
+        report = PayoutReport()
+        last_states = {}
+        async for update in self.updates(payouts, timeout):
+            if update.payout_id is not None:
+                report.payout_ids[update.external_id] = update.payout_id
+            if update.payout is not None and update.payout.events:
+                last_states[update.external_id] = update.payout.events[-1].state
+            if update.timed_out:
+                report.unfinished[update.external_id] = last_states.get(
+                    update.external_id
+                )
+            elif not update.finished:
+                continue
+            elif update.error is not None:
+                report.errors[update.external_id] = update.error
+            else:
+                report.states[update.external_id] = last_states[update.external_id]
+        report.seconds = loop.time() - started
+        return report
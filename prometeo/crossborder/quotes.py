@@ -0,0 +1,319 @@
+import asyncio
+import inspect
+import logging
+import time
+from bisect import insort
+from datetime import datetime, timezone
+from itertools import count
+
+from prometeo import utils
+from .exceptions import InvalidQuoteException, QuoteAlreadyUsedException
+from .models import FXQuoteData
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_SIZE = 2
+
+DEFAULT_MARGIN = 5.0
+
+DEFAULT_HOT_TTL = 5 * 60
+
+DEFAULT_REFRESH_INTERVAL = 1.0
+
+
+def quote_expiration(quote):
+    """
+    The ``expires_at`` of a quote as a timestamp, ``0`` if it can't be parsed.
+
+    :type quote: :class:`~prometeo.crossborder.models.FXQuoteDataResponse`
+    :rtype: float
+    """
+    value = quote.expires_at
+    if value.endswith("Z"):
+        value = value[:-1] + "+00:00"
+    try:
+        expires_at = datetime.fromisoformat(value)
+    except ValueError:
+        return 0
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=timezone.utc)
+    return expires_at.timestamp()
+
+
+class QuoteManager(object):
+    """
+    Keeps pools of FX quotes already requested to the API, so that a valid
+    quote is usually available without waiting for a request.
+
+    Quotes are single use, so each one is handed out only once, and are
+    dropped ``margin`` seconds before their ``expires_at``. The pools of the
+    pairs and amounts requested in the last ``hot_ttl`` seconds are refilled
+    in the background, up to ``pool_size`` quotes each. When the quotes of
+    a pair and amount are too short lived to be kept, they stop being
+    prefetched until a quote requested on demand lasts long enough.
+
+    .. code-block:: python
+
+        async with QuoteManager(client.crossborder) as quotes:
+            quote = await quotes.get_quote("PEN/BRL", 100)
+            await client.crossborder.create_intent(
+                IntentDataRequest(..., amount=100, quote=quote.id)
+            )
+
+    :param client: The client used to request the quotes
+    :type client: :class:`~prometeo.crossborder.client.CrossBorderAPIClient`
+
+    :param pool_size: Quotes kept ready for each pair and amount
+    :type pool_size: int
+
+    :param margin: Seconds before ``expires_at`` a quote stops being handed
+                   out, to leave time to use it
+    :type margin: float
+
+    :param amount_band: Maps the requested amount to the amount quoted, for
+                        example to the next multiple of 100, so that close
+                        amounts share a pool. By default each amount has its
+                        own pool
+    :type amount_band: callable
+
+    :param hot_ttl: Seconds since its last use a pool keeps being refilled
+    :type hot_ttl: float
+
+    :param refresh_interval: Seconds between checks of the pools, while
+                             the manager is started
+    :type refresh_interval: float
+
+    :param concurrency: Maximum number of quote requests at the same time
+    :type concurrency: int
+
+    :param rate_limiter: Limits the number of quote requests per second
+    :type rate_limiter: :class:`~prometeo.utils.RateLimiter`
+    """
+
+    def __init__(
+        self,
+        client,
+        pool_size=DEFAULT_POOL_SIZE,
+        margin=DEFAULT_MARGIN,
+        amount_band=None,
+        hot_ttl=DEFAULT_HOT_TTL,
+        refresh_interval=DEFAULT_REFRESH_INTERVAL,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        rate_limiter=None,
+    ):
+        self.client = client
+        self.pool_size = pool_size
+        self.margin = margin
+        self.amount_band = amount_band
+        self.hot_ttl = hot_ttl
+        self.refresh_interval = refresh_interval
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        # Sorted lists of (expiration, order, quote) per (pair, amount)
+        self._pools = {}
+        self._last_used = {}
+        self._filling = {}
+        self._fill_tasks = {}
+        # Prefetched quotes too short lived for the pools, handed out while
+        # they haven't expired, and the keys not prefetched because of them
+        self._spare = {}
+        self._no_prefetch = set()
+        self._order = count()
+        self._semaphore = None
+        self._refresh_task = None
+
+    def _key(self, pair, amount):
+        if self.amount_band is not None:
+            amount = self.amount_band(amount)
+        return pair.upper(), amount
+
+    async def _request(self, pair, amount):
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+        async with self._semaphore:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            return await self.client.create_fx_quote(
+                FXQuoteData(amount=amount, pair=pair)
+            )
+
+    def _usable(self, expiration):
+        return expiration - self.margin > time.time()
+
+    def _prune(self, key):
+        pool = self._pools.get(key)
+        if not pool:
+            return
+        stale = 0
+        while stale < len(pool) and not self._usable(pool[stale][0]):
+            stale += 1
+        del pool[:stale]
+
+    def _check_lifetime(self, key, quote):
+        expiration = quote_expiration(quote)
+        if self._usable(expiration):
+            self._no_prefetch.discard(key)
+            return expiration
+        if key not in self._no_prefetch:
+            logger.warning(
+                "Quotes for %s %s expire within the margin or have an invalid "
+                "expires_at %r, not prefetching them",
+                *key,
+                quote.expires_at,
+            )
+            self._no_prefetch.add(key)
+        return None
+
+    def _take_spare(self, key):
+        spare = self._spare.get(key)
+        now = time.time()
+        while spare:
+            expiration, quote = spare.pop(0)
+            if expiration > now:
+                return quote
+        return None
+
+    async def _fill(self, key):
+        self._prune(key)
+        missing = (
+            self.pool_size - len(self._pools.get(key, ())) - self._filling.get(key, 0)
+        )
+        if missing <= 0:
+            return
+        self._filling[key] = self._filling.get(key, 0) + missing
+        try:
+            results = await asyncio.gather(
+                *[self._request(*key) for _ in range(missing)],
+                return_exceptions=True,
+            )
+        finally:
+            self._filling[key] -= missing
+        for result in results:
+            if isinstance(result, Exception):
+                logger.warning(
+                    "Error prefetching quote for %s %s", *key, exc_info=result
+                )
+                continue
+            expiration = self._check_lifetime(key, result)
+            if expiration is not None:
+                pool = self._pools.setdefault(key, [])
+                insort(pool, (expiration, next(self._order), result))
+            else:
+                spare = self._spare.setdefault(key, [])
+                spare.append((quote_expiration(result), result))
+
+    def _schedule_fill(self, key):
+        if key in self._fill_tasks or key in self._no_prefetch or self.pool_size <= 0:
+            return
+        task = asyncio.ensure_future(self._fill(key))
+        self._fill_tasks[key] = task
+        task.add_done_callback(lambda _: self._fill_tasks.pop(key, None))
+
+    def available(self, pair, amount):
+        """
+        Number of valid quotes ready for a pair and amount.
+
+        :rtype: int
+        """
+        key = self._key(pair, amount)
+        self._prune(key)
+        return len(self._pools.get(key, ()))
+
+    async def get_quote(self, pair, amount):
+        """
+        A quote that hasn't been handed out before, from the pool if there
+        is one valid, or else requested right away. Either way the pool is
+        refilled in the background, unless the quotes of the pair and amount
+        are too short lived to be kept.
+
+        :param pair: The currency pair, like ``PEN/BRL``
+        :type pair: str
+
+        :param amount: The amount to quote
+        :type amount: float
+
+        :raises: The errors of
+                 :meth:`~prometeo.crossborder.client.CrossBorderAPIClient.create_fx_quote`
+        :rtype: :class:`~prometeo.crossborder.models.FXQuoteDataResponse`
+        """
+        key = self._key(pair, amount)
+        self._last_used[key] = time.monotonic()
+        self._prune(key)
+        pool = self._pools.get(key)
+        if pool:
+            quote = pool.pop(0)[2]
+        else:
+            quote = self._take_spare(key)
+            if quote is None:
+                quote = await self._request(*key)
+                self._check_lifetime(key, quote)
+        self._schedule_fill(key)
+        return quote
+
+    async def use_quote(self, pair, amount, func, retries=1):
+        """
+        Call ``func(quote)`` with a quote from :meth:`get_quote`, and again
+        with a new one if the API rejects the quote as already used or
+        invalid.
+
+        :param func: Called with the quote, it may return an awaitable
+        :type func: callable
+
+        :param retries: Times a rejected quote is replaced
+        :type retries: int
+
+        :return: The result of ``func``
+        """
+        attempt = 0
+        while True:
+            quote = await self.get_quote(pair, amount)
+            try:
+                result = func(quote)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+            except (QuoteAlreadyUsedException, InvalidQuoteException):
+                if attempt >= retries:
+                    raise
+                attempt += 1
+
+    async def _refresh(self):
+        while True:
+            now = time.monotonic()
+            for key, last_used in list(self._last_used.items()):
+                if now - last_used > self.hot_ttl:
+                    del self._last_used[key]
+                    self._pools.pop(key, None)
+                    self._spare.pop(key, None)
+                    self._no_prefetch.discard(key)
+                else:
+                    self._schedule_fill(key)
+            await asyncio.sleep(self.refresh_interval)
+
+    async def start(self):
+        """
+        Start refreshing the pools in the background, also done by using the
+        manager as an async context manager.
+        """
+        if self._refresh_task is None:
+            self._refresh_task = asyncio.ensure_future(self._refresh())
+
+    async def stop(self):
+        """
+        Stop refreshing the pools and cancel the pending requests.
+        """
+        tasks = list(self._fill_tasks.values())
+        if self._refresh_task is not None:
+            tasks.append(self._refresh_task)
+            self._refresh_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
@@ -1,3 +1,4 @@
 from .client import CurpAPIClient, Gender, State
+from .models import Person
 
-__all__ = ["CurpAPIClient", "Gender", "State"]
+__all__ = ["CurpAPIClient", "Gender", "State", "Person"]
@@ -1,62 +1,23 @@
-from enum import Enum
-from datetime import datetime
+from pydantic import ValidationError
 
 from prometeo import base_client, utils
-from .models import QueryResult, DocumentData, PersonalData
-from .exceptions import CurpError
+from prometeo.models import BatchResult
+from .models import (  # noqa: F401
+    QueryResult,
+    DocumentData,
+    PersonalData,
+    Person,
+    Gender,
+    State,
+)
+from .exceptions import CurpError, InvalidPersonError
+from .validation import validate_curp
 
 PRODUCTION_URL = "https://identity.prometeoapi.net"
 BETA_URL = "https://identity.beta.prometeoapi.com"
 SANDBOX_URL = "https://identity.sandbox.prometeoapi.com"
 
 
-class Gender(Enum):
-    """A person's gender"""
-
-    MALE = "H"
-    FEMALE = "M"
-
-
-class State(Enum):
-    """
-    The state a person is registered
-    """
-
-    AGUASCALIENTES = "AS"
-    BAJA_CALIFORNIA = "BC"
-    BAJA_CALIFORNIA_SUR = "BS"
-    CAMPECHE = "CC"
-    COAHUILA = "CL"
-    COLIMA = "CM"
-    CHIAPAS = "CS"
-    CHIHUAHUA = "CH"
-    CIUDAD_DE_MEXICO = "DF"
-    DURANGO = "DG"
-    GUANAJUATO = "GT"
-    GUERRERO = "GR"
-    HIDALGO = "HG"
-    JALISCO = "JC"
-    ESTADO_DE_MEXICO = "MC"
-    MICHOACAN = "MN"
-    MORELOS = "MS"
-    NAYARIT = "NT"
-    NUEVO_LEON = "NL"
-    OAXACA = "OC"
-    PUEBLA = "PL"
-    QUERETARO = "QT"
-    QUINTANA_ROO = "QR"
-    SAN_LUIS_POTOSI = "SP"
-    SINALOA = "SL"
-    SONORA = "SR"
-    TABASCO = "TC"
-    TAMAULIPAS = "TS"
-    TLAXCALA = "TL"
-    VERACRUZ = "VZ"
-    YUCATAN = "YN"
-    ZACATECA = "ZS"
-    NACIDO_EN_EL_EXTRANJERO = "NE"
-
-
 class CurpAPIClient(base_client.BaseClient):
     """
     API Client for CURP queries
@@ -73,7 +34,7 @@ class CurpAPIClient(base_client.BaseClient):
             return None
         for fmt in ("%Y-%m-%d", "%d/%m/%Y"):
             try:
-                return datetime.strptime(date_str, fmt)
+                return utils.parse_date(date_str, fmt)
             except ValueError:
                 continue
         return None
@@ -112,15 +73,24 @@ class CurpAPIClient(base_client.BaseClient):
         )
 
     @utils.adapt_async_sync
-    async def query(self, curp):
+    async def query(self, curp, validate=True):
         """
         Find the personal data associated with a CURP
 
         :param curp: The CURP of the person to query
         :type curp: str
 
+        :param validate: Check that the CURP is well formed before calling
+                         the API, see
+                         :func:`~prometeo.curp.validation.validate_curp`
+        :type validate: bool
+
+        :raises: :class:`~prometeo.curp.exceptions.InvalidCurpError` if the
+                 CURP is malformed
         :rtype: :class:`~prometeo.curp.models.QueryResult`
         """
+        if validate:
+            curp = validate_curp(curp)
         response = await self.call_api(
             "POST",
             "/query",
@@ -174,3 +144,155 @@ class CurpAPIClient(base_client.BaseClient):
         if response["errors"] is not None:
             raise CurpError(response["errors"]["detail"])
         return self._make_result(response["data"])
+
+    async def query_many(
+        self,
+        curps,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        rate_limiter=None,
+        cache=None,
+        validate=True,
+    ):
+        """
+        Query many CURPs concurrently, yielding the results as they complete.
+        Repeated CURPs are only queried once.
+
+        A CURP that doesn't exist or fails doesn't stop the others, its
+        :class:`~prometeo.curp.exceptions.CurpError` or other exception is
+        reported in the result instead.
+
+        This is an async generator, use it with ``async for``.
+
+        :param curps: The CURPs to query
+        :type curps: iterable of str
+
+        :param concurrency: Maximum number of queries at the same time
+        :type concurrency: int
+
+        :param rate_limiter: Limits the number of queries per second
+        :type rate_limiter: :class:`~prometeo.utils.RateLimiter`
+
+        :param cache: Cache of previous answers keyed by CURP, queries found
+                      in it aren't sent again
+        :type cache: :class:`~prometeo.utils.TTLCache`
+
+        :param validate: Report malformed CURPs as
+                         :class:`~prometeo.curp.exceptions.InvalidCurpError`
+                         without querying them
+        :type validate: bool
+
+        :rtype: async iterator of :class:`~prometeo.models.BatchResult`, keyed
+                by CURP
+        """
+
+        def unique_curps():
+            seen = set()
+            for curp in curps:
+                curp = curp.strip().upper()
+                if curp not in seen:
+                    seen.add(curp)
+                    yield curp
+
+        async def query(curp):
+            if validate:
+                try:
+                    validate_curp(curp)
+                except CurpError as e:
+                    return None, e
+            if cache is not None:
+                cached = cache.get(curp)
+                if cached is not None:
+                    return cached
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            try:
+                answer = (await self.query(curp, validate=False), None)
+            except CurpError as e:
+                answer = (None, e)
+            if cache is not None:
+                cache.set(curp, answer)
+            return answer
+
+        calls = utils.iter_concurrently(query, unique_curps(), concurrency)
+        try:
+            async for curp, answer, error in calls:
+                if error is None:
+                    result, error = answer
+                else:
+                    result = None
+                yield BatchResult(key=curp, result=result, error=error)
+        finally:
+            await calls.aclose()
+
+    async def reverse_query_many(
+        self, people, concurrency=utils.DEFAULT_CONCURRENCY, rate_limiter=None
+    ):
+        """
+        Search for many people concurrently, yielding the results as they
+        complete. Rows with the same normalized information are searched
+        once and get the same result.
+
+        Malformed rows are reported as
+        :class:`~prometeo.curp.exceptions.InvalidPersonError` without calling
+        the API, and a row that fails doesn't stop the others.
+
+        This is an async generator, use it with ``async for``.
+
+        :param people: ``(row_id, person)`` pairs, where person is a
+                       :class:`~prometeo.curp.models.Person` or a dict of its
+                       fields
+        :type people: iterable
+
+        :param concurrency: Maximum number of queries at the same time
+        :type concurrency: int
+
+        :param rate_limiter: Limits the number of queries per second
+        :type rate_limiter: :class:`~prometeo.utils.RateLimiter`
+
+        :rtype: async iterator of :class:`~prometeo.models.BatchResult`, keyed
+                by row id
+        """
+        rows = {}
+        invalid = []
+        for row_id, person in people:
+            if not isinstance(person, Person):
+                try:
+                    person = Person(**person)
+                except (TypeError, ValidationError) as e:
+                    invalid.append(
+                        BatchResult(key=row_id, error=InvalidPersonError(str(e)))
+                    )
+                    continue
+            key = (
+                person.state,
+                person.birthdate.date(),
+                person.name,
+                person.first_surname,
+                person.last_surname,
+                person.gender,
+            )
+            rows.setdefault(key, (person, []))[1].append(row_id)
+
+        for result in invalid:
+            yield result
+
+        async def query(item):
+            person, _ = item
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            return await self.reverse_query(
+                person.state,
+                person.birthdate,
+                person.name,
+                person.first_surname,
+                person.last_surname,
+                person.gender,
+            )
+
+        calls = utils.iter_concurrently(query, rows.values(), concurrency)
+        try:
+            async for (_, row_ids), result, error in calls:
+                for row_id in row_ids:
+                    yield BatchResult(key=row_id, result=result, error=error)
+        finally:
+            await calls.aclose()
@@ -3,3 +3,20 @@ from prometeo import exceptions
 
 class CurpError(exceptions.PrometeoError):
     pass
+
+
+class InvalidCurpError(CurpError):
+    """
+    The CURP is malformed, detected locally without calling the API
+    """
+
+    pass
+
+
+class InvalidPersonError(CurpError):
+    """
+    The personal information of a reverse query is malformed, detected
+    locally without calling the API
+    """
+
+    pass
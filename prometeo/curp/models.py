@@ -1,7 +1,57 @@
+from enum import Enum
 from typing import Optional, Union
-from pydantic import BaseModel
+from pydantic import BaseModel, field_validator
 from datetime import datetime
 
+from prometeo import utils
+
+
+class Gender(Enum):
+    """A person's gender"""
+
+    MALE = "H"
+    FEMALE = "M"
+
+
+class State(Enum):
+    """
+    The state a person is registered
+    """
+
+    AGUASCALIENTES = "AS"
+    BAJA_CALIFORNIA = "BC"
+    BAJA_CALIFORNIA_SUR = "BS"
+    CAMPECHE = "CC"
+    COAHUILA = "CL"
+    COLIMA = "CM"
+    CHIAPAS = "CS"
+    CHIHUAHUA = "CH"
+    CIUDAD_DE_MEXICO = "DF"
+    DURANGO = "DG"
+    GUANAJUATO = "GT"
+    GUERRERO = "GR"
+    HIDALGO = "HG"
+    JALISCO = "JC"
+    ESTADO_DE_MEXICO = "MC"
+    MICHOACAN = "MN"
+    MORELOS = "MS"
+    NAYARIT = "NT"
+    NUEVO_LEON = "NL"
+    OAXACA = "OC"
+    PUEBLA = "PL"
+    QUERETARO = "QT"
+    QUINTANA_ROO = "QR"
+    SAN_LUIS_POTOSI = "SP"
+    SINALOA = "SL"
+    SONORA = "SR"
+    TABASCO = "TC"
+    TAMAULIPAS = "TS"
+    TLAXCALA = "TL"
+    VERACRUZ = "VZ"
+    YUCATAN = "YN"
+    ZACATECA = "ZS"
+    NACIDO_EN_EL_EXTRANJERO = "NE"
+
 
 class DocumentData(BaseModel):
     foja: Optional[str] = None
@@ -34,3 +84,50 @@ class QueryResult(BaseModel):
     personal_data: PersonalData
     pdf_url: Optional[str] = None
     pdf: Optional[object] = None
+
+
+class Person(BaseModel):
+    """
+    Personal information of someone to search with a reverse query.
+
+    Names are normalized to uppercase with single spaces, ``state`` and
+    ``gender`` accept the enum members, their values or their names, and
+    ``birthdate`` also accepts ``dd/mm/yyyy`` strings.
+    """
+
+    state: State
+    birthdate: datetime
+    name: str
+    first_surname: str
+    last_surname: str = ""
+    gender: Gender
+
+    @field_validator("name", "first_surname", "last_surname", mode="before")
+    def normalize_name(cls, v):
+        if isinstance(v, str):
+            v = " ".join(v.split()).upper()
+        return v
+
+    @field_validator("name", "first_surname")
+    def check_not_empty(cls, v):
+        if not v:
+            raise ValueError("must not be empty")
+        return v
+
+    @field_validator("state", mode="before")
+    def parse_state(cls, v):
+        if isinstance(v, str) and v.upper() in State.__members__:
+            return State[v.upper()]
+        return v
+
+    @field_validator("gender", mode="before")
+    def parse_gender(cls, v):
+        if isinstance(v, str) and v.upper() in Gender.__members__:
+            return Gender[v.upper()]
+        return v
+
+    @field_validator("birthdate", mode="before")
+    def parse_birthdate(cls, v):
+        if isinstance(v, str) and "/" in v:
+            return utils.parse_date(v.strip(), "%d/%m/%Y")
+        return v
@@ -0,0 +1,103 @@
+import re
+from datetime import date
+
+from .exceptions import InvalidCurpError
+from .models import Gender, State
+
+
+CURP_LENGTH = 18
+
+_CURP_RE = re.compile(
+    r"^[A-Z][AEIOUX][A-Z]{2}"  # initials of the surnames and name
+    r"(\d{2})(\d{2})(\d{2})"  # birthdate, YYMMDD
+    r"([A-Z])"  # gender
+    r"([A-Z]{2})"  # state
+    r"[B-DF-HJ-NP-TV-Z]{3}"  # consonants of the surnames and name
+    r"([0-9A-Z])"  # homoclave, a digit for people born before 2000
+    r"(\d)$"  # check digit
+)
+
+_GENDERS = frozenset(gender.value for gender in Gender)
+
+_STATES = frozenset(state.value for state in State)
+
+_CHAR_VALUES = {
+    char: value for value, char in enumerate("0123456789ABCDEFGHIJKLMNÑOPQRSTUVWXYZ")
+}
+
+
+def check_digit(curp):
+    """
+    Compute the check digit of a CURP from its first 17 characters.
+
+    :param curp: The CURP, only the first 17 characters are used
+    :type curp: str
+
+    :rtype: str
+    """
+    total = 0
+    for position, char in enumerate(curp[:17]):
+        total += _CHAR_VALUES[char] * (18 - position)
+    return str((10 - total % 10) % 10)
+
+
+def _check(curp):
+    if len(curp) != CURP_LENGTH:
+        return "must have {} characters".format(CURP_LENGTH)
+    match = _CURP_RE.match(curp)
+    if match is None:
+        return "invalid format"
+    year, month, day, gender, state, homoclave, digit = match.groups()
+    century = 1900 if homoclave.isdigit() else 2000
+    try:
+        date(century + int(year), int(month), int(day))
+    except ValueError:
+        return "invalid birthdate"
+    if gender not in _GENDERS:
+        return "invalid gender {}".format(gender)
+    if state not in _STATES:
+        return "invalid state {}".format(state)
+    if check_digit(curp) != digit:
+        return "invalid check digit"
+    return None
+
+
+def validate_curp(curp):
+    """
+    Check locally that a CURP is well formed: its layout, birthdate, gender,
+    state and check digit. This doesn't mean the CURP exists.
+
+    :param curp: The CURP, surrounding whitespace and case are ignored
+    :type curp: str
+
+    :raises: :class:`~prometeo.curp.exceptions.InvalidCurpError`
+    :return: The normalized CURP
+    :rtype: str
+    """
+    normalized = curp.strip().upper()
+    reason = _check(normalized)
+    if reason is not None:
+        raise InvalidCurpError("Invalid CURP {!r}: {}".format(curp, reason))
+    return normalized
+
+
+def is_valid_curp(curp):
+    """
+    Same as :func:`validate_curp`, but returns whether the CURP is valid.
+
+    :rtype: bool
+    """
+    return _check(curp.strip().upper()) is None
+
+
+def validate_curps(curps):
+    """
+    Validate many CURPs at once, see :func:`validate_curp`.
+
+    :param curps: The CURPs to validate
+    :type curps: iterable of str
+
+    :return: For each CURP, ``None`` if it's valid or the reason it isn't
+    :rtype: List of str
+    """
+    return [_check(curp.strip().upper()) for curp in curps]
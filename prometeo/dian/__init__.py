@@ -7,6 +7,7 @@ from .client import (
     NumerationType,
     MonthlyPeriod,
 )
+from .numeration import NumerationIndex
 
 __all__ = [
     "DianAPIClient",
@@ -16,4 +17,5 @@ __all__ = [
     "BimonthlyPeriod",
     "MonthlyPeriod",
     "NumerationType",
+    "NumerationIndex",
 ]
@@ -1,7 +1,7 @@
 from enum import Enum
-from datetime import datetime
 
 from prometeo import exceptions, base_client, base_session, utils
+from prometeo.models import BatchResult
 from .models import (
     CompanyInfo,
     Member,
@@ -17,6 +17,7 @@ from .models import (
     Numeration,
     NumerationRange,
     Retentions,
+    Dossier,
 )
 
 PRODUCTION_URL = "https://fiscal.prometeoapi.net"
@@ -168,6 +169,88 @@ class Session(base_session.BaseSession):
         """
         return await self._client.get_retentions(self._session_key, year, period)
 
+    @utils.adapt_async_sync
+    async def get_dossier(
+        self,
+        years,
+        vat_periodicity=Periodicity.BIMONTHLY,
+        retentions=True,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+    ):
+        """
+        Get the company info, balances and every declaration of several
+        years, fetching them concurrently.
+
+        A failed call doesn't stop the others, its error is added to the
+        ``errors`` of the dossier, keyed by a tuple with the name of the
+        document and its year and period.
+
+        :param years: Years of the declarations
+        :type years: List of int
+
+        :param vat_periodicity: Periodicity of the VAT declarations, ``None``
+                                to skip them
+        :type vat_periodicity: :class:`Periodicity`
+
+        :param retentions: Whether to get the retentions of every month
+        :type retentions: bool
+
+        :param concurrency: Maximum number of calls at the same time
+        :type concurrency: int
+
+        :rtype: :class:`~prometeo.dian.models.Dossier`
+        """
+        calls = [
+            (("company_info",), self.get_company_info, ()),
+            (("balances",), self.get_balances, ()),
+        ]
+        for year in years:
+            calls.append(
+                (("rent_declaration", year), self.get_rent_declaration, (year,))
+            )
+            if vat_periodicity is not None:
+                periods = (
+                    QuarterlyPeriod
+                    if vat_periodicity == Periodicity.QUARTERLY
+                    else BimonthlyPeriod
+                )
+                for period in periods:
+                    calls.append(
+                        (
+                            ("vat_declaration", year, period.value),
+                            self.get_vat_declaration,
+                            (year, vat_periodicity, period),
+                        )
+                    )
+            if retentions:
+                for period in MonthlyPeriod:
+                    calls.append(
+                        (
+                            ("retentions", year, period.value),
+                            self.get_retentions,
+                            (year, period),
+                        )
+                    )
+
+        results = await utils.map_concurrently(
+            lambda call: call[1](*call[2]), calls, concurrency, return_exceptions=True
+        )
+        dossier = Dossier()
+        for (key, _, _), result in zip(calls, results):
+            if isinstance(result, Exception):
+                dossier.errors.append(BatchResult(key=key, error=result))
+            elif key[0] == "company_info":
+                dossier.company_info = result
+            elif key[0] == "balances":
+                dossier.balances = result
+            elif key[0] == "rent_declaration":
+                dossier.rent_declarations[key[1]] = result
+            elif key[0] == "vat_declaration":
+                dossier.vat_declarations.setdefault(key[1], {})[key[2]] = result
+            elif key[0] == "retentions":
+                dossier.retentions.setdefault(key[1], {})[key[2]] = result
+        return dossier
+
 
 class DianAPIClient(base_client.BaseClient):
     """
@@ -230,7 +313,7 @@ class DianAPIClient(base_client.BaseClient):
         return CompanyInfo(
             accountant=Accountant(
                 document=data["accountant"]["document"],
-                start_date=datetime.strptime(
+                start_date=utils.parse_date(
                     data["accountant"]["start_date"], "%d/%m/%Y"
                 ),
                 name=data["accountant"]["name"],
@@ -242,11 +325,11 @@ class DianAPIClient(base_client.BaseClient):
             pdf=base_client.Download(self, data["pdf_url"]),
             location=Location(**data["location"]),
             name=data["name"],
-            constitution_date=datetime.strptime(data["constitution_date"], "%d/%m/%Y"),
+            constitution_date=utils.parse_date(data["constitution_date"], "%d/%m/%Y"),
             representation=[
                 Representative(
                     representation_type=representative["representation_type"],
-                    start_date=datetime.strptime(
+                    start_date=utils.parse_date(
                         representative["start_date"], "%d/%m/%Y"
                     ),
                     document_type=representative["document_type"],
@@ -261,7 +344,7 @@ class DianAPIClient(base_client.BaseClient):
                     document=member["document"],
                     nationality=member["nationality"],
                     name=Name(**member["name"]),
-                    start_date=datetime.strptime(member["start_date"], "%d/%m/%Y"),
+                    start_date=utils.parse_date(member["start_date"], "%d/%m/%Y"),
                 )
                 for member in data["members"]
             ],
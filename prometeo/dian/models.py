@@ -1,7 +1,9 @@
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel
 from datetime import datetime
 
+from prometeo.models import BatchResult
+
 
 class Balance(BaseModel):
     type: str
@@ -145,3 +147,12 @@ class CompanyInfo(BaseModel):
 
     class Config:
         validate_assignment = True
+
+
+class Dossier(BaseModel):
+    company_info: Optional[CompanyInfo] = None
+    balances: Optional[List[Balance]] = None
+    rent_declarations: Dict[int, RentDeclaration] = {}
+    vat_declarations: Dict[int, Dict[int, VATDeclaration]] = {}
+    retentions: Dict[int, Dict[int, Retentions]] = {}
+    errors: List[BatchResult] = []
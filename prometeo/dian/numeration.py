@@ -0,0 +1,146 @@
+import heapq
+from bisect import bisect_right
+from collections import defaultdict
+
+
+class _Intervals(object):
+    """
+    Numeration ranges split into disjoint segments, each mapped to the first
+    range (in input order) that covers it, so lookups are a single bisect
+    even when ranges overlap.
+    """
+
+    def __init__(self, ranges):
+        boundaries = set()
+        for range in ranges:
+            boundaries.add(range.from_number)
+            boundaries.add(range.to_number + 1)
+        by_start = sorted(
+            enumerate(ranges), key=lambda item: item[1].from_number, reverse=True
+        )
+        active = []
+        self.starts = []
+        self.ranges = []
+        for boundary in sorted(boundaries):
+            while by_start and by_start[-1][1].from_number <= boundary:
+                order, range = by_start.pop()
+                heapq.heappush(active, (order, range.to_number, range))
+            # Ranges that ended are dropped once they reach the top of the
+            # heap, the top is then the first range covering the segment
+            while active and active[0][1] < boundary:
+                heapq.heappop(active)
+            covering = active[0][2] if active else None
+            if self.ranges and self.ranges[-1] is covering:
+                continue
+            self.starts.append(boundary)
+            self.ranges.append(covering)
+
+    def find(self, number):
+        index = bisect_right(self.starts, number) - 1
+        if index < 0:
+            return None
+        return self.ranges[index]
+
+
+class NumerationIndex(object):
+    """
+    An index of authorized numeration ranges, to check which range, if any,
+    authorizes an invoice number in ``O(log n)``.
+
+    Ranges are grouped by prefix, and by establishment and prefix when
+    looking up a specific establishment.
+
+    :param ranges: The numeration ranges to index
+    :type ranges: iterable of :class:`~prometeo.dian.models.NumerationRange`
+    """
+
+    def __init__(self, ranges):
+        by_prefix = defaultdict(list)
+        by_establishment = defaultdict(list)
+        for range in ranges:
+            by_prefix[range.prefix].append(range)
+            by_establishment[(range.establishment, range.prefix)].append(range)
+        self._by_prefix = {
+            prefix: _Intervals(ranges) for prefix, ranges in by_prefix.items()
+        }
+        self._by_establishment = {
+            key: _Intervals(ranges) for key, ranges in by_establishment.items()
+        }
+
+    @classmethod
+    def from_numerations(cls, numerations):
+        """
+        Build the index from the result of
+        :meth:`~prometeo.dian.client.Session.get_numeration`.
+
+        :type numerations: List of :class:`~prometeo.dian.models.Numeration`
+        :rtype: :class:`NumerationIndex`
+        """
+        return cls(range for numeration in numerations for range in numeration.ranges)
+
+    def _intervals(self, prefix, establishment):
+        if establishment is None:
+            return self._by_prefix.get(prefix)
+        return self._by_establishment.get((establishment, prefix))
+
+    def find(self, number, prefix="", establishment=None):
+        """
+        The range that authorizes an invoice number.
+
+        :param number: The invoice number, without the prefix
+        :type number: int
+
+        :param prefix: The prefix of the invoice number
+        :type prefix: str
+
+        :param establishment: Only look in the ranges of this establishment
+        :type establishment: str
+
+        :return: The range or ``None`` if the number isn't authorized
+        :rtype: :class:`~prometeo.dian.models.NumerationRange`
+        """
+        intervals = self._intervals(prefix, establishment)
+        if intervals is None:
+            return None
+        return intervals.find(number)
+
+    def is_authorized(self, number, prefix="", establishment=None):
+        """
+        Whether an invoice number is in any authorized range, see :meth:`find`.
+
+        :rtype: bool
+        """
+        return self.find(number, prefix, establishment) is not None
+
+    def find_many(self, numbers, prefix="", establishment=None):
+        """
+        Same as :meth:`find` for many invoice numbers with the same prefix.
+
+        :param numbers: The invoice numbers, any iterable of integers
+                        including numpy arrays
+        :type numbers: iterable
+
+        :rtype: List of :class:`~prometeo.dian.models.NumerationRange`
+        """
+        intervals = self._intervals(prefix, establishment)
+        if intervals is None:
+            return [None for _ in numbers]
+        starts = intervals.starts
+        ranges = intervals.ranges
+        results = []
+        for number in numbers:
+            index = bisect_right(starts, number) - 1
+            results.append(ranges[index] if index >= 0 else None)
+        return results
+
+    def authorized_many(self, numbers, prefix="", establishment=None):
+        """
+        Same as :meth:`is_authorized` for many invoice numbers with the same
+        prefix, usable as a boolean mask.
+
+        :rtype: List of bool
+        """
+        return [
+            range is not None
+            for range in self.find_many(numbers, prefix, establishment)
+        ]
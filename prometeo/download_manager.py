@@ -0,0 +1,162 @@
+import asyncio
+import hashlib
+import os
+import posixpath
+import time
+from collections import defaultdict
+
+from six.moves.urllib.parse import urlparse
+
+from prometeo import exceptions, utils
+from prometeo.models import BatchResult, DownloadStats
+
+
+DEFAULT_HOST_CONCURRENCY = 4
+
+
+def default_file_name(download):
+    """
+    Deterministic file name for a download: a hash of its full url followed
+    by the url's extension, so the same document always maps to the same
+    file and different documents never collide.
+
+    :type download: :class:`~prometeo.base_client.Download`
+    :rtype: str
+    """
+    url = download.full_url
+    extension = posixpath.splitext(urlparse(url).path)[1]
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()[:32] + extension
+
+
+class DownloadManager(object):
+    """
+    Fetches many :class:`~prometeo.base_client.Download` objects, like the
+    pdf forms of DIAN and CURP or the files of SAT, into a directory.
+
+    Files are streamed straight to disk, with at most ``concurrency``
+    downloads in flight overall and ``host_concurrency`` per host. Files that
+    already exist are skipped, so an interrupted batch can be resumed by
+    running it again, and downloads to the same file while one is in flight
+    share it.
+    """
+
+    def __init__(
+        self,
+        path,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        host_concurrency=DEFAULT_HOST_CONCURRENCY,
+        file_name=default_file_name,
+        overwrite=False,
+    ):
+        """
+        :param path: Directory to save the files to
+        :type path: str
+
+        :param concurrency: Maximum number of downloads at the same time
+        :type concurrency: int
+
+        :param host_concurrency: Maximum number of downloads at the same time
+                                 from a single host
+        :type host_concurrency: int
+
+        :param file_name: Called with each download to get the name of its
+                          file, used when the name isn't given explicitly
+        :type file_name: callable
+
+        :param overwrite: Download the files even if they already exist
+        :type overwrite: bool
+        """
+        if host_concurrency < 1:
+            raise ValueError("host_concurrency must be at least 1")
+        self.path = path
+        self.concurrency = concurrency
+        self.host_concurrency = host_concurrency
+        self.file_name = file_name
+        self.overwrite = overwrite
+        self.stats = DownloadStats()
+        self._host_semaphores = defaultdict(
+            lambda: asyncio.Semaphore(self.host_concurrency)
+        )
+        # Downloads in flight by file path
+        self._in_flight = {}
+
+    def _get_path(self, download, name):
+        name = name or self.file_name(download)
+        return os.path.join(self.path, os.path.basename(name))
+
+    async def _fetch(self, item):
+        download, name, started = item
+        file_path = self._get_path(download, name)
+        task = self._in_flight.get(file_path)
+        if task is None:
+            task = asyncio.ensure_future(self._save(download, file_path))
+            self._in_flight[file_path] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(file_path, None))
+            started.append(task)
+            return await asyncio.shield(task)
+        try:
+            await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if not task.cancelled():
+                raise
+            raise exceptions.ClientError(
+                "Download of {} was cancelled".format(download.url)
+            )
+        self.stats.skipped += 1
+        return file_path
+
+    async def _save(self, download, file_path):
+        if not self.overwrite and os.path.exists(file_path):
+            self.stats.skipped += 1
+            return file_path
+        host = urlparse(download.full_url).netloc
+        async with self._host_semaphores[host]:
+            try:
+                size = await download.save(file_path)
+            except Exception:
+                self.stats.failed += 1
+                raise
+        self.stats.downloaded += 1
+        self.stats.bytes += size
+        return file_path
+
+    @utils.adapt_async_sync
+    async def download_all(self, downloads, on_progress=None):
+        """
+        Download every file, a failed download doesn't stop the others.
+
+        :param downloads: The files to download, either as
+                          :class:`~prometeo.base_client.Download` objects or
+                          ``(download, file_name)`` tuples
+        :type downloads: iterable
+
+        :param on_progress: Called after every file as
+                            ``on_progress(result, completed)``
+        :type on_progress: callable
+
+        :return: One result per download in completion order, keyed by the
+                 download's url, with the path of the file as result
+        :rtype: List of :class:`~prometeo.models.BatchResult`
+        """
+        os.makedirs(self.path, exist_ok=True)
+        # Downloads started by this call, cancelled if it's interrupted
+        started = []
+        items = (
+            (*(item if isinstance(item, tuple) else (item, None)), started)
+            for item in downloads
+        )
+        results = []
+        start = time.monotonic()
+        calls = utils.iter_concurrently(self._fetch, items, self.concurrency)
+        try:
+            async for (download, _, _), file_path, error in calls:
+                result = BatchResult(key=download.url, result=file_path, error=error)
+                results.append(result)
+                if on_progress is not None:
+                    on_progress(result, len(results))
+        finally:
+            await calls.aclose()
+            for task in started:
+                task.cancel()
+            self.stats.seconds += time.monotonic() - start
+        return results
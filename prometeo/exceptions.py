@@ -39,6 +39,10 @@ class InvalidSessionKeyError(PrometeoError):
     pass
 
 
+class WaitTimeoutError(PrometeoError):
+    pass
+
+
 class InvalidParameterError(PrometeoError):
     def __init__(self, params, message):
         self.params = params
@@ -50,3 +54,11 @@ class InvalidParameterError(PrometeoError):
 
 class MissingParameterError(InvalidParameterError):
     pass
+
+
+class WebhookError(PrometeoError):
+    pass
+
+
+class InvalidSignatureError(WebhookError):
+    pass
@@ -0,0 +1,192 @@
+import asyncio
+import hashlib
+import mmap
+import os
+import sqlite3
+import tempfile
+import time
+
+
+DEFAULT_MAX_SIZE = 512 * 1024 * 1024
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS blobs (
+    digest TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS urls (
+    url TEXT PRIMARY KEY,
+    digest TEXT NOT NULL REFERENCES blobs (digest)
+);
+CREATE INDEX IF NOT EXISTS blobs_accessed ON blobs (accessed);
+CREATE INDEX IF NOT EXISTS urls_digest ON urls (digest);
+"""
+
+
+class _HashingWriter(object):
+    def __init__(self, file):
+        self._file = file
+        self.hash = hashlib.sha256()
+
+    def write(self, data):
+        self.hash.update(data)
+        return self._file.write(data)
+
+
+def _map_file(path):
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return memoryview(b"")
+        return memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+class FileCache(object):
+    """
+    A disk cache for :class:`~prometeo.base_client.Download` files, set it as
+    the ``file_cache`` of a client to use it in
+    :meth:`~prometeo.base_client.Download.get_file`.
+
+    Files are stored by the hash of their contents, so the same document
+    served from different urls is stored once, and evicted least recently
+    used first when the cache grows over ``max_size`` bytes. The directory
+    can be shared by several processes.
+
+    :param path: Directory of the cache
+    :type path: str
+
+    :param max_size: Maximum size in bytes of the stored files
+    :type max_size: int
+    """
+
+    def __init__(self, path, max_size=DEFAULT_MAX_SIZE):
+        self.path = path
+        self.max_size = max_size
+        os.makedirs(path, exist_ok=True)
+        self._connection = sqlite3.connect(
+            os.path.join(path, "index.sqlite3"), isolation_level=None
+        )
+        self._connection.executescript(SCHEMA)
+        self._pending = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._connection.close()
+
+    def _blob_path(self, digest):
+        return os.path.join(self.path, digest[:2], digest)
+
+    def _lookup(self, url):
+        row = self._connection.execute(
+            "SELECT digest FROM urls WHERE url = ?", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        digest = row[0]
+        try:
+            view = _map_file(self._blob_path(digest))
+        except FileNotFoundError:
+            # Evicted by another process
+            self._connection.execute("DELETE FROM urls WHERE url = ?", (url,))
+            return None
+        self._connection.execute(
+            "UPDATE blobs SET accessed = ? WHERE digest = ?", (time.time(), digest)
+        )
+        return view
+
+    def get(self, url):
+        """
+        The cached contents of ``url``, or ``None`` if it isn't cached.
+
+        The contents are memory mapped from the file, not copied.
+
+        :rtype: memoryview
+        """
+        return self._lookup(url)
+
+    def size(self):
+        """
+        Total size in bytes of the stored files.
+
+        :rtype: int
+        """
+        return self._connection.execute(
+            "SELECT coalesce(sum(size), 0) FROM blobs"
+        ).fetchone()[0]
+
+    def _add(self, url, partial_path, digest, size):
+        blob_path = self._blob_path(digest)
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(partial_path, blob_path)
+        with self._connection:
+            self._connection.execute("BEGIN IMMEDIATE")
+            self._connection.execute(
+                "INSERT OR REPLACE INTO blobs (digest, size, accessed) "
+                "VALUES (?, ?, ?)",
+                (digest, size, time.time()),
+            )
+            self._connection.execute(
+                "INSERT OR REPLACE INTO urls (url, digest) VALUES (?, ?)",
+                (url, digest),
+            )
+        self._evict(keep=digest)
+
+    def _evict(self, keep=None):
+        total = self.size()
+        if total <= self.max_size:
+            return
+        rows = self._connection.execute(
+            "SELECT digest, size FROM blobs ORDER BY accessed"
+        ).fetchall()
+        for digest, size in rows:
+            if total <= self.max_size:
+                break
+            if digest == keep:
+                continue
+            with self._connection:
+                self._connection.execute("BEGIN IMMEDIATE")
+                self._connection.execute("DELETE FROM urls WHERE digest = ?", (digest,))
+                self._connection.execute(
+                    "DELETE FROM blobs WHERE digest = ?", (digest,)
+                )
+            try:
+                os.remove(self._blob_path(digest))
+            except OSError:
+                pass
+            total -= size
+
+    async def _download(self, download, url):
+        fd, partial_path = tempfile.mkstemp(dir=self.path, suffix=".part")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                writer = _HashingWriter(f)
+                size = await download.write_to(writer)
+            self._add(url, partial_path, writer.hash.hexdigest(), size)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+        return self._lookup(url)
+
+    async def fetch(self, download):
+        """
+        The contents of ``download``, from the cache if possible. Concurrent
+        calls for the same url share a single transfer.
+
+        :type download: :class:`~prometeo.base_client.Download`
+        :rtype: memoryview
+        """
+        url = download.full_url
+        view = self._lookup(url)
+        if view is not None:
+            return view
+        task = self._pending.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._download(download, url))
+            self._pending[url] = task
+            task.add_done_callback(lambda _: self._pending.pop(url, None))
+        return await asyncio.shield(task)
@@ -0,0 +1,56 @@
+from datetime import datetime
+from typing import Any, Optional
+from pydantic import BaseModel
+
+
+class BatchResult(BaseModel):
+    """
+    Outcome of one item of a batch operation, ``error`` holds the exception
+    raised for the item, if any.
+    """
+
+    key: Any
+    result: Optional[Any] = None
+    error: Optional[Any] = None
+
+    @property
+    def ok(self):
+        return self.error is None
+
+
+class DownloadStats(BaseModel):
+    """
+    Totals of the files fetched by a
+    :class:`~prometeo.download_manager.DownloadManager`, ``seconds`` is the
+    wall clock time spent downloading.
+    """
+
+    downloaded: int = 0
+    skipped: int = 0
+    failed: int = 0
+    bytes: int = 0
+    seconds: float = 0.0
+
+    @property
+    def throughput(self):
+        """
+        Average download speed, in bytes per second.
+
+        :rtype: float
+        """
+        if not self.seconds:
+            return 0.0
+        return self.bytes / self.seconds
+
+
+class WebhookEvent(BaseModel):
+    """
+    An event received by a :class:`~prometeo.webhooks.WebhookHandler`,
+    ``payload`` is parsed into the model registered for its type, or kept as
+    a dict if there's none.
+    """
+
+    event_type: str
+    event_id: str
+    timestamp: Optional[datetime] = None
+    payload: Any = None
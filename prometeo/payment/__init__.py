@@ -1,3 +1,4 @@
 from .client import PaymentAPIClient
+from .watcher import IntentWatcher
 
-__all__ = ["PaymentAPIClient"]
+__all__ = ["PaymentAPIClient", "IntentWatcher"]
@@ -1,4 +1,5 @@
 from prometeo import exceptions, base_client, utils
+from prometeo.models import BatchResult
 from .exceptions import PaymentInvalidParameterClientError
 from typing import Optional, List
 from .models import CreatePaymentIntentResponse, PaymentIntent
@@ -90,3 +91,83 @@ class PaymentAPIClient(base_client.BaseClient):
         """
         data = await self.call_api("GET", f"/api/v1/payment-intent/{intent_id}")
         return PaymentIntent(**data)
+
+    @utils.adapt_async_sync
+    async def create_intents(
+        self,
+        specs,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        rate_limiter=None,
+        cache=None,
+    ):
+        """
+        Create many payment intents concurrently.
+
+        Specs with the same ``external_id`` create a single intent, and a
+        later spec that differs from the first one with its ``external_id``
+        is reported as an :class:`~prometeo.exceptions.InvalidParameterError`
+        instead. When a ``cache`` is given the intents created are kept in
+        it by ``external_id``, so replaying a batch doesn't create them
+        again. A spec that fails doesn't stop the others.
+
+        :param specs: The keyword arguments of :meth:`create_intent` for each
+                      intent
+        :type specs: iterable of dict
+
+        :param concurrency: Maximum number of requests at the same time
+        :type concurrency: int
+
+        :param rate_limiter: Limits the number of requests per second
+        :type rate_limiter: :class:`~prometeo.utils.RateLimiter`
+
+        :param cache: Intents already created, keyed by ``external_id``
+        :type cache: :class:`~prometeo.utils.TTLCache`
+
+        :return: One result per spec in input order, keyed by ``external_id``
+                 or by ``("index", position)`` for specs without one
+        :rtype: List of :class:`~prometeo.models.BatchResult`
+        """
+        specs = list(specs)
+        keys = []
+        unique = {}
+        conflicts = {}
+        for index, spec in enumerate(specs):
+            key = spec.get("external_id")
+            if key is None:
+                key = ("index", index)
+            keys.append(key)
+            if key not in unique:
+                unique[key] = spec
+            elif spec != unique[key]:
+                conflicts[index] = exceptions.InvalidParameterError(
+                    ["external_id"],
+                    "Spec conflicts with a previous one with external_id {}".format(
+                        key
+                    ),
+                )
+
+        async def create(key):
+            if cache is not None and key in cache:
+                return cache.get(key)
+            if rate_limiter is not None:
+                await rate_limiter.acquire()
+            intent = await self.create_intent(**unique[key])
+            if cache is not None and not isinstance(key, tuple):
+                cache.set(key, intent)
+            return intent
+
+        unique_keys = list(unique)
+        results = await utils.map_concurrently(
+            create, unique_keys, concurrency, return_exceptions=True
+        )
+        by_key = dict(zip(unique_keys, results))
+        batch = []
+        for index, key in enumerate(keys):
+            result = by_key[key]
+            if index in conflicts:
+                batch.append(BatchResult(key=key, error=conflicts[index]))
+            elif isinstance(result, Exception):
+                batch.append(BatchResult(key=key, error=result))
+            else:
+                batch.append(BatchResult(key=key, result=result))
+        return batch
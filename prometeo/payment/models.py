@@ -1,4 +1,4 @@
-from typing import List, Optional
+from typing import Any, List, Optional
 from pydantic import BaseModel
 
 
@@ -38,3 +38,17 @@ class PaymentIntent(BaseModel):
     status_history: List[StatusHistory]
     customer: Optional[Customer]
     current_status: str
+
+
+class IntentUpdate(BaseModel):
+    """
+    A change seen by an :class:`~prometeo.payment.watcher.IntentWatcher`:
+    the new entries of the intent's status history, or the error that made
+    the watcher give up on it.
+    """
+
+    intent_id: str
+    intent: Optional[PaymentIntent] = None
+    transitions: List[StatusHistory] = []
+    finished: bool = False
+    error: Optional[Any] = None
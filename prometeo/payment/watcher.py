@@ -0,0 +1,213 @@
+import asyncio
+import heapq
+import itertools
+
+from prometeo import utils
+from .models import IntentUpdate
+
+
+TERMINAL_STATUSES = frozenset(
+    ["intent_approved", "intent_rejected", "intent_error", "intent_expired"]
+)
+
+DEFAULT_MAX_ERRORS = 5
+
+
+class IntentWatcher(object):
+    """
+    Tracks the status of many payment intents with a single scheduler.
+
+    Each intent is checked with its own growing interval, which starts over
+    every time its status changes, with at most ``concurrency`` requests in
+    flight. Intents stop being tracked once they reach a terminal status.
+
+    .. code-block:: python
+
+        watcher = IntentWatcher(client.payment)
+        watcher.watch(intent.intent_id)
+        async for update in watcher.updates():
+            print(update.intent_id, update.intent.current_status)
+
+    :param client: The payment client used to get the intents
+    :type client: :class:`~prometeo.payment.client.PaymentAPIClient`
+
+    :param backoff: Intervals between checks, defaults to ``Backoff()``
+    :type backoff: :class:`~prometeo.utils.Backoff`
+
+    :param concurrency: Maximum number of requests at the same time
+    :type concurrency: int
+
+    :param rate_limiter: Limits the number of requests per second
+    :type rate_limiter: :class:`~prometeo.utils.RateLimiter`
+
+    :param terminal_statuses: Statuses after which an intent isn't checked
+                              anymore
+    :type terminal_statuses: set of str
+
+    :param max_errors: Consecutive failed checks after which an intent isn't
+                       checked anymore
+    :type max_errors: int
+    """
+
+    def __init__(
+        self,
+        client,
+        backoff=None,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        rate_limiter=None,
+        terminal_statuses=TERMINAL_STATUSES,
+        max_errors=DEFAULT_MAX_ERRORS,
+    ):
+        self._client = client
+        self.backoff = backoff or utils.Backoff()
+        self.concurrency = concurrency
+        self.rate_limiter = rate_limiter
+        self.terminal_statuses = frozenset(terminal_statuses)
+        self.max_errors = max_errors
+        self._callbacks = []
+        self._schedule = []
+        self._counter = itertools.count()
+        self._seen = {}
+        self._errors = {}
+        self._wakeup = None
+
+    @property
+    def watching(self):
+        """
+        Ids of the intents being tracked.
+
+        :rtype: set of str
+        """
+        return set(self._seen)
+
+    def watch(self, intent_id):
+        """
+        Start tracking an intent, it can be called while the watcher runs.
+
+        :param intent_id: The intent id
+        :type intent_id: str
+        """
+        if intent_id in self._seen:
+            return
+        self._seen[intent_id] = 0
+        self._errors[intent_id] = 0
+        self._push(0, intent_id, iter(self.backoff))
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    def on_update(self, callback):
+        """
+        Register a function or coroutine function, called with every
+        :class:`~prometeo.payment.models.IntentUpdate`.
+        """
+        self._callbacks.append(callback)
+        return callback
+
+    def _push(self, when, intent_id, intervals):
+        entry = (when, next(self._counter), intent_id, intervals)
+        heapq.heappush(self._schedule, entry)
+
+    def _forget(self, intent_id):
+        del self._seen[intent_id]
+        del self._errors[intent_id]
+
+    async def _check(self, entry):
+        if self.rate_limiter is not None:
+            await self.rate_limiter.acquire()
+        return await self._client.get_transaction_data(entry[2])
+
+    def _handle(self, entry, intent, error, now):
+        _, _, intent_id, intervals = entry
+        if error is not None:
+            self._errors[intent_id] += 1
+            if self._errors[intent_id] >= self.max_errors:
+                self._forget(intent_id)
+                return IntentUpdate(intent_id=intent_id, finished=True, error=error)
+            self._push(now + next(intervals), intent_id, intervals)
+            return None
+
+        self._errors[intent_id] = 0
+        seen = self._seen[intent_id]
+        transitions = intent.status_history[seen:]
+        finished = intent.current_status in self.terminal_statuses
+        if finished:
+            self._forget(intent_id)
+        else:
+            self._seen[intent_id] = len(intent.status_history)
+            if transitions:
+                # The intent is moving, check it often again
+                intervals = iter(self.backoff)
+            self._push(now + next(intervals), intent_id, intervals)
+        if not transitions and not finished:
+            return None
+        return IntentUpdate(
+            intent_id=intent_id,
+            intent=intent,
+            transitions=transitions,
+            finished=finished,
+        )
+
+    async def _notify(self, update):
+        for callback in self._callbacks:
+            result = callback(update)
+            if asyncio.iscoroutine(result):
+                await result
+
+    async def updates(self, keep_running=False):
+        """
+        Check the intents as they're due, yielding an update every time the
+        status of one changes. Registered callbacks are called before each
+        update is yielded.
+
+        This is an async generator, use it with ``async for``.
+
+        :param keep_running: Wait for new intents to watch instead of
+                             stopping when every intent is finished
+        :type keep_running: bool
+
+        :rtype: async iterator of :class:`~prometeo.payment.models.IntentUpdate`
+        """
+        loop = asyncio.get_event_loop()
+        self._wakeup = asyncio.Event()
+        try:
+            while self._schedule or keep_running:
+                now = loop.time()
+                due = []
+                while self._schedule and self._schedule[0][0] <= now:
+                    due.append(heapq.heappop(self._schedule))
+                if not due:
+                    self._wakeup.clear()
+                    timeout = self._schedule[0][0] - now if self._schedule else None
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+
+                checks = utils.iter_concurrently(self._check, due, self.concurrency)
+                try:
+                    async for entry, intent, error in checks:
+                        update = self._handle(entry, intent, error, loop.time())
+                        if update is not None:
+                            await self._notify(update)
+                            yield update
+                finally:
+                    await checks.aclose()
+        finally:
+            self._wakeup = None
+
+    @utils.adapt_async_sync
+    async def run(self):
+        """
+        Track the intents until all of them are finished, calling the
+        registered callbacks on every update.
+
+        :return: The last known state of each intent
+        :rtype: dict of intent id to
+                :class:`~prometeo.payment.models.PaymentIntent`
+        """
+        intents = {}
+        async for update in self.updates():
+            if update.intent is not None:
+                intents[update.intent_id] = update.intent
+        return intents
@@ -1,3 +1,4 @@
+from .archive import CFDIArchive
 from .client import (
     SatAPIClient,
     LoginScope,
@@ -6,9 +7,14 @@ from .client import (
     DocumentType,
     Status,
     SendType,
+    wait_all,
 )
+from .index import CFDIIndex
+from .parser import parse_archive, parse_cfdi, parse_many
 
 __all__ = [
+    "CFDIArchive",
+    "CFDIIndex",
     "SatAPIClient",
     "LoginScope",
     "BillStatus",
@@ -16,4 +22,8 @@ __all__ = [
     "DocumentType",
     "Status",
     "SendType",
+    "wait_all",
+    "parse_archive",
+    "parse_cfdi",
+    "parse_many",
 ]
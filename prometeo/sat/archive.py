@@ -0,0 +1,122 @@
+import os
+import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
+
+from prometeo import utils
+
+
+SPOOL_MAX_SIZE = 32 * 1024 * 1024
+
+
+class _SpooledFile(tempfile.SpooledTemporaryFile):
+    # SpooledTemporaryFile only implements the whole io interface since
+    # python 3.11, and zipfile needs seekable()
+    def seekable(self):
+        return self._file.seekable()
+
+
+class CFDIArchive(object):
+    """
+    A zip file of bill xmls, as generated by a bulk download request.
+
+    Members are read lazily from the underlying file, so only one of them is
+    held in memory at a time. Use it as a context manager to release the file.
+    """
+
+    def __init__(self, file):
+        self._file = file
+        self._zip = zipfile.ZipFile(file)
+
+    @classmethod
+    @utils.adapt_async_sync
+    async def from_download(cls, download, max_memory=SPOOL_MAX_SIZE):
+        """
+        Stream a download to a temporary file and open it as an archive.
+
+        The file is kept in memory while it's smaller than ``max_memory``
+        bytes and rolled over to disk after that.
+
+        :param download: The download of the zip file
+        :type download: :class:`~prometeo.base_client.Download`
+
+        :param max_memory: Maximum size in bytes to keep in memory
+        :type max_memory: int
+
+        :rtype: :class:`CFDIArchive`
+        """
+        file = _SpooledFile(max_size=max_memory)
+        try:
+            await download.write_to(file)
+            file.seek(0)
+            return cls(file)
+        except BaseException:
+            file.close()
+            raise
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the archive and its underlying file.
+        """
+        self._zip.close()
+        self._file.close()
+
+    def namelist(self):
+        """
+        Names of the files in the archive.
+
+        :rtype: List of str
+        """
+        return [info.filename for info in self._zip.infolist() if not info.is_dir()]
+
+    def iter_files(self, streams=False):
+        """
+        Iterate over the files in the archive, one at a time.
+
+        :param streams: Yield file objects to read from instead of the contents
+        :type streams: bool
+
+        :rtype: iterator of ``(filename, bytes)`` or ``(filename, file)``
+        """
+        for info in self._zip.infolist():
+            if info.is_dir():
+                continue
+            if streams:
+                with self._zip.open(info) as stream:
+                    yield info.filename, stream
+            else:
+                yield info.filename, self._zip.read(info)
+
+    def extract_all(self, path, workers=None):
+        """
+        Extract every file of the archive into a directory, decompressing
+        several files at the same time.
+
+        :param path: Directory to extract the files into
+        :type path: str
+
+        :param workers: Number of threads used, defaults to the
+                        :class:`~concurrent.futures.ThreadPoolExecutor` default
+        :type workers: int
+
+        :return: The paths of the extracted files
+        :rtype: List of str
+        """
+        members = [info for info in self._zip.infolist() if not info.is_dir()]
+        os.makedirs(path, exist_ok=True)
+
+        def extract(info):
+            try:
+                return self._zip.extract(info, path)
+            except FileExistsError:
+                # Another thread created the same parent directory first
+                return self._zip.extract(info, path)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(extract, members))
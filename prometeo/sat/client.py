@@ -1,7 +1,11 @@
-from datetime import datetime
+import asyncio
+import heapq
+import os
 from enum import Enum
 
 from prometeo import exceptions, base_client, base_session, utils
+from prometeo.models import BatchResult
+from .archive import CFDIArchive, SPOOL_MAX_SIZE
 from .models import (
     CFDIBill,
     CFDIDownloadItem,
@@ -66,6 +70,15 @@ class SendType(Enum):
     C = "c"
 
 
+def _month_range(year_start, month_start, year_end, month_end):
+    months = []
+    year, month = year_start, month_start
+    while (year, month) <= (year_end, month_end):
+        months.append((year, month))
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return months
+
+
 class Session(base_session.BaseSession):
     @utils.adapt_async_sync
     async def logout(self):
@@ -75,7 +88,7 @@ class Session(base_session.BaseSession):
         await self._client.logout(self._session_key)
 
     @utils.adapt_async_sync
-    async def get_emitted_bills(self, date_start, date_end, status):
+    async def get_emitted_bills(self, date_start, date_end, status, index=None):
         """
         List all emitted bills in a range of dates.
 
@@ -88,11 +101,17 @@ class Session(base_session.BaseSession):
         :param status: Status of the bills
         :type status: :class:`BillStatus`
 
+        :param index: Local index to also store the bills in
+        :type index: :class:`~prometeo.sat.index.CFDIIndex`
+
         :rtype: List of :class:`~prometeo.sat.models.CFDIBill`
         """
-        return await self._client.get_emitted(
+        bills = await self._client.get_emitted(
             self._session_key, date_start, date_end, status, DownloadAction.LIST
         )
+        if index is not None:
+            index.add_bills(bills, emitted=True)
+        return bills
 
     @utils.adapt_async_sync
     async def download_emitted_bills(self, date_start, date_end, status):
@@ -127,7 +146,7 @@ class Session(base_session.BaseSession):
         ]
 
     @utils.adapt_async_sync
-    async def get_received_bills(self, year, month, status):
+    async def get_received_bills(self, year, month, status, index=None):
         """
         List all received bills in a range of dates.
 
@@ -140,11 +159,17 @@ class Session(base_session.BaseSession):
         :param status: Status of the bills
         :type status: :class:`BillStatus`
 
+        :param index: Local index to also store the bills in
+        :type index: :class:`~prometeo.sat.index.CFDIIndex`
+
         :rtype: List of :class:`~prometeo.sat.models.CFDIBill`
         """
-        return await self._client.get_received(
+        bills = await self._client.get_received(
             self._session_key, year, month, status, DownloadAction.LIST
         )
+        if index is not None:
+            index.add_bills(bills, received=True)
+        return bills
 
     @utils.adapt_async_sync
     async def download_received_bills(self, year, month, status):
@@ -174,6 +199,132 @@ class Session(base_session.BaseSession):
             for request in requests
         ]
 
+    @utils.adapt_async_sync
+    async def get_received_bills_range(
+        self,
+        year_start,
+        month_start,
+        year_end,
+        month_end,
+        status,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        index=None,
+    ):
+        """
+        List all received bills in a range of months, fetching the months
+        concurrently. Bills are merged by id.
+
+        :param year_start: Year of the first month
+        :type year_start: int
+
+        :param month_start: First month, inclusive
+        :type month_start: int
+
+        :param year_end: Year of the last month
+        :type year_end: int
+
+        :param month_end: Last month, inclusive
+        :type month_end: int
+
+        :param status: Status of the bills
+        :type status: :class:`BillStatus`
+
+        :param concurrency: Maximum number of months fetched at the same time
+        :type concurrency: int
+
+        :param index: Local index to also store the bills in
+        :type index: :class:`~prometeo.sat.index.CFDIIndex`
+
+        :rtype: List of :class:`~prometeo.sat.models.CFDIBill`
+        """
+        months = _month_range(year_start, month_start, year_end, month_end)
+        results = await utils.map_concurrently(
+            lambda month: self.get_received_bills(*month, status, index),
+            months,
+            concurrency,
+        )
+        bills = {}
+        for month_bills in results:
+            for bill in month_bills:
+                bills.setdefault(bill.id, bill)
+        return list(bills.values())
+
+    async def iter_received_bills(
+        self,
+        year_start,
+        month_start,
+        year_end,
+        month_end,
+        status,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        index=None,
+    ):
+        """
+        Like :meth:`get_received_bills_range`, but yields the bills of each
+        month as soon as it's fetched. Only usable from async code.
+
+        :rtype: async iterator of :class:`~prometeo.sat.models.CFDIBill`
+        """
+        months = _month_range(year_start, month_start, year_end, month_end)
+        seen = set()
+        results = utils.iter_concurrently(
+            lambda month: self.get_received_bills(*month, status, index),
+            months,
+            concurrency,
+        )
+        try:
+            async for _, month_bills, error in results:
+                if error is not None:
+                    raise error
+                for bill in month_bills:
+                    if bill.id not in seen:
+                        seen.add(bill.id)
+                        yield bill
+        finally:
+            await results.aclose()
+
+    @utils.adapt_async_sync
+    async def download_received_bills_range(
+        self,
+        year_start,
+        month_start,
+        year_end,
+        month_end,
+        status,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+    ):
+        """
+        Creates requests to download all the received bills in a range of
+        months, creating the requests of every month concurrently.
+
+        :param year_start: Year of the first month
+        :type year_start: int
+
+        :param month_start: First month, inclusive
+        :type month_start: int
+
+        :param year_end: Year of the last month
+        :type year_end: int
+
+        :param month_end: Last month, inclusive
+        :type month_end: int
+
+        :param status: Status of the bills
+        :type status: :class:`BillStatus`
+
+        :param concurrency: Maximum number of months requested at the same time
+        :type concurrency: int
+
+        :rtype: List of :class:`~DownloadRequest`
+        """
+        months = _month_range(year_start, month_start, year_end, month_end)
+        results = await utils.map_concurrently(
+            lambda month: self.download_received_bills(*month, status),
+            months,
+            concurrency,
+        )
+        return [request for month_requests in results for request in month_requests]
+
     @utils.adapt_async_sync
     async def get_downloads(self):
         """
@@ -235,6 +386,72 @@ class Session(base_session.BaseSession):
             AcknowledgementResult(self._client, self._session_key, ack) for ack in acks
         ]
 
+    @utils.adapt_async_sync
+    async def download_acknowledgements(
+        self,
+        acknowledgements,
+        path,
+        concurrency=utils.DEFAULT_CONCURRENCY,
+        on_progress=None,
+    ):
+        """
+        Download many acknowledgements into a directory, resolving their
+        download urls and streaming the files concurrently.
+
+        A failed download doesn't stop the others, its error is reported in
+        the result instead. Acknowledgements with the same ``file_name``
+        share a single download.
+
+        :param acknowledgements: The acknowledgements to download
+        :type acknowledgements: List of :class:`AcknowledgementResult`
+
+        :param path: Directory to save the files to, named after each
+                     acknowledgement's ``file_name``
+        :type path: str
+
+        :param concurrency: Maximum number of downloads at the same time
+        :type concurrency: int
+
+        :param on_progress: Called after every download as
+                            ``on_progress(result, completed, total)``
+        :type on_progress: callable
+
+        :return: One result per acknowledgement in completion order, keyed
+                 by acknowledgement id, with the path of the file as result
+        :rtype: List of :class:`~prometeo.models.BatchResult`
+        """
+        acknowledgements = list(acknowledgements)
+        os.makedirs(path, exist_ok=True)
+
+        # Downloads by file path, so acknowledgements with the same file
+        # name don't write it at the same time
+        saves = {}
+
+        async def save(ack, file_path):
+            download = await ack.get_download()
+            await download.save(file_path)
+
+        async def download(ack):
+            file_path = os.path.join(path, os.path.basename(ack.file_name or ack.id))
+            if file_path not in saves:
+                saves[file_path] = asyncio.ensure_future(save(ack, file_path))
+            await asyncio.shield(saves[file_path])
+            return file_path
+
+        results = []
+        downloads = utils.iter_concurrently(download, acknowledgements, concurrency)
+        try:
+            async for ack, file_path, error in downloads:
+                result = BatchResult(key=ack.id, result=file_path, error=error)
+                results.append(result)
+                if on_progress is not None:
+                    on_progress(result, len(results), len(acknowledgements))
+        finally:
+            await downloads.aclose()
+            for task in saves.values():
+                task.cancel()
+        return results
+
 
 class SatAPIClient(base_client.BaseClient):
     """
@@ -303,10 +520,10 @@ class SatAPIClient(base_client.BaseClient):
                     emitter_reason=bill["emitter_reason"],
                     receiver_rfc=bill["receiver_rfc"],
                     receiver_reason=bill["receiver_reason"],
-                    emitted_date=datetime.strptime(
+                    emitted_date=utils.parse_date(
                         bill["emitted_date"], "%Y-%m-%dT%H:%M:%S"
                     ),
-                    certification_date=datetime.strptime(
+                    certification_date=utils.parse_date(
                         bill["certification_date"], "%Y-%m-%dT%H:%M:%S"
                     ),
                     certification_pac=bill["certification_pac"],
@@ -498,6 +715,21 @@ class DownloadRequest(object):
             self._download = base_client.Download(self._client, download.download_url)
         return self._download
 
+    @utils.adapt_async_sync
+    async def get_archive(self, max_memory=SPOOL_MAX_SIZE):
+        """
+        Stream the generated zip file to a temporary file and open it, to
+        iterate over the xmls without loading them all in memory.
+
+        :param max_memory: Maximum size in bytes to keep in memory before
+                           rolling over to disk
+        :type max_memory: int
+
+        :rtype: :class:`~prometeo.sat.archive.CFDIArchive`
+        """
+        download = await self.get_download()
+        return await CFDIArchive.from_download(download, max_memory)
+
     @utils.adapt_async_sync
     async def is_ready(self):
         """
@@ -510,3 +742,104 @@ class DownloadRequest(object):
             return True
         except exceptions.NotFoundError:
             return False
+
+    @utils.adapt_async_sync
+    async def wait_ready(self, timeout=None, backoff=None):
+        """
+        Wait until the request is ready to download, checking it with
+        growing intervals.
+
+        :param timeout: Seconds to wait before giving up, waits forever if ``None``
+        :type timeout: float
+
+        :param backoff: Intervals between checks, defaults to ``Backoff()``
+        :type backoff: :class:`~prometeo.utils.Backoff`
+
+        :raises: :class:`~prometeo.exceptions.WaitTimeoutError`
+        :rtype: :class:`Download`
+        """
+        loop = asyncio.get_event_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        intervals = iter(backoff or utils.Backoff())
+        while not await self.is_ready():
+            interval = next(intervals)
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise exceptions.WaitTimeoutError(
+                        "Download request {} is not ready".format(self.request_id)
+                    )
+                interval = min(interval, remaining)
+            await asyncio.sleep(interval)
+        return self._download
+
+
+async def wait_all(
+    requests, concurrency=utils.DEFAULT_CONCURRENCY, timeout=None, backoff=None
+):
+    """
+    Wait for many download requests at once, yielding each one as soon as
+    it's ready to download.
+
+    Every request is checked with its own growing interval, with at most
+    ``concurrency`` checks in flight.
+
+    .. code-block:: python
+
+        async for request in wait_all(download_requests, concurrency=5):
+            content = await (await request.get_download()).get_file()
+
+    :param requests: The requests to wait for
+    :type requests: List of :class:`DownloadRequest`
+
+    :param timeout: Seconds to wait before giving up, waits forever if ``None``
+    :type timeout: float
+
+    :param backoff: Intervals between checks, defaults to ``Backoff()``
+    :type backoff: :class:`~prometeo.utils.Backoff`
+
+    :raises: :class:`~prometeo.exceptions.WaitTimeoutError`
+    :rtype: async iterator of :class:`DownloadRequest`
+    """
+    loop = asyncio.get_event_loop()
+    backoff = backoff or utils.Backoff()
+    deadline = None if timeout is None else loop.time() + timeout
+    schedule = [
+        (loop.time(), index, request, iter(backoff))
+        for index, request in enumerate(requests)
+    ]
+    heapq.heapify(schedule)
+    while schedule:
+        now = loop.time()
+        if deadline is not None and now >= deadline:
+            raise exceptions.WaitTimeoutError(
+                "Download requests {} are not ready".format(
+                    ", ".join(entry[2].request_id for entry in schedule)
+                )
+            )
+        due = []
+        while schedule and schedule[0][0] <= now:
+            due.append(heapq.heappop(schedule))
+        if not due:
+            wake_at = schedule[0][0]
+            if deadline is not None:
+                wake_at = min(wake_at, deadline)
+            await asyncio.sleep(wake_at - now)
+            continue
+
+        async def check(entry):
+            return await entry[2].is_ready()
+
+        checks = utils.iter_concurrently(check, due, concurrency)
+        try:
+            async for entry, ready, error in checks:
+                if error is not None:
+                    raise error
+                _, index, request, intervals = entry
+                if ready:
+                    yield request
+                else:
+                    next_check = loop.time() + next(intervals)
+                    heapq.heappush(schedule, (next_check, index, request, intervals))
+        finally:
+            await checks.aclose()
@@ -0,0 +1,5 @@
+from prometeo import exceptions
+
+
+class CFDIParseError(exceptions.PrometeoError):
+    pass
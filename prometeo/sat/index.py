@@ -0,0 +1,225 @@
+import sqlite3
+from datetime import datetime
+
+from .models import IndexedBill
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bills (
+    id TEXT NOT NULL PRIMARY KEY,
+    emitter_rfc TEXT NOT NULL,
+    emitter_reason TEXT,
+    receiver_rfc TEXT NOT NULL,
+    receiver_reason TEXT,
+    emitted_date TEXT NOT NULL,
+    certification_date TEXT,
+    certification_pac TEXT,
+    total_value REAL NOT NULL,
+    effect TEXT,
+    status TEXT,
+    emitted INTEGER NOT NULL DEFAULT 0,
+    received INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS bills_emitter ON bills (emitter_rfc, emitted_date);
+CREATE INDEX IF NOT EXISTS bills_receiver ON bills (receiver_rfc, emitted_date);
+CREATE INDEX IF NOT EXISTS bills_date ON bills (emitted_date);
+"""
+
+UPSERT = """
+INSERT INTO bills (
+    id, emitter_rfc, emitter_reason, receiver_rfc, receiver_reason,
+    emitted_date, certification_date, certification_pac, total_value,
+    effect, status, emitted, received
+) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (id) DO UPDATE SET
+    emitter_reason = coalesce(excluded.emitter_reason, emitter_reason),
+    receiver_reason = coalesce(excluded.receiver_reason, receiver_reason),
+    certification_date = coalesce(excluded.certification_date, certification_date),
+    certification_pac = coalesce(excluded.certification_pac, certification_pac),
+    effect = coalesce(excluded.effect, effect),
+    status = coalesce(excluded.status, status),
+    emitted = max(emitted, excluded.emitted),
+    received = max(received, excluded.received)
+"""
+
+COLUMNS = [
+    "id",
+    "emitter_rfc",
+    "emitter_reason",
+    "receiver_rfc",
+    "receiver_reason",
+    "emitted_date",
+    "certification_date",
+    "certification_pac",
+    "total_value",
+    "effect",
+    "status",
+    "emitted",
+    "received",
+]
+
+
+def _isoformat(value):
+    return value.isoformat() if value is not None else None
+
+
+class CFDIIndex(object):
+    """
+    A local SQLite index of bills, to look them up by id, RFC and date
+    without calling the API again.
+
+    Bills listed as both emitted and received, or added from both the API
+    and the bulk download xmls, are stored once.
+
+    :param path: Path of the database file, by default it's kept in memory
+    :type path: str
+    """
+
+    def __init__(self, path=":memory:"):
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript(SCHEMA)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """
+        Close the database connection.
+        """
+        self._connection.close()
+
+    def add_bills(self, bills, emitted=False, received=False):
+        """
+        Add or update bills in the index. Bills without an id, like CFDIs
+        that haven't been stamped, can't be told apart and are skipped.
+
+        :param bills: The bills to add
+        :type bills: iterable of :class:`~prometeo.sat.models.CFDIBill` or
+                     :class:`~prometeo.sat.models.CFDIDocument`
+
+        :param emitted: Whether the bills were listed as emitted
+        :type emitted: bool
+
+        :param received: Whether the bills were listed as received
+        :type received: bool
+        """
+        rows = (
+            (
+                bill.id,
+                bill.emitter_rfc,
+                bill.emitter_reason,
+                bill.receiver_rfc,
+                bill.receiver_reason,
+                _isoformat(bill.emitted_date),
+                _isoformat(bill.certification_date),
+                bill.certification_pac,
+                bill.total_value,
+                getattr(bill, "effect", None),
+                getattr(bill, "status", None),
+                int(emitted),
+                int(received),
+            )
+            for bill in bills
+            if bill.id
+        )
+        with self._connection:
+            self._connection.executemany(UPSERT, rows)
+
+    def get(self, bill_id):
+        """
+        Get a bill by its id.
+
+        :rtype: :class:`~prometeo.sat.models.IndexedBill` or ``None``
+        """
+        bills = self._select("WHERE id = ?", [bill_id])
+        return bills[0] if bills else None
+
+    def find(
+        self,
+        rfc=None,
+        emitter_rfc=None,
+        receiver_rfc=None,
+        date_start=None,
+        date_end=None,
+        emitted=None,
+        received=None,
+    ):
+        """
+        Find bills matching all the given filters, ordered by emitted date.
+
+        :param rfc: RFC of either the emitter or the receiver
+        :type rfc: str
+
+        :param emitter_rfc: RFC of the emitter
+        :type emitter_rfc: str
+
+        :param receiver_rfc: RFC of the receiver
+        :type receiver_rfc: str
+
+        :param date_start: Minimum emitted date, inclusive
+        :type date_start: :class:`~datetime.datetime`
+
+        :param date_end: Maximum emitted date, exclusive
+        :type date_end: :class:`~datetime.datetime`
+
+        :param emitted: Filter bills listed, or not, as emitted
+        :type emitted: bool
+
+        :param received: Filter bills listed, or not, as received
+        :type received: bool
+
+        :rtype: List of :class:`~prometeo.sat.models.IndexedBill`
+        """
+        conditions = []
+        params = []
+        if rfc is not None:
+            conditions.append("(emitter_rfc = ? OR receiver_rfc = ?)")
+            params.extend([rfc, rfc])
+        if emitter_rfc is not None:
+            conditions.append("emitter_rfc = ?")
+            params.append(emitter_rfc)
+        if receiver_rfc is not None:
+            conditions.append("receiver_rfc = ?")
+            params.append(receiver_rfc)
+        if date_start is not None:
+            conditions.append("emitted_date >= ?")
+            params.append(date_start.isoformat())
+        if date_end is not None:
+            conditions.append("emitted_date < ?")
+            params.append(date_end.isoformat())
+        if emitted is not None:
+            conditions.append("emitted = ?")
+            params.append(int(emitted))
+        if received is not None:
+            conditions.append("received = ?")
+            params.append(int(received))
+        where = "WHERE " + " AND ".join(conditions) if conditions else ""
+        return self._select(where + " ORDER BY emitted_date, id", params)
+
+    def count(self):
+        """
+        Number of bills in the index.
+
+        :rtype: int
+        """
+        return self._connection.execute("SELECT count(*) FROM bills").fetchone()[0]
+
+    def _select(self, clause, params):
+        cursor = self._connection.execute(
+            "SELECT {} FROM bills {}".format(", ".join(COLUMNS), clause), params
+        )
+        bills = []
+        for row in cursor:
+            data = dict(zip(COLUMNS, row))
+            data["emitted_date"] = datetime.fromisoformat(data["emitted_date"])
+            if data["certification_date"] is not None:
+                data["certification_date"] = datetime.fromisoformat(
+                    data["certification_date"]
+                )
+            data["emitted"] = bool(data["emitted"])
+            data["received"] = bool(data["received"])
+            bills.append(IndexedBill(**data))
+        return bills
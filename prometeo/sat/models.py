@@ -1,4 +1,5 @@
 from datetime import datetime
+from typing import List, Optional
 from pydantic import BaseModel
 
 
@@ -43,3 +44,66 @@ class AcknowledgementResult(BaseModel):
     file_name: str
     reception_date: str
     status: str
+
+
+class CFDITax(BaseModel):
+    kind: str
+    tax: str
+    factor_type: Optional[str] = None
+    rate: Optional[float] = None
+    base: Optional[float] = None
+    amount: Optional[float] = None
+
+
+class CFDIConcept(BaseModel):
+    product_code: str
+    quantity: float
+    unit_code: Optional[str] = None
+    description: str
+    unit_value: float
+    amount: float
+    discount: Optional[float] = None
+
+
+class CFDIDocument(BaseModel):
+    id: Optional[str] = None
+    version: str
+    series: Optional[str] = None
+    folio: Optional[str] = None
+    bill_type: str
+    emitter_rfc: str
+    emitter_reason: Optional[str] = None
+    emitter_regime: Optional[str] = None
+    receiver_rfc: str
+    receiver_reason: Optional[str] = None
+    receiver_cfdi_use: Optional[str] = None
+    emitted_date: datetime
+    certification_date: Optional[datetime] = None
+    certification_pac: Optional[str] = None
+    payment_form: Optional[str] = None
+    payment_method: Optional[str] = None
+    currency: str
+    exchange_rate: Optional[float] = None
+    subtotal: float
+    discount: Optional[float] = None
+    total_value: float
+    total_transferred_taxes: Optional[float] = None
+    total_retained_taxes: Optional[float] = None
+    concepts: List[CFDIConcept]
+    taxes: List[CFDITax]
+
+
+class IndexedBill(BaseModel):
+    id: str
+    emitter_rfc: str
+    emitter_reason: Optional[str] = None
+    receiver_rfc: str
+    receiver_reason: Optional[str] = None
+    emitted_date: datetime
+    certification_date: Optional[datetime] = None
+    certification_pac: Optional[str] = None
+    total_value: float
+    effect: Optional[str] = None
+    status: Optional[str] = None
+    emitted: bool
+    received: bool
@@ -0,0 +1,197 @@
+import io
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from xml.etree import ElementTree
+
+from pydantic import ValidationError
+
+from prometeo import utils
+from .exceptions import CFDIParseError
+from .models import CFDIConcept, CFDIDocument, CFDITax
+
+
+DATE_FORMAT = "%Y-%m-%dT%H:%M:%S"
+
+
+def _local_name(tag):
+    return tag.rsplit("}", 1)[-1]
+
+
+def _float(value):
+    return float(value) if value else None
+
+
+def _date(value):
+    return utils.parse_date(value, DATE_FORMAT) if value else None
+
+
+def parse_cfdi(source):
+    """
+    Parse a CFDI 3.3 or 4.0 bill xml.
+
+    The xml is read incrementally and every element is discarded as soon as
+    it's processed, so memory stays flat even for bills with thousands of
+    concepts.
+
+    :param source: Path of the xml file, a binary file object or the contents
+    :type source: str, file or bytes
+
+    :raises: :class:`~prometeo.sat.exceptions.CFDIParseError`
+    :rtype: :class:`~prometeo.sat.models.CFDIDocument`
+    """
+    if isinstance(source, bytes):
+        source = io.BytesIO(source)
+    data = {}
+    concepts = []
+    taxes = []
+    names = []
+    elements = []
+    try:
+        for event, element in ElementTree.iterparse(source, events=("start", "end")):
+            if event == "end":
+                names.pop()
+                elements.pop()
+                if elements:
+                    # Every earlier sibling has already ended too
+                    del elements[-1][:]
+                continue
+            name = _local_name(element.tag)
+            names.append(name)
+            elements.append(element)
+            attrib = element.attrib
+            depth = len(names)
+            if depth == 1:
+                if name != "Comprobante":
+                    raise CFDIParseError("Not a CFDI, root element is " + name)
+                data.update(
+                    version=attrib.get("Version"),
+                    series=attrib.get("Serie"),
+                    folio=attrib.get("Folio"),
+                    bill_type=attrib.get("TipoDeComprobante"),
+                    emitted_date=_date(attrib.get("Fecha")),
+                    payment_form=attrib.get("FormaPago"),
+                    payment_method=attrib.get("MetodoPago"),
+                    currency=attrib.get("Moneda"),
+                    exchange_rate=_float(attrib.get("TipoCambio")),
+                    subtotal=_float(attrib.get("SubTotal")),
+                    discount=_float(attrib.get("Descuento")),
+                    total_value=_float(attrib.get("Total")),
+                )
+            elif depth == 2 and name == "Emisor":
+                data.update(
+                    emitter_rfc=attrib.get("Rfc"),
+                    emitter_reason=attrib.get("Nombre"),
+                    emitter_regime=attrib.get("RegimenFiscal"),
+                )
+            elif depth == 2 and name == "Receptor":
+                data.update(
+                    receiver_rfc=attrib.get("Rfc"),
+                    receiver_reason=attrib.get("Nombre"),
+                    receiver_cfdi_use=attrib.get("UsoCFDI"),
+                )
+            elif depth == 2 and name == "Impuestos":
+                data.update(
+                    total_transferred_taxes=_float(
+                        attrib.get("TotalImpuestosTrasladados")
+                    ),
+                    total_retained_taxes=_float(attrib.get("TotalImpuestosRetenidos")),
+                )
+            elif depth == 3 and name == "Concepto":
+                concepts.append(
+                    CFDIConcept(
+                        product_code=attrib.get("ClaveProdServ"),
+                        quantity=_float(attrib.get("Cantidad")),
+                        unit_code=attrib.get("ClaveUnidad"),
+                        description=attrib.get("Descripcion"),
+                        unit_value=_float(attrib.get("ValorUnitario")),
+                        amount=_float(attrib.get("Importe")),
+                        discount=_float(attrib.get("Descuento")),
+                    )
+                )
+            elif (
+                depth == 4
+                and names[1] == "Impuestos"
+                and name in ("Traslado", "Retencion")
+            ):
+                taxes.append(
+                    CFDITax(
+                        kind="transferred" if name == "Traslado" else "retained",
+                        tax=attrib.get("Impuesto"),
+                        factor_type=attrib.get("TipoFactor"),
+                        rate=_float(attrib.get("TasaOCuota")),
+                        base=_float(attrib.get("Base")),
+                        amount=_float(attrib.get("Importe")),
+                    )
+                )
+            elif name == "TimbreFiscalDigital":
+                data.update(
+                    id=attrib.get("UUID"),
+                    certification_date=_date(attrib.get("FechaTimbrado")),
+                    certification_pac=attrib.get("RfcProvCertif"),
+                )
+        return CFDIDocument(concepts=concepts, taxes=taxes, **data)
+    except (ElementTree.ParseError, ValidationError, ValueError) as e:
+        raise CFDIParseError(str(e))
+
+
+def _parse_chunk(sources):
+    return [parse_cfdi(source) for source in sources]
+
+
+def parse_many(sources, processes=1, chunksize=64):
+    """
+    Parse many bill xmls, yielding the documents in the same order.
+
+    With more than one process the xmls are parsed in a process pool, sent
+    to the workers in chunks of ``chunksize`` and with a bounded number of
+    chunks in flight, so sources can be a generator of any size.
+
+    :param sources: Paths or contents of the xmls
+    :type sources: iterable of str or bytes
+
+    :param processes: Number of worker processes, ``None`` for one per cpu
+                      and ``1`` to parse in the current process
+    :type processes: int
+
+    :param chunksize: Number of xmls sent to a worker at a time
+    :type chunksize: int
+
+    :rtype: iterator of :class:`~prometeo.sat.models.CFDIDocument`
+    """
+    if processes is None:
+        processes = os.cpu_count() or 1
+    if processes == 1:
+        for source in sources:
+            yield parse_cfdi(source)
+        return
+    sources = iter(sources)
+    with ProcessPoolExecutor(processes) as executor:
+        pending = deque()
+        while True:
+            chunk = list(islice(sources, chunksize))
+            if chunk:
+                pending.append(executor.submit(_parse_chunk, chunk))
+            if pending and (not chunk or len(pending) >= processes * 2):
+                yield from pending.popleft().result()
+            elif not chunk:
+                return
+
+
+def parse_archive(archive, processes=1, chunksize=64):
+    """
+    Parse every xml inside a bulk download archive.
+
+    :param archive: The archive, as returned by
+                    :meth:`~prometeo.sat.client.DownloadRequest.get_archive`
+    :type archive: :class:`~prometeo.sat.archive.CFDIArchive`
+
+    :rtype: iterator of :class:`~prometeo.sat.models.CFDIDocument`
+    """
+    contents = (
+        content
+        for filename, content in archive.iter_files()
+        if filename.lower().endswith(".xml")
+    )
+    return parse_many(contents, processes, chunksize)
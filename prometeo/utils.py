@@ -1,5 +1,13 @@
 import asyncio
 import functools
+import time
+from collections import OrderedDict
+from datetime import datetime
+
+
+DEFAULT_CONCURRENCY = 10
+
+DATE_CACHE_SIZE = 4096
 
 
 def adapt_async_sync(func):
@@ -15,3 +23,229 @@ def adapt_async_sync(func):
             return func(*args, **kwargs)
 
     return wrapper
+
+
+def _digits(value, start, end):
+    part = value[start:end]
+    if not part.isdigit():
+        raise ValueError(part)
+    return int(part)
+
+
+def _parse_day_month_year(value):
+    if len(value) != 10 or value[2] != "/" or value[5] != "/":
+        raise ValueError(value)
+    return datetime(_digits(value, 6, 10), _digits(value, 3, 5), _digits(value, 0, 2))
+
+
+def _parse_iso_date(value):
+    if len(value) != 10 or value[4] != "-" or value[7] != "-":
+        raise ValueError(value)
+    return datetime(_digits(value, 0, 4), _digits(value, 5, 7), _digits(value, 8, 10))
+
+
+def _parse_iso_datetime(value):
+    if (
+        len(value) != 19
+        or value[4] != "-"
+        or value[7] != "-"
+        or value[10] != "T"
+        or value[13] != ":"
+        or value[16] != ":"
+    ):
+        raise ValueError(value)
+    return datetime(
+        _digits(value, 0, 4),
+        _digits(value, 5, 7),
+        _digits(value, 8, 10),
+        _digits(value, 11, 13),
+        _digits(value, 14, 16),
+        _digits(value, 17, 19),
+    )
+
+
+_DATE_PARSERS = {
+    "%d/%m/%Y": _parse_day_month_year,
+    "%Y-%m-%d": _parse_iso_date,
+    "%Y-%m-%dT%H:%M:%S": _parse_iso_datetime,
+}
+
+
+@functools.lru_cache(maxsize=DATE_CACHE_SIZE)
+def parse_date(value, fmt):
+    """
+    Same as :meth:`datetime.strptime <datetime.datetime.strptime>`, but faster
+    for the fixed-width formats used by the API and memoizing the parsed
+    values, since the same dates repeat a lot across rows.
+
+    :raises: ValueError if ``value`` doesn't match ``fmt``
+    :rtype: :class:`~datetime.datetime`
+    """
+    parser = _DATE_PARSERS.get(fmt)
+    if parser is not None:
+        try:
+            return parser(value)
+        except ValueError:
+            # Not zero padded or out of range, let strptime decide
+            pass
+    return datetime.strptime(value, fmt)
+
+
+class Backoff(object):
+    """
+    Growing intervals, in seconds, used to space the checks of polling loops.
+
+    Iterating over it starts again from ``initial``, so the same instance can
+    be shared by many polling loops.
+    """
+
+    def __init__(self, initial=1.0, factor=1.5, maximum=30.0):
+        self.initial = initial
+        self.factor = factor
+        self.maximum = maximum
+
+    def __iter__(self):
+        interval = self.initial
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.maximum)
+
+
+class RateLimiter(object):
+    """
+    Spaces calls so that at most ``rate`` of them start every ``per``
+    seconds. Share an instance between batches to limit all of them together.
+
+    .. code-block:: python
+
+        limiter = RateLimiter(20)
+        await limiter.acquire()
+    """
+
+    def __init__(self, rate, per=1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.interval = per / rate
+        self._next_slot = 0.0
+
+    async def acquire(self):
+        """
+        Wait until the next call is allowed to start.
+        """
+        now = time.monotonic()
+        slot = max(now, self._next_slot)
+        self._next_slot = slot + self.interval
+        if slot > now:
+            await asyncio.sleep(slot - now)
+
+
+_MISSING = object()
+
+
+class TTLCache(object):
+    """
+    A mapping whose entries expire ``ttl`` seconds after being set. When
+    ``maxsize`` is given the oldest entries are dropped to make room.
+    """
+
+    def __init__(self, ttl, maxsize=None):
+        self.ttl = ttl
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return self.get(key, _MISSING) is not _MISSING
+
+    def get(self, key, default=None):
+        """
+        The value of ``key``, or ``default`` if it's missing or expired.
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return default
+        expires, value = entry
+        if expires <= time.monotonic():
+            del self._data[key]
+            return default
+        return value
+
+    def set(self, key, value):
+        """
+        Set the value of ``key``, expiring in ``ttl`` seconds.
+        """
+        self._data.pop(key, None)
+        self._data[key] = (time.monotonic() + self.ttl, value)
+        if self.maxsize is not None:
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove ``key``, if it's set.
+        """
+        self._data.pop(key, None)
+
+    def clear(self):
+        self._data.clear()
+
+
+async def iter_concurrently(func, items, concurrency=DEFAULT_CONCURRENCY):
+    """
+    Calls the coroutine function ``func`` once per item, keeping at most
+    ``concurrency`` calls in flight.
+
+    Yields ``(item, result, error)`` tuples in completion order, ``error`` is
+    the exception raised by the call or ``None`` if it succeeded. Items are
+    consumed lazily, so ``items`` can be a generator of any size.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    items = iter(items)
+    pending = {}
+    try:
+        while True:
+            for item in items:
+                pending[asyncio.ensure_future(func(item))] = item
+                if len(pending) >= concurrency:
+                    break
+            if not pending:
+                return
+            done, _ = await asyncio.wait(
+                pending.keys(), return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                item = pending.pop(task)
+                error = task.exception()
+                yield item, None if error else task.result(), error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def map_concurrently(
+    func, items, concurrency=DEFAULT_CONCURRENCY, return_exceptions=False
+):
+    """
+    Like :func:`asyncio.gather` over ``func(item)`` for every item, but with
+    at most ``concurrency`` calls in flight.
+
+    Results are returned in input order. If ``return_exceptions`` is true the
+    exceptions are returned in place of the results, otherwise the first
+    exception is raised and the remaining calls are cancelled.
+    """
+    items = list(items)
+    results = [None] * len(items)
+    calls = iter_concurrently(
+        lambda index: func(items[index]), range(len(items)), concurrency
+    )
+    try:
+        async for index, result, error in calls:
+            if error is not None and not return_exceptions:
+                raise error
+            results[index] = result if error is None else error
+    finally:
+        await calls.aclose()
+    return results
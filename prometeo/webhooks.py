@@ -0,0 +1,387 @@
+import asyncio
+import hashlib
+import hmac
+import json
+import logging
+
+from pydantic import ValidationError
+
+from prometeo import exceptions, utils
+from prometeo.models import WebhookEvent
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SIGNATURE_HEADER = "X-Signature"
+
+DEFAULT_QUEUE_SIZE = 1000
+
+DEFAULT_DEDUPE_TTL = 24 * 60 * 60
+
+DEFAULT_DEDUPE_SIZE = 100000
+
+
+def sign(body, secret):
+    """
+    The HMAC-SHA256 signature of a webhook body, as a hex string.
+
+    :type body: bytes
+    :type secret: str
+    :rtype: str
+    """
+    return hmac.new(secret.encode("utf-8"), body, hashlib.sha256).hexdigest()
+
+
+def verify_signature(body, signature, secret):
+    """
+    Check the signature of a webhook body, in constant time.
+
+    :raises: :class:`~prometeo.exceptions.InvalidSignatureError`
+    """
+    if isinstance(signature, str):
+        signature = signature.encode("utf-8")
+    # compare_digest only accepts ASCII strings, so compare the bytes
+    expected = sign(body, secret).encode("ascii")
+    if not signature or not hmac.compare_digest(expected, signature):
+        raise exceptions.InvalidSignatureError("Invalid webhook signature")
+
+
+def _log_error(event, error):
+    logger.error("Error handling webhook event %s", event.event_id, exc_info=error)
+
+
+class WebhookHandler(object):
+    """
+    Receives webhook deliveries and dispatches their events to registered
+    async handlers, independent of the web framework used.
+
+    Deliveries are verified with the ``verify_token`` of the payload, an
+    HMAC-SHA256 signature of the body made with ``secret``, or both. At
+    least one of them is required, unless ``insecure`` is set to accept
+    unauthenticated deliveries, for example in tests. Events
+    already received are dropped, unless a handler failed on them, and the
+    accepted ones are handled by
+    ``workers`` tasks from a queue of at most ``queue_size`` events, so a
+    burst of deliveries can't start an unbounded number of handlers.
+
+    .. code-block:: python
+
+        webhooks = WebhookHandler(verify_token="<VERIFY_TOKEN>")
+
+        @webhooks.on("payout.completed", model=PayoutTransfer)
+        async def payout_completed(event):
+            print(event.payload.id)
+
+        async with webhooks:
+            # in the view of the webhook url
+            await webhooks.handle(request_body, request_headers)
+
+    :param verify_token: Expected ``verify_token`` of the payloads
+    :type verify_token: str
+
+    :param secret: Secret used to sign the deliveries
+    :type secret: str
+
+    :param signature_header: Header with the signature of the body
+    :type signature_header: str
+
+    :param workers: Number of events handled at the same time
+    :type workers: int
+
+    :param queue_size: Maximum number of events waiting to be handled,
+                       :meth:`handle` waits for room when it's full
+    :type queue_size: int
+
+    :param dedupe_ttl: Seconds an event id is remembered to drop redeliveries
+    :type dedupe_ttl: float
+
+    :param on_error: Called as ``on_error(event, exception)`` when a handler
+                     fails, by default the error is logged
+    :type on_error: callable
+
+    :param insecure: Accept deliveries without verifying them when neither
+                     ``verify_token`` nor ``secret`` is given
+    :type insecure: bool
+
+    :raises: :class:`ValueError` if the deliveries can't be verified and
+             ``insecure`` isn't set
+    """
+
+    def __init__(
+        self,
+        verify_token=None,
+        secret=None,
+        signature_header=DEFAULT_SIGNATURE_HEADER,
+        workers=utils.DEFAULT_CONCURRENCY,
+        queue_size=DEFAULT_QUEUE_SIZE,
+        dedupe_ttl=DEFAULT_DEDUPE_TTL,
+        on_error=_log_error,
+        insecure=False,
+    ):
+        if verify_token is None and secret is None and not insecure:
+            raise ValueError(
+                "A verify_token or a secret is required to verify the deliveries, "
+                "pass insecure=True to accept them unverified"
+            )
+        self.verify_token = verify_token
+        self.secret = secret
+        self.signature_header = signature_header.lower()
+        self.workers = workers
+        self.queue_size = queue_size
+        self.on_error = on_error
+        self._handlers = {}
+        self._models = {}
+        self._received = utils.TTLCache(dedupe_ttl, maxsize=DEFAULT_DEDUPE_SIZE)
+        self._queue = None
+        self._tasks = []
+
+    def on(self, event_type, model=None):
+        """
+        Decorator to register an async handler for an event type, use ``*``
+        for every type. If ``model`` is given the payload is parsed with it,
+        for example :class:`~prometeo.payment.models.PaymentIntent`,
+        :class:`~prometeo.crossborder.models.IntentData` or
+        :class:`~prometeo.crossborder.models.PayoutTransfer`.
+        """
+
+        def register(handler):
+            self._handlers.setdefault(event_type, []).append(handler)
+            if model is not None:
+                self._models[event_type] = model
+            return handler
+
+        return register
+
+    async def start(self):
+        """
+        Start the workers, also done by using the handler as an async context
+        manager.
+        """
+        if self._queue is not None:
+            return
+        self._queue = asyncio.Queue(self.queue_size)
+        self._tasks = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+
+    async def stop(self):
+        """
+        Wait for the queued events to be handled and stop the workers.
+        """
+        if self._queue is None:
+            return
+        await self._queue.join()
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._queue = None
+        self._tasks = []
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    def _verify_token(self, data):
+        if self.verify_token is not None:
+            token = data.get("verify_token") if isinstance(data, dict) else None
+            if not isinstance(token, str) or not hmac.compare_digest(
+                token.encode("utf-8"), self.verify_token.encode("utf-8")
+            ):
+                raise exceptions.InvalidSignatureError("Invalid verify token")
+
+    def parse(self, body, headers=None):
+        """
+        Verify a delivery and parse its events, without handling them.
+
+        :param body: The raw request body
+        :type body: bytes
+
+        :param headers: The request headers
+        :type headers: dict
+
+        :raises: :class:`~prometeo.exceptions.InvalidSignatureError`,
+                 :class:`~prometeo.exceptions.WebhookError` if the body is
+                 malformed
+        :rtype: List of :class:`~prometeo.models.WebhookEvent`
+        """
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        if self.secret is not None:
+            headers = {key.lower(): value for key, value in (headers or {}).items()}
+            verify_signature(body, headers.get(self.signature_header), self.secret)
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise exceptions.WebhookError("Webhook body is not valid json")
+        self._verify_token(data)
+        raw_events = data.get("events", [data]) if isinstance(data, dict) else data
+        events = []
+        try:
+            for raw in raw_events:
+                event = WebhookEvent(**raw)
+                model = self._models.get(event.event_type) or self._models.get("*")
+                if model is not None and isinstance(event.payload, dict):
+                    event.payload = model(**event.payload)
+                events.append(event)
+        except (TypeError, ValidationError) as e:
+            raise exceptions.WebhookError("Invalid webhook event: {}".format(e))
+        return events
+
+    async def handle(self, body, headers=None):
+        """
+        Verify a delivery and queue its new events for their handlers.
+
+        :param body: The raw request body
+        :type body: bytes
+
+        :param headers: The request headers
+        :type headers: dict
+
+        :raises: :class:`~prometeo.exceptions.InvalidSignatureError`,
+                 :class:`~prometeo.exceptions.WebhookError` if the body is
+                 malformed
+        :return: The events queued, redeliveries are left out
+        :rtype: List of :class:`~prometeo.models.WebhookEvent`
+        """
+        if self._queue is None:
+            await self.start()
+        accepted = []
+        for event in self.parse(body, headers):
+            if event.event_id in self._received:
+                continue
+            self._received.set(event.event_id, True)
+            accepted.append(event)
+            await self._queue.put(event)
+        return accepted
+
+    async def _work(self):
+        while True:
+            event = await self._queue.get()
+            try:
+                handlers = self._handlers.get(event.event_type, [])
+                failed = False
+                for handler in handlers + self._handlers.get("*", []):
+                    try:
+                        await handler(event)
+                    except Exception as e:
+                        failed = True
+                        try:
+                            self.on_error(event, e)
+                        except Exception:
+                            # A failing on_error mustn't stop the worker
+                            logger.exception(
+                                "Error in on_error for webhook event %s",
+                                event.event_id,
+                            )
+                if failed:
+                    # Let the redelivery of the event be handled again
+                    self._received.delete(event.event_id)
+            finally:
+                self._queue.task_done()
+
+
+def make_delivery(
+    events, verify_token=None, secret=None, signature_header=DEFAULT_SIGNATURE_HEADER
+):
+    """
+    Build the body and headers of a webhook delivery, like the ones sent by
+    the API, to test handlers locally.
+
+    :param events: The events, as dicts with ``event_type``, ``event_id``,
+                   ``timestamp`` and ``payload``
+    :type events: List of dict
+
+    :return: ``(body, headers)``
+    :rtype: tuple of bytes and dict
+    """
+    data = {"verify_token": verify_token, "events": events}
+    body = json.dumps(data, default=str).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if secret is not None:
+        headers[signature_header] = sign(body, secret)
+    return body, headers
+
+
+class LocalWebhookServer(object):
+    """
+    A minimal HTTP server that passes every ``POST`` it receives to a
+    :class:`WebhookHandler`, a stand-in for the web application when
+    developing or testing handlers.
+
+    .. code-block:: python
+
+        async with LocalWebhookServer(webhooks, port=8000) as server:
+            print("Listening on", server.url)
+            await asyncio.sleep(3600)
+
+    :param handler: The handler of the deliveries
+    :type handler: :class:`WebhookHandler`
+
+    :param host: Address to listen on
+    :type host: str
+
+    :param port: Port to listen on, a free one is picked if it's ``0``
+    :type port: int
+    """
+
+    def __init__(self, handler, host="127.0.0.1", port=0):
+        self.handler = handler
+        self.host = host
+        self.port = port
+        self._server = None
+
+    @property
+    def url(self):
+        return "http://{}:{}/".format(self.host, self.port)
+
+    async def start(self):
+        await self.handler.start()
+        self._server = await asyncio.start_server(self._serve, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self):
+        self._server.close()
+        await self._server.wait_closed()
+        await self.handler.stop()
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def _serve(self, reader, writer):
+        try:
+            method = (await reader.readline()).split(b" ", 1)[0]
+            headers = {}
+            while True:
+                line = await reader.readline()
+                if line in (b"\r\n", b"\n", b""):
+                    break
+                name, _, value = line.decode("latin-1").partition(":")
+                headers[name.strip().lower()] = value.strip()
+            length = int(headers.get("content-length", 0))
+            body = await reader.readexactly(length)
+            if method != b"POST":
+                status, response = "405 Method Not Allowed", {}
+            else:
+                try:
+                    events = await self.handler.handle(body, headers)
+                    status, response = "200 OK", {"accepted": len(events)}
+                except exceptions.InvalidSignatureError as e:
+                    status, response = "401 Unauthorized", {"message": e.message}
+                except exceptions.WebhookError as e:
+                    status, response = "400 Bad Request", {"message": e.message}
+            content = json.dumps(response).encode("utf-8")
+            writer.write(
+                "HTTP/1.1 {}\r\nContent-Type: application/json\r\n"
+                "Content-Length: {}\r\nConnection: close\r\n\r\n".format(
+                    status, len(content)
+                ).encode("latin-1")
+                + content
+            )
+            await writer.drain()
+        finally:
+            writer.close()
@@ -1,10 +1,16 @@
+from six.moves.urllib.parse import parse_qs
+
+import httpx
 import respx
 
-from prometeo import exceptions
+from prometeo import exceptions, utils
 from prometeo.account_validation import exceptions as av_exceptions
 from tests.base_test_case import BaseTestCase
 
 
+CLABE = "012180001202379491"
+
+
 class TestAccountValidationClient(BaseTestCase):
     @respx.mock
     def test_invalid_parameters(self):
@@ -175,3 +181,95 @@ class TestAccountValidationClient(BaseTestCase):
                 bank_code="999",
                 account_type="CHECKING",
             )
+
+    @respx.mock
+    def test_prevalidation(self):
+        self.mock_post_request(respx, "/validate-account/", "valid_account_mx")
+        with self.assertRaises(av_exceptions.InvalidAccountError):
+            self.client.account_validation.validate(
+                account_number="032180000118359718",
+                country_code="MX",
+                prevalidate=True,
+            )
+        self.assertFalse(respx.calls)
+        self.client.account_validation.validate(
+            account_number="032180000118359718",
+            country_code="MX",
+        )
+        self.assertEqual(1, len(respx.calls))
+
+    def mock_validate_by_account(self, responses):
+        def handler(request):
+            body = parse_qs(request.content.decode("utf-8"))
+            fixtures = responses[body["account_number"][0]]
+            fixture = fixtures.pop(0) if len(fixtures) > 1 else fixtures[0]
+            return httpx.Response(200, json=self.load_json(fixture))
+
+        return respx.post("/validate-account/").mock(side_effect=handler)
+
+    @respx.mock
+    async def test_validate_many(self):
+        route = self.mock_validate_by_account(
+            {
+                "1001": ["valid_account_br"],
+                "1002": ["invalid_account"],
+                "1003": [
+                    "pending_validation",
+                    "pending_validation",
+                    "valid_account_br",
+                ],
+                "1004": ["pending_validation"],
+                CLABE: ["valid_account_mx"],
+            }
+        )
+        rows = [
+            ("a", {"account_number": "1001", "country_code": "BR"}),
+            ("b", {"account_number": "1001", "country_code": "BR"}),
+            ("c", {"account_number": "1002", "country_code": "BR"}),
+            ("d", {"account_number": "1003", "country_code": "BR"}),
+            ("e", {"account_number": "1004", "country_code": "BR"}),
+            ("f", {"account_number": "032180000118359718", "country_code": "MX"}),
+            ("g", {"account_number": "1001", "country": "BR"}),
+            ("h", {"account_number": CLABE, "country_code": "MX", "bank_code": "12"}),
+            ("i", {"account_number": CLABE, "country_code": "MX", "bank_code": "999"}),
+            ("j", {"account_number": CLABE, "country_code": "MX", "bank_code": "002"}),
+        ]
+        backoff = utils.Backoff(initial=0.001, factor=1, maximum=0.001)
+        results = {
+            result.key: result
+            async for result in self.client.account_validation.validate_many(
+                rows, backoff=backoff, max_pending_checks=3
+            )
+        }
+        self.assertEqual(set("abcdefghij"), set(results))
+        self.assertEqual(1 + 1 + 3 + 3 + 2, route.call_count)
+        self.assertEqual("JOÃO DAS NEVES", results["a"].result.beneficiary_name)
+        self.assertIs(results["a"].result, results["b"].result)
+        self.assertIsInstance(results["c"].error, av_exceptions.InvalidAccountError)
+        self.assertTrue(results["d"].ok)
+        self.assertIsInstance(results["e"].error, av_exceptions.PendingValidationError)
+        self.assertIsInstance(results["f"].error, av_exceptions.InvalidAccountError)
+        self.assertIsInstance(results["g"].error, exceptions.InvalidParameterError)
+        self.assertTrue(results["h"].ok)
+        self.assertTrue(results["i"].ok)
+        self.assertIsInstance(results["j"].error, exceptions.InvalidParameterError)
+
+    @respx.mock
+    async def test_validate_many_cache(self):
+        route = self.mock_validate_by_account(
+            {"1001": ["valid_account_br"], "1002": ["invalid_account"]}
+        )
+        cache = utils.TTLCache(ttl=60)
+        rows = [
+            (1, {"account_number": "1001", "country_code": "BR"}),
+            (2, {"account_number": "1002", "country_code": "BR"}),
+        ]
+        for _ in range(2):
+            results = [
+                result.ok
+                async for result in self.client.account_validation.validate_many(
+                    rows, cache=cache
+                )
+            ]
+            self.assertEqual([True, False], sorted(results, reverse=True))
+        self.assertEqual(2, route.call_count)
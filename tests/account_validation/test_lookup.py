@@ -0,0 +1,65 @@
+from enum import Enum
+from unittest import TestCase
+
+from prometeo.account_validation.codes import (
+    BankIndex,
+    Colombia,
+    Ecuador,
+    ISOCode,
+    Mexico,
+    Peru,
+    Uruguay,
+    find_bank,
+    find_bank_by_account_number,
+    find_bank_by_name,
+)
+from prometeo.account_validation.codes.lookup import get_index, normalize_name
+
+
+class TestBankLookup(TestCase):
+    def test_find_bank(self):
+        self.assertEqual(Mexico.BBVABANCOMER, find_bank("MX", "012"))
+        self.assertEqual(Mexico.BBVABANCOMER, find_bank(ISOCode.MEXICO, " 012 "))
+        self.assertEqual(Peru.BANCO_DE_CREDITO, find_bank("pe", "2"))
+        self.assertEqual(Ecuador.BANCO_PACIFICO, find_bank("EC", "030"))
+        self.assertEqual(Colombia.BANCOLOMBIA, find_bank("CO", "007"))
+        self.assertEqual(Colombia.BANCOLOMBIA_2, find_bank("CO", "1007"))
+        self.assertEqual("999", find_bank("CL", "999").value)
+        self.assertIsNone(find_bank("MX", "998"))
+        self.assertIsNone(find_bank("MX", ""))
+        self.assertIsNone(find_bank("UY", ""))
+        self.assertIsNone(find_bank("CL", "   "))
+        self.assertEqual(Uruguay.CITIBANK, find_bank("UY", "0"))
+        self.assertIsNone(find_bank("ZZ", "012"))
+
+    def test_find_bank_by_name(self):
+        self.assertEqual(
+            Peru.BANCO_DE_LA_NACION, find_bank_by_name("PE", "Banco de la Nación")
+        )
+        self.assertEqual(Mexico.BBVABANCOMER, find_bank_by_name("MX", "bbvabancomer"))
+        self.assertIsNone(find_bank_by_name("MX", "Banco de la Nación"))
+
+    def test_find_bank_by_account_number(self):
+        self.assertEqual(
+            Mexico.BBVABANCOMER,
+            find_bank_by_account_number("MX", "012180001202379491"),
+        )
+        self.assertEqual(
+            Peru.BANCO_DE_CREDITO,
+            find_bank_by_account_number("PE", "00219300123456789013"),
+        )
+        self.assertIsNone(find_bank_by_account_number("BR", "0011234"))
+
+    def test_normalize_name(self):
+        self.assertEqual("BANCO_DE_CREDITO", normalize_name(" Banco de Crédito "))
+        self.assertEqual("CAJA_ICA", normalize_name("caja-ica"))
+
+    def test_index_is_built_once(self):
+        self.assertIs(get_index(), get_index())
+
+    def test_custom_enums(self):
+        Banks = Enum("Banks", {"FIRST": "01", "FIRST_ALIAS": "01", "SECOND": "02"})
+        index = BankIndex({ISOCode.TEST_COUNTRY: Banks})
+        self.assertEqual(Banks.FIRST, index.find("XX", "1"))
+        self.assertEqual(Banks.FIRST, index.find_by_name("XX", "first alias"))
+        self.assertEqual(Banks.SECOND, index.find_by_name("XX", "second"))
@@ -0,0 +1,80 @@
+from unittest import TestCase
+
+from prometeo import exceptions
+from prometeo.account_validation import exceptions as av_exceptions
+from prometeo.account_validation.codes import BankCodes, ISOCode, Mexico, Peru
+from prometeo.account_validation.prevalidation import prevalidate, prevalidate_many
+
+
+class TestPrevalidation(TestCase):
+    def test_clabe(self):
+        info = prevalidate("032180000118359719", "MX")
+        self.assertEqual("CLABE", info.format)
+        self.assertEqual("032", info.bank_code)
+        info = prevalidate("012 180 00120237949 1", ISOCode.MEXICO, Mexico.BBVABANCOMER)
+        self.assertEqual("012180001202379491", info.account_number)
+        self.assertEqual(Mexico.BBVABANCOMER, info.bank)
+        with self.assertRaises(av_exceptions.InvalidAccountError):
+            prevalidate("032180000118359718", "MX")
+
+    def test_cbu(self):
+        info = prevalidate("2850590940090418135201", "AR")
+        self.assertEqual("CBU", info.format)
+        self.assertEqual("285", info.bank_code)
+        with self.assertRaises(av_exceptions.InvalidAccountError):
+            prevalidate("2850590840090418135201", "AR")
+        with self.assertRaises(av_exceptions.InvalidAccountError):
+            prevalidate("2850590940090418135202", "AR")
+
+    def test_cci(self):
+        info = prevalidate("00219300123456789013", "PE")
+        self.assertEqual("CCI", info.format)
+        self.assertEqual(Peru.BANCO_DE_CREDITO, info.bank)
+        with self.assertRaises(av_exceptions.InvalidAccountError):
+            prevalidate("00219300123456789012", "PE")
+
+    def test_sandbox_accounts(self):
+        self.assertEqual("999", prevalidate("999000000000000001", "MX").bank_code)
+        self.assertEqual("CCI", prevalidate("99900000000000000030", "PE").format)
+
+    def test_bank_code_mismatch(self):
+        with self.assertRaises(exceptions.InvalidParameterError) as cm:
+            prevalidate("012180001202379491", "MX", bank_code="002")
+        self.assertEqual(["bank_code"], cm.exception.params)
+        with self.assertRaises(exceptions.InvalidParameterError):
+            prevalidate("012180001202379491", "MX", bank_code=Mexico.BANAMEX)
+
+    def test_bank_code_match(self):
+        clabe = "012180001202379491"
+        self.assertEqual(Mexico.BBVABANCOMER, prevalidate(clabe, "MX", "12").bank)
+        self.assertEqual("012", prevalidate(clabe, "MX", "012").bank_code)
+        # The sandbox provider, unlisted prefixes and unknown codes
+        prevalidate(clabe, "MX", bank_code="999")
+        prevalidate(clabe, "MX", bank_code=BankCodes.TEST_PROVIDER)
+        prevalidate("999000000000000001", "MX", bank_code="012")
+        prevalidate("032180000118359719", "MX", bank_code="012")
+        prevalidate(clabe, "MX", bank_code="998")
+        prevalidate("0000003110000000000014", "AR", bank_code="0000003")
+
+    def test_other_formats(self):
+        self.assertIsNone(prevalidate("404040406", "MX").format)
+        self.assertIsNone(prevalidate("***", "PE").format)
+        self.assertIsNone(prevalidate("9999", "BR").format)
+        with self.assertRaises(exceptions.InvalidParameterError) as cm:
+            prevalidate("404040406", "MX", strict=True)
+        self.assertEqual(["account_number"], cm.exception.params)
+        self.assertIsNone(prevalidate("9999", "BR", strict=True).format)
+
+    def test_prevalidate_many(self):
+        results = prevalidate_many(
+            [
+                {"account_number": "032180000118359719", "country_code": "MX"},
+                {"account_number": "032180000118359718", "country_code": "MX"},
+                {"account_number": "123", "country_code": "AR", "bank_code": "1"},
+            ],
+            strict=True,
+        )
+        self.assertEqual([0, 1, 2], [result.key for result in results])
+        self.assertEqual("CLABE", results[0].result.format)
+        self.assertIsInstance(results[1].error, av_exceptions.InvalidAccountError)
+        self.assertIsInstance(results[2].error, exceptions.InvalidParameterError)
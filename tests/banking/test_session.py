@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from prometeo.banking.client import BankingAPIClient, Session
 from tests.base_test_case import BaseTestCase
+import httpx
 import respx
 
 
@@ -89,3 +92,141 @@ class TestSession(BaseTestCase):
         self.session.list_transfer_institutions()
         last_request = respx.calls.last.request
         self.assertEqual(self.session_key, last_request.headers["X-Session-Key"])
+
+    def mock_clients_data(self):
+        self.mock_get_request(
+            respx,
+            "/client/",
+            json={
+                "status": "success",
+                "clients": {"0": "First Client", "1": "Second Client"},
+            },
+        )
+        self.mock_get_request(respx, "/client/0/", json={"status": "success"})
+        self.mock_get_request(respx, "/client/1/", json={"status": "success"})
+        self.mock_get_request(respx, "/account/", "get_accounts")
+        self.mock_get_request(
+            respx,
+            "/movement/",
+            json={
+                "movements": [
+                    {
+                        "credit": "",
+                        "date": "12/01/2019",
+                        "debit": 3500,
+                        "detail": "RETIRO EFECTIVO CAJERO AUTOMATICO",
+                        "id": "-890185180",
+                        "reference": "000000005084",
+                        "extra_data": None,
+                    },
+                ],
+                "status": "success",
+            },
+        )
+
+    @respx.mock
+    def test_get_clients_data(self):
+        self.mock_clients_data()
+        data = self.session.get_clients_data(datetime(2019, 1, 1), datetime(2019, 2, 1))
+        self.assertEqual(["0", "1"], sorted(data.keys()))
+        self.assertEqual("Second Client", data["1"].client.name)
+        self.assertEqual(2, len(data["0"].accounts))
+        self.assertEqual(1, len(data["0"].movements["001234567890"]))
+        paths = [call.request.url.path for call in respx.calls]
+        self.assertEqual(
+            ["/client/", "/client/0/", "/account/", "/movement/", "/movement/"],
+            paths[:5],
+        )
+
+    @respx.mock
+    async def test_get_clients_data_session_pool(self):
+        self.mock_clients_data()
+        other = Session(self.session._client, "logged_in", "other_session_key")
+        data = await self.session.get_clients_data(
+            datetime(2019, 1, 1), datetime(2019, 2, 1), sessions=[other]
+        )
+        self.assertEqual(["0", "1"], sorted(data.keys()))
+        used_keys = {
+            call.request.headers["X-Session-Key"]
+            for call in respx.calls
+            if call.request.url.path != "/client/"
+        }
+        self.assertEqual({self.session_key, "other_session_key"}, used_keys)
+
+    @respx.mock
+    async def test_get_clients_data_dedupes_sessions(self):
+        self.mock_clients_data()
+        other = Session(self.session._client, "logged_in", "other_session_key")
+        await self.session.get_clients_data(
+            datetime(2019, 1, 1),
+            datetime(2019, 2, 1),
+            sessions=[self.session, other, other],
+        )
+        paths = {}
+        for call in respx.calls:
+            if call.request.url.path != "/client/":
+                key = call.request.headers["X-Session-Key"]
+                paths.setdefault(key, []).append(call.request.url.path)
+        self.assertEqual({self.session_key, "other_session_key"}, set(paths))
+        for key_paths in paths.values():
+            self.assertEqual(["/account/", "/movement/", "/movement/"], key_paths[1:])
+
+    @respx.mock
+    def test_login_sessions_fallback(self):
+        respx.post("/login/").mock(
+            side_effect=[
+                httpx.Response(200, json={"status": "logged_in", "key": "key1"}),
+                httpx.Response(
+                    200, json={"status": "error", "message": "Session in use"}
+                ),
+            ]
+        )
+        sessions = self.client.banking.login_sessions(
+            3, "test_provider", "test_username", "test_password"
+        )
+        self.assertEqual(1, len(sessions))
+        self.assertEqual("key1", sessions[0].get_session_key())
+
+    @respx.mock
+    def test_login_sessions_logs_out_interactive_session(self):
+        respx.post("/login/").mock(
+            side_effect=[
+                httpx.Response(200, json={"status": "logged_in", "key": "key1"}),
+                httpx.Response(
+                    200,
+                    json={
+                        "status": "interaction_required",
+                        "key": "key2",
+                        "context": "Security question",
+                        "field": "answer",
+                    },
+                ),
+            ]
+        )
+        logout = respx.get("/logout/").mock(
+            return_value=httpx.Response(200, json={"status": "logged_out"})
+        )
+        sessions = self.client.banking.login_sessions(
+            3, "test_provider", "test_username", "test_password"
+        )
+        self.assertEqual(["key1"], [s.get_session_key() for s in sessions])
+        self.assertEqual(1, logout.call_count)
+        self.assertEqual("key2", logout.calls[0].request.headers["X-Session-Key"])
+
+    @respx.mock
+    def test_login_sessions_logs_out_on_unexpected_error(self):
+        respx.post("/login/").mock(
+            side_effect=[
+                httpx.Response(200, json={"status": "logged_in", "key": "key1"}),
+                httpx.ConnectError("Connection reset"),
+            ]
+        )
+        logout = respx.get("/logout/").mock(
+            return_value=httpx.Response(200, json={"status": "logged_out"})
+        )
+        with self.assertRaises(httpx.ConnectError):
+            self.client.banking.login_sessions(
+                3, "test_provider", "test_username", "test_password"
+            )
+        self.assertEqual(1, logout.call_count)
+        self.assertEqual("key1", logout.calls[0].request.headers["X-Session-Key"])
@@ -1,3 +1,6 @@
+import asyncio
+
+import httpx
 import respx
 
 from prometeo.crossborder.models import (
@@ -383,3 +386,80 @@ class TestCrossBorderClient(BaseTestCase):
         )
         result = self.client.crossborder.get_customers()
         self.assertEqual(result[0].id, "e4ef773e-cfa4-4a28-87cf-4746146944c4")
+
+    def mock_pages(self, url, fixture_name, pages, key="results"):
+        fixture = self.load_json(fixture_name)
+        item = fixture[key][0]
+        requested = []
+
+        def page(request):
+            number = int(request.url.params.get("page", 1))
+            requested.append(number)
+            data = {
+                "count": pages * 2,
+                "next": (
+                    f"http://api.example.org{url}?page={number + 1}&page_size=2"
+                    if number < pages
+                    else None
+                ),
+                "previous": None,
+                key: [
+                    {**item, "id": f"{number}-{index}"} for index in range(2)
+                ],
+            }
+            return httpx.Response(200, json=data)
+
+        respx.get(url).mock(side_effect=page)
+        return requested
+
+    @respx.mock
+    async def test_iter_transactions(self):
+        requested = self.mock_pages(
+            "/account/account_id/transactions", "get_account_transactions", 3
+        )
+        ids = [
+            transaction.id
+            async for transaction in self.client.crossborder.iter_transactions(
+                "account_id"
+            )
+        ]
+        self.assertEqual(["1-0", "1-1", "2-0", "2-1", "3-0", "3-1"], ids)
+        self.assertEqual([1, 2, 3], requested)
+        params = respx.calls.last.request.url.params
+        self.assertEqual("2", params["page_size"])
+
+    @respx.mock
+    async def test_iter_prefetches_next_page(self):
+        requested = self.mock_pages("/customer", "get_customers_mexico", 3)
+        customers = self.client.crossborder.iter_customers({"country": "MX"})
+        try:
+            first = await customers.__anext__()
+            self.assertEqual("1-0", first.id)
+            await asyncio.sleep(0)
+            self.assertEqual([1, 2], requested)
+        finally:
+            await customers.aclose()
+        self.assertEqual("MX", respx.calls.last.request.url.params["country"])
+        self.assertEqual([1, 2], requested)
+
+    @respx.mock
+    async def test_iter_intents_single_page(self):
+        self.mock_get_request(respx, "/payin/intent", fixture_name="successful_intents")
+        intents = [intent async for intent in self.client.crossborder.iter_intents()]
+        results = self.load_json("successful_intents")["results"]
+        self.assertEqual(len(results), len(intents))
+
+    @respx.mock
+    async def test_iter_payouts_error(self):
+        self.mock_get_request(respx, "/payout/transfer", "error_payout")
+        with self.assertRaises(CrossBorderClientError):
+            async for _ in self.client.crossborder.iter_payouts():
+                pass
+
+    @respx.mock
+    async def test_iter_accounts_without_pagination(self):
+        account = self.load_json("get_account_success")
+        self.mock_get_request(respx, "/account", json=[account, account])
+        accounts = [item async for item in self.client.crossborder.iter_accounts()]
+        self.assertEqual(2, len(accounts))
+        self.assertEqual(account["id"], accounts[0].id)
@@ -0,0 +1,255 @@
+import asyncio
+import json
+
+import httpx
+import respx
+
+from prometeo import exceptions, utils
+from prometeo.crossborder import PayoutBatch
+from prometeo.crossborder.exceptions import InsufficientAmountException
+from prometeo.crossborder.models import PayoutStatesEnum
+from tests.base_test_case import BaseTestCase
+
+
+class TestPayoutBatch(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backoff = utils.Backoff(initial=0.001, factor=1, maximum=0.001)
+        self.created = []
+
+    def payout_input(self, external_id, amount=10):
+        return {
+            "origin": "f3676011-5203-43db-a760-115203e3db5e",
+            "description": "Test Payout",
+            "currency": "MXN",
+            "amount": amount,
+            "external_id": external_id,
+            "customer": "customer_id",
+        }
+
+    def mock_create(self, timeouts=0):
+        def create(request):
+            data = json.loads(request.content)
+            self.created.append(data["external_id"])
+            if len(self.created) <= timeouts:
+                raise httpx.ReadTimeout("Timed out", request=request)
+            if data["amount"] <= 0:
+                return httpx.Response(400, json=self.load_json("error_payout"))
+            response = self.load_json("successful_payout")
+            response["id"] = "payout-" + data["external_id"]
+            return httpx.Response(200, json=response)
+
+        respx.post("/payout/transfer").mock(side_effect=create)
+
+    def mock_states(self, payout_id, *states):
+        def response(count):
+            data = self.load_json("get_payout_detail")
+            event = data["events"][0]
+            data["id"] = payout_id
+            data["events"] = [{**event, "state": state} for state in states[:count]]
+            return httpx.Response(200, json=data)
+
+        route = respx.get(f"/payout/transfer/{payout_id}")
+        route.side_effect = [response(count) for count in range(1, len(states) + 1)]
+        return route
+
+    def mock_list(self, *external_ids):
+        results = []
+        for external_id in external_ids:
+            payout = self.load_json("get_payout_detail")
+            payout.update(id="payout-" + external_id, external_id=external_id)
+            results.append(payout)
+        return respx.get("/payout/transfer").mock(
+            return_value=httpx.Response(200, json={"results": results})
+        )
+
+    @respx.mock
+    async def test_run(self):
+        self.mock_create()
+        self.mock_states("payout-1", "created", "created", "pending", "settled")
+        self.mock_states("payout-2", "created", "failed")
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff)
+        report = await batch.run(
+            [
+                self.payout_input("1"),
+                self.payout_input("2"),
+                self.payout_input("1"),
+                self.payout_input("3", amount=0),
+                {"external_id": "4", "amount": "ten"},
+            ]
+        )
+        self.assertEqual(["1", "2", "3"], sorted(self.created))
+        self.assertEqual({"1": "payout-1", "2": "payout-2"}, report.payout_ids)
+        self.assertEqual(
+            {"1": PayoutStatesEnum.settled, "2": PayoutStatesEnum.failed},
+            report.states,
+        )
+        self.assertIsInstance(report.errors["3"], InsufficientAmountException)
+        self.assertIsInstance(report.errors["4"], exceptions.InvalidParameterError)
+        self.assertIn("amount", report.errors["4"].params)
+        self.assertEqual(["1"], report.with_state(PayoutStatesEnum.settled))
+        counts = report.counts
+        self.assertEqual(
+            (1, 1, 2), (counts["settled"], counts["failed"], counts["error"])
+        )
+
+    @respx.mock
+    async def test_conflicting_duplicate(self):
+        self.mock_create()
+        self.mock_states("payout-1", "settled")
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff)
+        report = await batch.run(
+            [self.payout_input("1"), self.payout_input("1", amount=99999)]
+        )
+        self.assertEqual(["1"], self.created)
+        self.assertEqual({"1": PayoutStatesEnum.settled}, report.states)
+        self.assertIsInstance(report.errors["1"], exceptions.InvalidParameterError)
+        self.assertEqual(["external_id"], report.errors["1"].params)
+
+    async def test_invalid_inputs(self):
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff)
+        report = await batch.run(["payout", {1: "amount"}, {"external_id": ["1"]}])
+        self.assertEqual([0, 1, 2], sorted(report.errors))
+        for error in report.errors.values():
+            self.assertIsInstance(error, exceptions.InvalidParameterError)
+
+    @respx.mock
+    async def test_updates(self):
+        self.mock_create()
+        self.mock_states("payout-1", "created", "created", "pending", "settled")
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff)
+        payouts = [self.payout_input("1")]
+        updates = [update async for update in batch.updates(payouts)]
+        self.assertEqual("payout-1", updates[0].payout_id)
+        self.assertEqual([], updates[0].transitions)
+        transitions = [
+            [transition.state.value for transition in update.transitions]
+            for update in updates[1:]
+        ]
+        self.assertEqual(
+            [["created"], ["created"], ["pending"], ["settled"]], transitions
+        )
+        self.assertTrue(updates[-1].finished)
+
+    @respx.mock
+    async def test_cache_skips_submitted(self):
+        self.mock_create()
+        self.mock_states("payout-1", "settled")
+        self.mock_states("payout-2", "settled")
+        cache = utils.TTLCache(60)
+        cache.set("1", "payout-1")
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff, cache=cache)
+        report = await batch.run([self.payout_input("1"), self.payout_input("2")])
+        self.assertEqual(["2"], self.created)
+        self.assertEqual("payout-2", cache.get("2"))
+        self.assertEqual(2, report.counts["settled"])
+
+    @respx.mock
+    async def test_gives_up_after_errors(self):
+        self.mock_create()
+        respx.get("/payout/transfer/payout-1").mock(
+            return_value=httpx.Response(400, json=self.load_json("get_payout_error"))
+        )
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff, max_errors=2)
+        report = await batch.run([self.payout_input("1")])
+        self.assertIn("1", report.errors)
+        self.assertEqual({"1": "payout-1"}, report.payout_ids)
+        self.assertEqual(2, respx.calls.call_count - 1)
+
+    @respx.mock
+    def test_run_sync(self):
+        self.mock_create()
+        self.mock_states("payout-1", "cancelled")
+        report = PayoutBatch(self.client.crossborder, backoff=self.backoff).run(
+            [self.payout_input("1")]
+        )
+        self.assertEqual({"1": PayoutStatesEnum.cancelled}, report.states)
+
+    @respx.mock
+    async def test_timeout(self):
+        self.mock_create()
+        respx.get("/payout/transfer/payout-1").mock(
+            return_value=httpx.Response(200, json=self.load_json("get_payout_detail"))
+        )
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff)
+        report = await batch.run(
+            [self.payout_input("1"), self.payout_input("2", amount=0)], timeout=0.05
+        )
+        self.assertEqual({"1": PayoutStatesEnum.created}, report.unfinished)
+        self.assertEqual({"1": "payout-1"}, report.payout_ids)
+        self.assertEqual((1, 1), (report.counts["unfinished"], report.counts["error"]))
+
+    @respx.mock
+    async def test_ambiguous_submit_is_reconciled(self):
+        self.mock_create(timeouts=1)
+        route = self.mock_list("2", "1")
+        self.mock_states("payout-1", "settled")
+        cache = utils.TTLCache(60)
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff, cache=cache)
+        report = await batch.run([self.payout_input("1")])
+        self.assertEqual(["1"], self.created)
+        params = route.calls.last.request.url.params
+        self.assertEqual({"external_id": "1"}, dict(params))
+        self.assertEqual({"1": PayoutStatesEnum.settled}, report.states)
+        self.assertEqual("payout-1", cache.get("1"))
+
+    @respx.mock
+    async def test_ambiguous_submit_not_found_is_resubmitted(self):
+        self.mock_create(timeouts=1)
+        route = self.mock_list()
+        self.mock_states("payout-1", "settled")
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff)
+        report = await batch.run([self.payout_input("1")])
+        self.assertEqual(["1", "1"], self.created)
+        self.assertEqual(1, route.call_count)
+        self.assertEqual({"1": PayoutStatesEnum.settled}, report.states)
+
+    @respx.mock
+    async def test_ambiguous_submit_is_reconciled_on_next_run(self):
+        self.mock_create(timeouts=2)
+        self.mock_list()
+        cache = utils.TTLCache(60)
+        batch = PayoutBatch(
+            self.client.crossborder, backoff=self.backoff, cache=cache, max_errors=2
+        )
+        report = await batch.run([self.payout_input("1")])
+        self.assertIsInstance(report.errors["1"], httpx.ReadTimeout)
+        self.assertIsNone(cache.get("1", "missing"))
+
+        self.mock_list("1")
+        self.mock_states("payout-1", "settled")
+        report = await batch.run([self.payout_input("1")])
+        self.assertEqual(["1", "1"], self.created)
+        self.assertEqual({"1": PayoutStatesEnum.settled}, report.states)
+
+    @respx.mock
+    async def test_run_again(self):
+        self.mock_create()
+        self.mock_states("payout-1", "settled", "settled")
+        batch = PayoutBatch(self.client.crossborder, backoff=self.backoff)
+        await batch.run([self.payout_input("1")])
+        report = await batch.run([self.payout_input("1")])
+        self.assertEqual({"1": PayoutStatesEnum.settled}, report.states)
+
+    @respx.mock
+    async def test_checks_dont_wait_for_submissions(self):
+        async def create(request):
+            external_id = json.loads(request.content)["external_id"]
+            if external_id == "2":
+                await asyncio.sleep(0.1)
+            response = self.load_json("successful_payout")
+            response["id"] = "payout-" + external_id
+            return httpx.Response(200, json=response)
+
+        respx.post("/payout/transfer").mock(side_effect=create)
+        self.mock_states("payout-1", "created", "settled")
+        self.mock_states("payout-2", "settled")
+        batch = PayoutBatch(
+            self.client.crossborder, concurrency=2, backoff=self.backoff
+        )
+        payouts = [self.payout_input("1"), self.payout_input("2")]
+        updates = [
+            (update.external_id, update.finished)
+            async for update in batch.updates(payouts)
+        ]
+        self.assertLess(updates.index(("1", True)), updates.index(("2", False)))
@@ -0,0 +1,173 @@
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from itertools import count
+
+import asynctest
+import httpx
+import respx
+
+from prometeo import utils
+from prometeo.crossborder import QuoteManager
+from prometeo.crossborder.exceptions import QuoteAlreadyUsedException
+from prometeo.crossborder.models import FXQuoteDataResponse
+from prometeo.crossborder.quotes import quote_expiration
+from tests.base_test_case import BaseTestCase
+
+
+class TestQuoteManager(BaseTestCase):
+    def mock_quotes(self, expires_in=60):
+        ids = count(1)
+        requests = []
+        # Read on each request, so tests can change it on the way
+        self.expires_in = expires_in
+
+        def quote(request):
+            data = json.loads(request.content)
+            requests.append(data)
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.expires_in)
+            response = self.load_json("create_quote_success")
+            response.update(
+                id=str(next(ids)),
+                amount=data["amount"],
+                expires_at=expires_at.isoformat().replace("+00:00", "Z"),
+            )
+            return httpx.Response(200, json=response)
+
+        respx.post("/fx/exchange").mock(side_effect=quote)
+        return requests
+
+    async def wait_fills(self, manager):
+        while manager._fill_tasks:
+            await asyncio.sleep(0)
+
+    @respx.mock
+    async def test_get_quote_uses_pool(self):
+        requests = self.mock_quotes()
+        manager = QuoteManager(self.client.crossborder, pool_size=2)
+        first = await manager.get_quote("pen/brl", 10)
+        self.assertEqual("1", first.id)
+        await self.wait_fills(manager)
+        self.assertEqual(2, manager.available("PEN/BRL", 10))
+        self.assertEqual(3, len(requests))
+        self.assertEqual({"amount": 10, "pair": "PEN/BRL"}, requests[-1])
+
+        second = await manager.get_quote("PEN/BRL", 10)
+        self.assertEqual("2", second.id)
+        await self.wait_fills(manager)
+        self.assertEqual(4, len(requests))
+        ids = {first.id, second.id, (await manager.get_quote("PEN/BRL", 10)).id}
+        self.assertEqual(3, len(ids))
+        await manager.stop()
+
+    @respx.mock
+    async def test_expiring_quotes_are_not_prefetched(self):
+        requests = self.mock_quotes(expires_in=3)
+        async with QuoteManager(
+            self.client.crossborder, pool_size=1, margin=5, refresh_interval=0.001
+        ) as manager:
+            quote = await manager.get_quote("PEN/BRL", 10)
+            self.assertEqual("1", quote.id)
+            for _ in range(10):
+                await asyncio.sleep(0.001)
+            self.assertEqual(1, len(requests))
+            self.assertEqual(0, manager.available("PEN/BRL", 10))
+
+    @respx.mock
+    async def test_expiring_prefetched_quotes_are_handed_out(self):
+        requests = self.mock_quotes()
+        manager = QuoteManager(self.client.crossborder, pool_size=1, margin=5)
+        await manager.get_quote("PEN/BRL", 10)
+        self.expires_in = 3
+        await self.wait_fills(manager)
+        self.assertEqual(0, manager.available("PEN/BRL", 10))
+
+        quote = await manager.get_quote("PEN/BRL", 10)
+        self.assertEqual("2", quote.id)
+        await self.wait_fills(manager)
+        self.assertEqual(2, len(requests))
+
+        # A quote that lasts long enough again resumes the prefetching
+        self.expires_in = 60
+        quote = await manager.get_quote("PEN/BRL", 10)
+        self.assertEqual("3", quote.id)
+        await self.wait_fills(manager)
+        self.assertEqual(4, len(requests))
+        self.assertEqual(1, manager.available("PEN/BRL", 10))
+        await manager.stop()
+
+    @respx.mock
+    async def test_rate_limit(self):
+        requests = self.mock_quotes()
+        limiter = utils.RateLimiter(1000)
+        limiter.acquire = asynctest.CoroutineMock(wraps=limiter.acquire)
+        manager = QuoteManager(
+            self.client.crossborder, pool_size=2, rate_limiter=limiter
+        )
+        await manager.get_quote("PEN/BRL", 10)
+        await self.wait_fills(manager)
+        self.assertEqual(3, len(requests))
+        self.assertEqual(3, limiter.acquire.call_count)
+        await manager.stop()
+
+    @respx.mock
+    async def test_amount_band(self):
+        requests = self.mock_quotes()
+        manager = QuoteManager(
+            self.client.crossborder,
+            pool_size=1,
+            amount_band=lambda amount: -(-amount // 100) * 100,
+        )
+        await manager.get_quote("PEN/BRL", 120)
+        await self.wait_fills(manager)
+        quote = await manager.get_quote("PEN/BRL", 180)
+        self.assertEqual(200, quote.amount)
+        self.assertEqual([200, 200], [request["amount"] for request in requests[:2]])
+        await manager.stop()
+
+    @respx.mock
+    async def test_background_refresh(self):
+        requests = self.mock_quotes()
+        async with QuoteManager(
+            self.client.crossborder, pool_size=2, refresh_interval=0.001
+        ) as manager:
+            await manager.get_quote("PEN/BRL", 10)
+            await manager.get_quote("PEN/BRL", 10)
+            for _ in range(100):
+                await asyncio.sleep(0.001)
+                if manager.available("PEN/BRL", 10) == 2:
+                    break
+            self.assertEqual(2, manager.available("PEN/BRL", 10))
+        self.assertLessEqual(len(requests), 5)
+
+    @respx.mock
+    async def test_use_quote_retries_used_quote(self):
+        self.mock_quotes()
+        manager = QuoteManager(self.client.crossborder, pool_size=0)
+        used = []
+
+        async def create_intent(quote):
+            used.append(quote.id)
+            if len(used) == 1:
+                raise QuoteAlreadyUsedException("Quote already used")
+            return quote.id
+
+        result = await manager.use_quote("PEN/BRL", 10, create_intent)
+        self.assertEqual("2", result)
+        self.assertEqual(["1", "2"], used)
+
+        with self.assertRaises(QuoteAlreadyUsedException):
+            await manager.use_quote("PEN/BRL", 10, create_intent_always_used, retries=2)
+
+    def test_quote_expiration(self):
+        quote = FXQuoteDataResponse(**self.load_json("create_quote_success"))
+        self.assertEqual(
+            datetime(2025, 10, 17, 3, 46, 45, 531406, timezone.utc).timestamp(),
+            quote_expiration(quote),
+        )
+        quote.expires_at = "invalid"
+        self.assertEqual(0, quote_expiration(quote))
+
+
+def create_intent_always_used(quote):
+    raise QuoteAlreadyUsedException("Quote already used")
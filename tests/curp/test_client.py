@@ -1,18 +1,22 @@
 from datetime import datetime
 
+import asynctest
 import six
 from six.moves.urllib.parse import parse_qs
 
 
+from prometeo import utils
 from prometeo.curp import exceptions, Gender, State
+from prometeo.curp.validation import check_digit
 from tests.base_test_case import BaseTestCase
+import httpx
 import respx
 
 
 class TestCurpClient(BaseTestCase):
     @respx.mock
     async def test_query_success(self):
-        test_curp = "ABCD880304HDFXNR45"
+        test_curp = "GODE880304HDFXNR01"
         self.mock_post_request(respx, "/query", "successful_curp")
         result = await self.client.curp.query(test_curp)
 
@@ -31,7 +35,7 @@ class TestCurpClient(BaseTestCase):
         self.mock_post_request(respx, "/query", "inexistent_curp")
 
         with self.assertRaises(exceptions.CurpError) as cm:
-            self.client.curp.query("ABCD123445")
+            self.client.curp.query("GODE880304MSLXNR03")
 
         self.assertIn(error_message, cm.exception.message)
 
@@ -83,14 +87,14 @@ class TestCurpClient(BaseTestCase):
 
     @respx.mock
     async def test_pdf_url(self):
-        test_curp = "ABCD880304HDFXNR45"
+        test_curp = "GODE880304HDFXNR01"
         self.mock_post_request(respx, "/query", "successful_curp")
         result = await self.client.curp.query(test_curp)
         self.assertEqual("/pdf/50ad2ba127ae4cc384fd265e585a1f67.pdf", result.pdf_url)
 
     @respx.mock
     def test_download_pdf(self):
-        test_curp = "ABCD880304HDFXNR45"
+        test_curp = "GODE880304HDFXNR01"
         pdf_url = "/pdf/50ad2ba127ae4cc384fd265e585a1f67.pdf"
         pdf_content = "pdf content"
         self.mock_post_request(respx, "/query", "successful_curp")
@@ -98,3 +102,119 @@ class TestCurpClient(BaseTestCase):
 
         result = self.client.curp.query(test_curp)
         self.assertEqual(six.ensure_binary(pdf_content), result.pdf.get_file())
+
+    def mock_query_by_curp(self, existing):
+        def handler(request):
+            curp = parse_qs(request.content.decode("utf-8"))["curp"][0]
+            fixture = "successful_curp" if curp in existing else "inexistent_curp"
+            return httpx.Response(200, json=self.load_json(fixture))
+
+        return respx.post("/query").mock(side_effect=handler)
+
+    @respx.mock
+    async def test_query_many(self):
+        route = self.mock_query_by_curp({"GODE880304HDFXNR01"})
+        curps = ["GODE880304HDFXNR01", "gode880304hdfxnr01 ", "GODE880304MSLXNR03"]
+        results = {
+            result.key: result async for result in self.client.curp.query_many(curps)
+        }
+        self.assertEqual(2, route.call_count)
+        found = results["GODE880304HDFXNR01"]
+        self.assertTrue(found.ok)
+        self.assertEqual("SINALOA", found.result.document_data.entidad_registro)
+        self.assertIsInstance(results["GODE880304MSLXNR03"].error, exceptions.CurpError)
+
+    @respx.mock
+    async def test_query_many_cache(self):
+        route = self.mock_query_by_curp({"GODE880304HDFXNR01"})
+        cache = utils.TTLCache(ttl=60)
+        curps = ["GODE880304HDFXNR01", "GODE880304MSLXNR03"]
+        for _ in range(2):
+            results = {
+                result.key: result.ok
+                async for result in self.client.curp.query_many(curps, cache=cache)
+            }
+            self.assertEqual(
+                {"GODE880304HDFXNR01": True, "GODE880304MSLXNR03": False}, results
+            )
+        self.assertEqual(2, route.call_count)
+
+    @respx.mock
+    async def test_query_many_rate_limit(self):
+        self.mock_query_by_curp(set())
+        limiter = utils.RateLimiter(1000)
+        limiter.acquire = asynctest.CoroutineMock(wraps=limiter.acquire)
+        curps = ["GODE8803{:02d}HDFXNR0".format(day) for day in range(1, 6)]
+        curps = [curp + check_digit(curp) for curp in curps]
+        results = [
+            result
+            async for result in self.client.curp.query_many(curps, rate_limiter=limiter)
+        ]
+        self.assertEqual(5, len(results))
+        self.assertEqual(5, limiter.acquire.call_count)
+
+    async def test_query_invalid_curp(self):
+        with self.assertRaises(exceptions.InvalidCurpError):
+            await self.client.curp.query("ABCD123445")
+
+    @respx.mock
+    async def test_query_many_invalid_curps(self):
+        route = self.mock_query_by_curp({"GODE880304HDFXNR01"})
+        curps = ["GODE880304HDFXNR01", "GODE880304HDFXNR02", "ABCD123445"]
+        results = {
+            result.key: result async for result in self.client.curp.query_many(curps)
+        }
+        self.assertEqual(1, route.call_count)
+        self.assertTrue(results["GODE880304HDFXNR01"].ok)
+        for curp in curps[1:]:
+            self.assertIsInstance(results[curp].error, exceptions.InvalidCurpError)
+
+    @respx.mock
+    async def test_reverse_query_many(self):
+        def handler(request):
+            body = parse_qs(request.content.decode("utf-8"))
+            found = body["name"][0] == "JOHN"
+            fixture = "successful_curp" if found else "inexistent_curp"
+            return httpx.Response(200, json=self.load_json(fixture))
+
+        route = respx.post("/reverse-query").mock(side_effect=handler)
+        john = {
+            "state": State.SINALOA,
+            "birthdate": datetime(1988, 3, 4),
+            "name": "John",
+            "first_surname": "Doe",
+            "last_surname": "Ponce",
+            "gender": Gender.MALE,
+        }
+        people = [
+            (1, john),
+            (2, dict(john, name=" john ", state="SL", birthdate="04/03/1988")),
+            (3, dict(john, name="JANE", gender="FEMALE")),
+            (4, dict(john, state="XX")),
+            (5, dict(john, birthdate="31/02/1988")),
+            (6, dict(john, first_surname="  ")),
+        ]
+        results = {
+            result.key: result
+            async for result in self.client.curp.reverse_query_many(people)
+        }
+        self.assertEqual(2, route.call_count)
+        self.assertEqual([1, 2, 3, 4, 5, 6], sorted(results))
+        for row_id in (1, 2):
+            self.assertEqual(
+                "SINALOA", results[row_id].result.document_data.entidad_registro
+            )
+        self.assertIsInstance(results[3].error, exceptions.CurpError)
+        for row_id in (4, 5, 6):
+            self.assertIsInstance(results[row_id].error, exceptions.InvalidPersonError)
+
+        bodies = [
+            parse_qs(call.request.content.decode("utf-8")) for call in route.calls
+        ]
+        self.assertEqual(
+            {("JOHN", "H", "04/03/1988"), ("JANE", "M", "04/03/1988")},
+            {
+                (body["name"][0], body["gender"][0], body["birthdate"][0])
+                for body in bodies
+            },
+        )
@@ -0,0 +1,41 @@
+from unittest import TestCase
+
+from prometeo.curp import exceptions
+from prometeo.curp.validation import (
+    check_digit,
+    is_valid_curp,
+    validate_curp,
+    validate_curps,
+)
+
+
+class TestValidation(TestCase):
+    def test_check_digit(self):
+        self.assertEqual("7", check_digit("LOOA531113HTCPBN0"))
+        self.assertEqual("2", check_digit("GOMC000101HDFMRRA"))
+
+    def test_validate_curp(self):
+        self.assertEqual("LOOA531113HTCPBN07", validate_curp(" looa531113htcpbn07 "))
+        self.assertTrue(is_valid_curp("GOMC000101HDFMRRA2"))
+
+    def test_invalid_curps(self):
+        invalid = {
+            "LOOA531113HTCPBN0": "must have 18 characters",
+            "LBOA531113HTCPBN07": "invalid format",
+            "LOOA531313HTCPBN07": "invalid birthdate",
+            "LOOA010229HTCPBNA7": "invalid birthdate",
+            "LOOA531113XTCPBN07": "invalid gender X",
+            "LOOA531113HXXPBN07": "invalid state XX",
+            "LOOA531113HTCPBN08": "invalid check digit",
+        }
+        for curp, reason in invalid.items():
+            with self.assertRaises(exceptions.InvalidCurpError) as cm:
+                validate_curp(curp)
+            self.assertIn(reason, cm.exception.message)
+            self.assertFalse(is_valid_curp(curp))
+
+    def test_validate_curps(self):
+        self.assertEqual(
+            [None, "invalid check digit", "must have 18 characters"],
+            validate_curps(["LOOA531113HTCPBN07", "LOOA531113HTCPBN08", ""]),
+        )
@@ -0,0 +1,86 @@
+import random
+from unittest import TestCase
+
+from prometeo.dian import NumerationIndex
+from prometeo.dian.models import Numeration, NumerationRange
+
+
+def make_range(from_number, to_number, prefix="", establishment="Main"):
+    return NumerationRange(
+        from_number=from_number,
+        to_number=to_number,
+        mode="COMPUTADOR",
+        establishment=establishment,
+        prefix=prefix,
+        type="AUTORIZACIÓN",
+    )
+
+
+class TestNumerationIndex(TestCase):
+    def test_find(self):
+        first = make_range(1, 100)
+        second = make_range(201, 300)
+        prefixed = make_range(1, 50, prefix="SETP")
+        index = NumerationIndex([first, second, prefixed])
+        self.assertIs(first, index.find(1))
+        self.assertIs(first, index.find(100))
+        self.assertIsNone(index.find(101))
+        self.assertIs(second, index.find(250))
+        self.assertIsNone(index.find(0))
+        self.assertIsNone(index.find(301))
+        self.assertIs(prefixed, index.find(10, prefix="SETP"))
+        self.assertFalse(index.is_authorized(60, prefix="SETP"))
+        self.assertFalse(index.is_authorized(1, prefix="OTHER"))
+
+    def test_establishment(self):
+        main = make_range(1, 100)
+        branch = make_range(101, 200, establishment="Branch")
+        index = NumerationIndex([main, branch])
+        self.assertIs(branch, index.find(150))
+        self.assertIsNone(index.find(150, establishment="Main"))
+        self.assertIs(branch, index.find(150, establishment="Branch"))
+
+    def test_overlapping_ranges(self):
+        ranges = [make_range(50, 150), make_range(1, 100), make_range(120, 400)]
+        index = NumerationIndex(ranges)
+        self.assertIs(ranges[1], index.find(10))
+        self.assertIs(ranges[0], index.find(75))
+        self.assertIs(ranges[0], index.find(130))
+        self.assertIs(ranges[2], index.find(300))
+
+    def test_matches_linear_scan(self):
+        rng = random.Random(1)
+        ranges = []
+        for _ in range(200):
+            start = rng.randint(0, 10000)
+            ranges.append(make_range(start, start + rng.randint(0, 300)))
+        index = NumerationIndex(ranges)
+        numbers = [rng.randint(-10, 11000) for _ in range(2000)]
+        expected = [
+            next((r for r in ranges if r.from_number <= n <= r.to_number), None)
+            for n in numbers
+        ]
+        found = index.find_many(numbers)
+        self.assertTrue(all(a is b for a, b in zip(expected, found)))
+        self.assertEqual(
+            [r is not None for r in expected], index.authorized_many(numbers)
+        )
+
+    def test_from_numerations(self):
+        ranges = [make_range(1, 2000)]
+        numeration = Numeration(
+            nit=None,
+            dv=None,
+            name=None,
+            reason=None,
+            address=None,
+            country=None,
+            department=None,
+            municipality=None,
+            ranges=ranges,
+            pdf_url=None,
+            pdf_available=False,
+        )
+        index = NumerationIndex.from_numerations([numeration])
+        self.assertEqual([True, False], index.authorized_many([5, 2001]))
+        self.assertEqual([None], index.find_many([5], prefix="X"))
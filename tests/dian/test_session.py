@@ -1,5 +1,6 @@
 from datetime import datetime
 
+from prometeo import exceptions
 from prometeo.dian.client import (
     DianAPIClient,
     Session,
@@ -107,3 +108,33 @@ class TestSession(BaseTestCase):
 
         last_request = respx.calls.last.request
         self.assertEqual(session_key, self.qs(last_request)["session_key"][0])
+
+    @respx.mock
+    def test_get_dossier(self):
+        self.mock_get_request(respx, "/company-info/", "company_info")
+        self.mock_get_request(respx, "/balances/", "company_balances")
+        self.mock_get_request(respx, "/rent/", "company_rent")
+        self.mock_get_request(respx, "/vat/", "vat_declaration")
+        self.mock_get_request(
+            respx, "/retentions/", json={"message": "Server error"}, status_code=500
+        )
+        dossier = self.session.get_dossier(
+            [2018, 2019], vat_periodicity=Periodicity.QUARTERLY, concurrency=4
+        )
+
+        # 2 + 2 years * (1 rent + 3 vat + 12 retentions)
+        self.assertEqual(34, respx.calls.call_count)
+        self.assertEqual("Qualia Fintech SRL", dossier.company_info.reason)
+        self.assertEqual(2, len(dossier.balances))
+        self.assertEqual([2018, 2019], sorted(dossier.rent_declarations))
+        self.assertEqual([1, 2, 3], sorted(dossier.vat_declarations[2019]))
+        self.assertEqual({}, dossier.retentions)
+        self.assertEqual(24, len(dossier.errors))
+        self.assertEqual(("retentions", 2018, 1), dossier.errors[0].key)
+        self.assertIsInstance(dossier.errors[0].error, exceptions.InternalAPIError)
+        periods = {
+            self.qs(call.request)["period"][0]
+            for call in respx.calls
+            if call.request.url.path == "/vat/"
+        }
+        self.assertEqual({"1", "2", "3"}, periods)
@@ -1,8 +1,11 @@
-from prometeo import exceptions
+import json
+
+from prometeo import exceptions, utils
 from prometeo.payment import exceptions as payment_exceptions
 from tests.base_test_case import BaseTestCase
 
 from prometeo import Client
+import httpx
 import respx
 
 
@@ -112,3 +115,63 @@ class TestClient(BaseTestCase):
         )
         with self.assertRaises(exceptions.BadRequestError):
             self.client.payment.get_transaction_data(intent_id)
+
+    def mock_create_intent(self):
+        def handler(request):
+            body = json.loads(request.content)
+            if body["amount"] == "0":
+                return httpx.Response(400, json={"message": "Invalid amount"})
+            data = self.load_json("create_intent_response_success")
+            data.update(
+                external_id=body["external_id"],
+                amount=body["amount"],
+                intent_id="intent-{}".format(body["external_id"]),
+            )
+            return httpx.Response(200, json=data)
+
+        return respx.post("/api/v1/payment-intent/").mock(side_effect=handler)
+
+    def intent_spec(self, external_id, amount="1.00"):
+        return {
+            "widget_id": "widget",
+            "currency": "USD",
+            "amount": amount,
+            "external_id": external_id,
+            "concept": "PROM123452",
+        }
+
+    @respx.mock
+    def test_create_intents(self):
+        route = self.mock_create_intent()
+        specs = [
+            self.intent_spec("a"),
+            self.intent_spec("b", amount="0"),
+            self.intent_spec("a"),
+            self.intent_spec(None),
+            {"widget_id": "widget"},
+            self.intent_spec("a", amount="200"),
+        ]
+        results = self.client.payment.create_intents(specs, concurrency=2)
+
+        self.assertEqual(3, route.call_count)
+        self.assertEqual(
+            ["a", "b", "a", ("index", 3), ("index", 4), "a"],
+            [r.key for r in results],
+        )
+        self.assertEqual("intent-a", results[0].result.intent_id)
+        self.assertIs(results[0].result, results[2].result)
+        self.assertIsInstance(results[1].error, exceptions.BadRequestError)
+        self.assertTrue(results[3].ok)
+        self.assertIsInstance(results[4].error, TypeError)
+        self.assertIsInstance(results[5].error, exceptions.InvalidParameterError)
+
+    @respx.mock
+    def test_create_intents_replay(self):
+        route = self.mock_create_intent()
+        cache = utils.TTLCache(ttl=60)
+        specs = [self.intent_spec("a"), self.intent_spec("b", amount="0")]
+        self.client.payment.create_intents(specs, cache=cache)
+        results = self.client.payment.create_intents(specs, cache=cache)
+        self.assertEqual(3, route.call_count)
+        self.assertEqual("intent-a", results[0].result.intent_id)
+        self.assertFalse(results[1].ok)
@@ -0,0 +1,108 @@
+import asyncio
+
+from prometeo import Client, exceptions, utils
+from prometeo.payment import IntentWatcher
+from tests.base_test_case import BaseTestCase
+import httpx
+import respx
+
+
+UNPAID_ID = "bea71e55-a1ec-4e5f-a5c0-c0e10b1a571c"
+PAID_ID = "9999e375-9999-4da0-a4fd-85e5a04c9999"
+
+
+class TestIntentWatcher(BaseTestCase):
+    def setUp(self):
+        self.client = Client("test_key", "production")
+        self.backoff = utils.Backoff(initial=0.001, factor=1, maximum=0.001)
+
+    def intent_response(self, fixture_name, statuses=None):
+        data = self.load_json(fixture_name)
+        if statuses is not None:
+            data["status_history"] = data["status_history"][:statuses]
+            data["current_status"] = data["status_history"][-1]["status"]
+        return httpx.Response(200, json=data)
+
+    @respx.mock
+    async def test_updates(self):
+        route = respx.get(f"/api/v1/payment-intent/{PAID_ID}")
+        route.side_effect = [
+            self.intent_response("valid_intent_paid", 1),
+            self.intent_response("valid_intent_paid", 1),
+            self.intent_response("valid_intent_paid", 3),
+            self.intent_response("valid_intent_paid"),
+        ]
+        watcher = IntentWatcher(self.client.payment, backoff=self.backoff)
+        seen = []
+        watcher.on_update(seen.append)
+        watcher.watch(PAID_ID)
+        updates = [update async for update in watcher.updates()]
+
+        self.assertEqual(4, route.call_count)
+        self.assertEqual(seen, updates)
+        self.assertEqual(
+            [
+                ["intent_created"],
+                ["logged_in", "accounts_listed"],
+                ["intent_preprocessed", "intent_approved"],
+            ],
+            [[status.status for status in u.transitions] for u in updates],
+        )
+        self.assertEqual([False, False, True], [u.finished for u in updates])
+        self.assertEqual(set(), watcher.watching)
+
+    @respx.mock
+    async def test_run_many(self):
+        paid = respx.get(f"/api/v1/payment-intent/{PAID_ID}")
+        paid.side_effect = [
+            self.intent_response("valid_intent_paid", 1),
+            self.intent_response("valid_intent_paid"),
+        ]
+        rejected = self.load_json("valid_intent_unpaid")
+        rejected["current_status"] = "intent_rejected"
+        rejected["status_history"].append(
+            dict(rejected["status_history"][0], status="intent_rejected")
+        )
+        unpaid = respx.get(f"/api/v1/payment-intent/{UNPAID_ID}")
+        unpaid.side_effect = [
+            self.intent_response("valid_intent_unpaid"),
+            httpx.Response(200, json=rejected),
+        ]
+        watcher = IntentWatcher(self.client.payment, backoff=self.backoff)
+        updated = []
+
+        async def callback(update):
+            updated.append(update.intent_id)
+
+        watcher.on_update(callback)
+        watcher.watch(PAID_ID)
+        watcher.watch(UNPAID_ID)
+        intents = await watcher.run()
+        self.assertEqual("intent_approved", intents[PAID_ID].current_status)
+        self.assertEqual("intent_rejected", intents[UNPAID_ID].current_status)
+        self.assertEqual(4, len(updated))
+
+    @respx.mock
+    async def test_gives_up_after_errors(self):
+        respx.get(f"/api/v1/payment-intent/{PAID_ID}").mock(
+            return_value=httpx.Response(400, json={"message": "error"})
+        )
+        watcher = IntentWatcher(self.client.payment, backoff=self.backoff, max_errors=2)
+        watcher.watch(PAID_ID)
+        updates = [update async for update in watcher.updates()]
+        self.assertEqual(1, len(updates))
+        self.assertTrue(updates[0].finished)
+        self.assertIsInstance(updates[0].error, exceptions.BadRequestError)
+
+    @respx.mock
+    async def test_watch_while_running(self):
+        respx.get(f"/api/v1/payment-intent/{PAID_ID}").mock(
+            return_value=self.intent_response("valid_intent_paid")
+        )
+        watcher = IntentWatcher(self.client.payment, backoff=self.backoff)
+        updates = watcher.updates(keep_running=True)
+        asyncio.get_event_loop().call_later(0.01, watcher.watch, PAID_ID)
+        update = await updates.__anext__()
+        await updates.aclose()
+        self.assertEqual(PAID_ID, update.intent_id)
+        self.assertTrue(update.finished)
@@ -0,0 +1,68 @@
+import io
+import os
+import tempfile
+import zipfile
+
+from prometeo.sat.archive import CFDIArchive
+from prometeo.sat.client import SatAPIClient, DownloadRequest
+from tests.base_test_case import BaseTestCase
+import httpx
+import respx
+
+
+class TestArchive(BaseTestCase):
+    def setUp(self):
+        super(TestArchive, self).setUp()
+        self.client = SatAPIClient("test_api_key", "sandbox")
+        self.files = {
+            "A1B2C3.xml": b"<cfdi:Comprobante Total='100.00'/>",
+            "D4E5F6.xml": b"<cfdi:Comprobante Total='250.50'/>",
+        }
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as zip_file:
+            for name, content in self.files.items():
+                zip_file.writestr(name, content)
+        self.zip_content = buffer.getvalue()
+
+    def mock_download(self):
+        self.mock_get_request(
+            respx,
+            "/cfdi/download/50AD2BA1-27AE-4CC3-84FD-265E585A1F67/",
+            "cfdi_download",
+        )
+        respx.get("/download/4f3882b1d413f761ced91b6bd583f6ee.zip").mock(
+            return_value=httpx.Response(200, content=self.zip_content)
+        )
+
+    @respx.mock
+    async def test_iter_files(self):
+        self.mock_download()
+        request = DownloadRequest(
+            self.client, "test_session_key", "50AD2BA1-27AE-4CC3-84FD-265E585A1F67"
+        )
+        with await request.get_archive() as archive:
+            self.assertEqual(sorted(self.files), sorted(archive.namelist()))
+            self.assertEqual(self.files, dict(archive.iter_files()))
+            for name, stream in archive.iter_files(streams=True):
+                self.assertEqual(self.files[name], stream.read())
+
+    @respx.mock
+    async def test_rolls_over_to_disk(self):
+        self.mock_download()
+        request = DownloadRequest(
+            self.client, "test_session_key", "50AD2BA1-27AE-4CC3-84FD-265E585A1F67"
+        )
+        with await request.get_archive(max_memory=16) as archive:
+            self.assertTrue(archive._file._rolled)
+            self.assertEqual(self.files, dict(archive.iter_files()))
+
+    def test_extract_all(self):
+        with CFDIArchive(io.BytesIO(self.zip_content)) as archive:
+            with tempfile.TemporaryDirectory() as path:
+                paths = archive.extract_all(path, workers=2)
+                self.assertEqual(
+                    sorted(os.path.join(path, name) for name in self.files),
+                    sorted(paths),
+                )
+                with open(os.path.join(path, "A1B2C3.xml"), "rb") as f:
+                    self.assertEqual(self.files["A1B2C3.xml"], f.read())
@@ -1,6 +1,10 @@
+import io
+
+from prometeo import exceptions
 from prometeo.sat.client import SatAPIClient
 from prometeo.base_client import Download
 from tests.base_test_case import BaseTestCase
+import httpx
 import respx
 
 
@@ -17,3 +21,22 @@ class TestSession(BaseTestCase):
         download = Download(self.client, file_url)
         file = await download.get_file()
         self.assertEqual(file.decode(), file_content)
+
+    @respx.mock
+    async def test_write_to(self):
+        file_url = "/download/file.txt"
+        file_content = b"content" * 1000
+        respx.get(file_url).mock(return_value=httpx.Response(200, content=file_content))
+        download = Download(self.client, file_url)
+        file = io.BytesIO()
+        size = await download.write_to(file, chunk_size=100)
+        self.assertEqual(len(file_content), size)
+        self.assertEqual(file_content, file.getvalue())
+
+    @respx.mock
+    async def test_write_to_not_found(self):
+        file_url = "/download/file.txt"
+        self.mock_get_request(respx, file_url, "not_found", status_code=404)
+        download = Download(self.client, file_url)
+        with self.assertRaises(exceptions.NotFoundError):
+            await download.write_to(io.BytesIO())
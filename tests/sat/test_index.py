@@ -0,0 +1,88 @@
+import re
+from datetime import datetime
+
+from prometeo.sat.client import BillStatus, SatAPIClient, Session
+from prometeo.sat.index import CFDIIndex
+from prometeo.sat.parser import parse_cfdi
+from tests.base_test_case import BaseTestCase
+import respx
+
+
+class TestIndex(BaseTestCase):
+    def setUp(self):
+        super(TestIndex, self).setUp()
+        client = SatAPIClient("test_api_key", "sandbox")
+        self.session = Session(client, "logged_in", "test_session_key")
+        self.index = CFDIIndex()
+
+    def tearDown(self):
+        self.index.close()
+
+    @respx.mock
+    def test_index_listed_bills(self):
+        self.mock_get_request(respx, "/cfdi/emitted/", "cfdi_emitted_list")
+        self.mock_get_request(respx, "/cfdi/received/", "cfdi_received_list")
+        emitted = self.session.get_emitted_bills(
+            datetime(2018, 1, 1), datetime(2019, 1, 1), BillStatus.ANY, index=self.index
+        )
+        received = self.session.get_received_bills(
+            2018, 8, BillStatus.ANY, index=self.index
+        )
+
+        ids = {bill.id for bill in emitted} | {bill.id for bill in received}
+        self.assertEqual(len(ids), self.index.count())
+        bill = self.index.get(received[0].id)
+        self.assertEqual(received[0].receiver_rfc, bill.receiver_rfc)
+        self.assertEqual(received[0].emitted_date, bill.emitted_date)
+        self.assertTrue(bill.received)
+        self.assertIsNone(self.index.get("missing"))
+
+    @respx.mock
+    def test_dedupe_emitted_and_received(self):
+        self.mock_get_request(respx, "/cfdi/received/", "cfdi_received_list")
+        received = self.session.get_received_bills(2018, 8, BillStatus.ANY)
+        self.index.add_bills(received, received=True)
+        self.index.add_bills(received[:1], emitted=True)
+
+        self.assertEqual(len(received), self.index.count())
+        bill = self.index.get(received[0].id)
+        self.assertTrue(bill.emitted)
+        self.assertTrue(bill.received)
+        self.assertEqual(1, len(self.index.find(emitted=True)))
+
+    @respx.mock
+    def test_find(self):
+        self.mock_get_request(respx, "/cfdi/received/", "cfdi_received_list")
+        received = self.session.get_received_bills(2018, 8, BillStatus.ANY)
+        self.index.add_bills(received, received=True)
+        rfc = received[0].emitter_rfc
+
+        by_emitter = self.index.find(emitter_rfc=rfc)
+        self.assertEqual(
+            sum(1 for bill in received if bill.emitter_rfc == rfc), len(by_emitter)
+        )
+        by_date = self.index.find(
+            date_start=datetime(2018, 8, 29), date_end=datetime(2018, 8, 30)
+        )
+        self.assertEqual([received[0].id], [bill.id for bill in by_date])
+        self.assertEqual([], self.index.find(rfc="NOTANRFC"))
+
+    def test_add_parsed_documents(self):
+        with open("tests/fixtures/sat/cfdi_40.xml", "rb") as f:
+            document = parse_cfdi(f.read())
+        self.index.add_bills([document], emitted=True)
+        bill = self.index.get(document.id)
+        self.assertEqual(document.total_value, bill.total_value)
+        self.assertEqual(1, len(self.index.find(rfc=document.receiver_rfc)))
+
+    def test_skip_unstamped_documents(self):
+        with open("tests/fixtures/sat/cfdi_40.xml", "rb") as f:
+            content = f.read()
+        stamp = rb"<tfd:TimbreFiscalDigital[^>]*/>"
+        unstamped = parse_cfdi(re.sub(stamp, b"", content))
+        self.assertIsNone(unstamped.id)
+        self.index.add_bills([unstamped, unstamped], emitted=True)
+        self.assertEqual(0, self.index.count())
+        self.index.add_bills([unstamped, parse_cfdi(content)], emitted=True)
+        self.assertEqual(1, self.index.count())
+        self.assertEqual(1, len(self.index.find(emitted=True)))
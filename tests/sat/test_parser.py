@@ -0,0 +1,70 @@
+import io
+import zipfile
+from datetime import datetime
+from unittest import TestCase
+
+from prometeo.sat.archive import CFDIArchive
+from prometeo.sat.exceptions import CFDIParseError
+from prometeo.sat.parser import parse_archive, parse_cfdi, parse_many
+
+
+def load_xml(name):
+    with open(f"tests/fixtures/sat/{name}.xml", "rb") as f:
+        return f.read()
+
+
+class TestParser(TestCase):
+    def test_parse_cfdi_40(self):
+        document = parse_cfdi(load_xml("cfdi_40"))
+        self.assertEqual("6F1A2B3C-4D5E-4F60-8A7B-9C0D1E2F3A4B", document.id)
+        self.assertEqual("4.0", document.version)
+        self.assertEqual("EKU9003173C9", document.emitter_rfc)
+        self.assertEqual("XAXX010101000", document.receiver_rfc)
+        self.assertEqual("G03", document.receiver_cfdi_use)
+        self.assertEqual(datetime(2023, 3, 14, 10, 21, 5), document.emitted_date)
+        self.assertEqual(datetime(2023, 3, 14, 10, 21, 9), document.certification_date)
+        self.assertEqual(1624.0, document.total_value)
+        self.assertEqual(100.0, document.discount)
+        self.assertEqual(2, len(document.concepts))
+        self.assertEqual("Soporte tecnico", document.concepts[1].description)
+        self.assertEqual(2.0, document.concepts[1].quantity)
+        # Concept level taxes are not part of the summary
+        self.assertEqual(1, len(document.taxes))
+        self.assertEqual(224.0, document.taxes[0].amount)
+        self.assertEqual(0.16, document.taxes[0].rate)
+
+    def test_parse_cfdi_33(self):
+        document = parse_cfdi(io.BytesIO(load_xml("cfdi_33")))
+        self.assertEqual("3.3", document.version)
+        self.assertEqual("AB12CD34-EF56-7890-AB12-CD34EF567890", document.id)
+        self.assertEqual(1000.0, document.total_retained_taxes)
+        kinds = [tax.kind for tax in document.taxes]
+        self.assertEqual(["retained", "retained", "transferred"], kinds)
+
+    def test_parse_path(self):
+        document = parse_cfdi("tests/fixtures/sat/cfdi_33.xml")
+        self.assertEqual("AAA010101AAA", document.emitter_rfc)
+
+    def test_invalid_xml(self):
+        with self.assertRaises(CFDIParseError):
+            parse_cfdi(b"<cfdi:Comprobante")
+        with self.assertRaises(CFDIParseError):
+            parse_cfdi(b"<html></html>")
+
+    def test_parse_many_process_pool(self):
+        sources = [load_xml("cfdi_40"), load_xml("cfdi_33")] * 5
+        documents = list(parse_many(sources, processes=2, chunksize=3))
+        self.assertEqual(10, len(documents))
+        self.assertEqual(
+            ["4.0", "3.3"] * 5, [document.version for document in documents]
+        )
+
+    def test_parse_archive(self):
+        buffer = io.BytesIO()
+        with zipfile.ZipFile(buffer, "w") as zip_file:
+            zip_file.writestr("a.xml", load_xml("cfdi_40"))
+            zip_file.writestr("b.xml", load_xml("cfdi_33"))
+            zip_file.writestr("readme.txt", b"not a bill")
+        with CFDIArchive(buffer) as archive:
+            documents = list(parse_archive(archive))
+        self.assertEqual(["4.0", "3.3"], [document.version for document in documents])
@@ -1,16 +1,24 @@
+import asyncio
+import os
+import tempfile
 from datetime import datetime
 
 
+from prometeo import exceptions
 from prometeo.sat.client import (
     SatAPIClient,
     Session,
+    DownloadRequest,
+    wait_all,
     BillStatus,
     Motive,
     DocumentType,
     Status,
     SendType,
 )
+from prometeo.utils import Backoff
 from tests.base_test_case import BaseTestCase
+import httpx
 import respx
 from six.moves.urllib.parse import parse_qs, urlparse
 
@@ -69,6 +77,52 @@ class TestSession(BaseTestCase):
         self.assertEqual(datetime(2018, 8, 29, 20, 50, 3), bills[0].emitted_date)
         self.assertEqual(BillStatus.VALID.value, bills[0].status)
 
+    def mock_received_by_month(self, fixture_name, id_field):
+        def response(request):
+            data = self.load_json(fixture_name)
+            month = self.qs(request)["month"][0]
+            # The first bill is repeated every month, the rest are unique
+            for item in data["received"][1:]:
+                item[id_field] += "-" + month
+            return httpx.Response(200, json=data)
+
+        respx.get("/cfdi/received/").mock(side_effect=response)
+
+    @respx.mock
+    def test_get_received_bills_range(self):
+        self.mock_received_by_month("cfdi_received_list", "id")
+        bills = self.session.get_received_bills_range(2018, 11, 2019, 2, BillStatus.ANY)
+        months = sorted(
+            (self.qs(call.request)["year"][0], self.qs(call.request)["month"][0])
+            for call in respx.calls
+        )
+        self.assertEqual(
+            [("2018", "11"), ("2018", "12"), ("2019", "1"), ("2019", "2")], months
+        )
+        self.assertEqual(1 + 2 * 4, len(bills))
+        self.assertEqual(len(bills), len({bill.id for bill in bills}))
+
+    @respx.mock
+    async def test_iter_received_bills(self):
+        self.mock_received_by_month("cfdi_received_list", "id")
+        bills = [
+            bill
+            async for bill in self.session.iter_received_bills(
+                2018, 1, 2018, 3, BillStatus.ANY, concurrency=2
+            )
+        ]
+        self.assertEqual(1 + 2 * 3, len(bills))
+        self.assertEqual(len(bills), len({bill.id for bill in bills}))
+
+    @respx.mock
+    async def test_download_received_bills_range(self):
+        self.mock_received_by_month("cfdi_received_bulk_download", "request_id")
+        downloads = await self.session.download_received_bills_range(
+            2018, 1, 2018, 6, BillStatus.ANY
+        )
+        self.assertEqual(6, respx.calls.call_count)
+        self.assertEqual(12, len(downloads))
+
     @respx.mock
     def test_download_received(self):
         self.mock_get_request(respx, "/cfdi/received/", "cfdi_received_bulk_download")
@@ -169,6 +223,90 @@ class TestSession(BaseTestCase):
         download = await acks[0].get_download()
         self.assertEqual(download.url, "/download/4f3882b1d413f761ced91b6bd583f6ee.zip")
 
+    @respx.mock
+    async def test_download_acknowledgements(self):
+        self.mock_get_request(
+            respx, "/ccee/acknowledgment/", "ccee_list_acknowledgements"
+        )
+        for ack_id in ["0002180100000000325368", "0002180200000000313193"]:
+            self.mock_get_request(
+                respx,
+                "/ccee/acknowledgment/{}/".format(ack_id),
+                "ccee_download_acknowledgement",
+            )
+        self.mock_get_request(
+            respx,
+            "/ccee/acknowledgment/0002180300000000303749/",
+            "not_found",
+            status_code=404,
+        )
+        respx.get("/download/4f3882b1d413f761ced91b6bd583f6ee.zip").mock(
+            return_value=httpx.Response(200, content=b"zip content")
+        )
+        acks = await self.session.get_acknowledgements(
+            year=2018,
+            month_start=1,
+            month_end=5,
+            motive=Motive.AF,
+            document_type=DocumentType.CT,
+            status=Status.RECEIVED,
+            send_type=SendType.N,
+        )
+        progress = []
+        with tempfile.TemporaryDirectory() as path:
+            results = await self.session.download_acknowledgements(
+                acks,
+                path,
+                concurrency=2,
+                on_progress=lambda result, done, total: progress.append((done, total)),
+            )
+            results = {result.key: result for result in results}
+            self.assertTrue(results["0002180100000000325368"].ok)
+            file_path = results["0002180100000000325368"].result
+            self.assertEqual(os.path.join(path, "MOP1010266D3201801BN.zip"), file_path)
+            with open(file_path, "rb") as f:
+                self.assertEqual(b"zip content", f.read())
+            self.assertIsInstance(
+                results["0002180300000000303749"].error, exceptions.NotFoundError
+            )
+            self.assertEqual(2, len(os.listdir(path)))
+        self.assertEqual([(1, 3), (2, 3), (3, 3)], progress)
+
+    @respx.mock
+    async def test_download_acknowledgements_same_file_name(self):
+        self.mock_get_request(
+            respx, "/ccee/acknowledgment/", "ccee_list_acknowledgements"
+        )
+        self.mock_get_request(
+            respx,
+            "/ccee/acknowledgment/0002180100000000325368/",
+            "ccee_download_acknowledgement",
+        )
+
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, content=b"zip content")
+
+        route = respx.get("/download/4f3882b1d413f761ced91b6bd583f6ee.zip").mock(
+            side_effect=handler
+        )
+        acks = await self.session.get_acknowledgements(
+            year=2018,
+            month_start=1,
+            month_end=5,
+            motive=Motive.AF,
+            document_type=DocumentType.CT,
+            status=Status.RECEIVED,
+            send_type=SendType.N,
+        )
+        with tempfile.TemporaryDirectory() as path:
+            results = await self.session.download_acknowledgements(
+                [acks[0]] * 3, path, concurrency=3
+            )
+            self.assertTrue(all(result.ok for result in results))
+            self.assertEqual(["MOP1010266D3201801BN.zip"], os.listdir(path))
+        self.assertEqual(1, route.call_count)
+
     @respx.mock
     async def test_download_not_ready(self):
         self.mock_get_request(respx, "/cfdi/received/", "cfdi_received_bulk_download")
@@ -194,6 +332,59 @@ class TestSession(BaseTestCase):
         downloads = await self.session.download_received_bills(2018, 5, BillStatus.ANY)
         self.assertTrue(await downloads[0].is_ready())
 
+    @respx.mock
+    async def test_wait_ready(self):
+        respx.get("/cfdi/download/50AD2BA1-27AE-4CC3-84FD-265E585A1F67/").mock(
+            side_effect=[
+                httpx.Response(404, json=self.load_json("not_found")),
+                httpx.Response(404, json=self.load_json("not_found")),
+                httpx.Response(200, json=self.load_json("cfdi_download")),
+            ]
+        )
+        request = DownloadRequest(
+            self.session._client,
+            self.session_key,
+            "50AD2BA1-27AE-4CC3-84FD-265E585A1F67",
+        )
+        download = await request.wait_ready(backoff=Backoff(initial=0.01))
+        self.assertEqual(download.url, "/download/4f3882b1d413f761ced91b6bd583f6ee.zip")
+        self.assertEqual(3, respx.calls.call_count)
+
+    @respx.mock
+    async def test_wait_ready_timeout(self):
+        self.mock_get_request(
+            respx,
+            "/cfdi/download/50AD2BA1-27AE-4CC3-84FD-265E585A1F67/",
+            "not_found",
+            status_code=404,
+        )
+        request = DownloadRequest(
+            self.session._client,
+            self.session_key,
+            "50AD2BA1-27AE-4CC3-84FD-265E585A1F67",
+        )
+        with self.assertRaises(exceptions.WaitTimeoutError):
+            await request.wait_ready(timeout=0.05, backoff=Backoff(initial=0.01))
+
+    @respx.mock
+    async def test_wait_all(self):
+        respx.get("/cfdi/download/slow/").mock(
+            side_effect=[
+                httpx.Response(404, json=self.load_json("not_found")),
+                httpx.Response(200, json=self.load_json("cfdi_download")),
+            ]
+        )
+        self.mock_get_request(respx, "/cfdi/download/fast/", "cfdi_download")
+        requests = [
+            DownloadRequest(self.session._client, self.session_key, request_id)
+            for request_id in ["slow", "fast"]
+        ]
+        ready = [
+            request.request_id
+            async for request in wait_all(requests, backoff=Backoff(initial=0.01))
+        ]
+        self.assertEqual(["fast", "slow"], ready)
+
     @respx.mock
     def test_restore_session(self):
         self.mock_get_request(respx, "/cfdi/download/", "cfdi_list_downloads")
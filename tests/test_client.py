@@ -0,0 +1,34 @@
+import os
+import subprocess
+import sys
+from unittest import TestCase
+
+import prometeo
+from prometeo import Client
+from prometeo.curp import CurpAPIClient
+from prometeo.sat import SatAPIClient
+
+
+class TestClient(TestCase):
+    def test_import_is_lazy(self):
+        code = (
+            "import sys, prometeo; "
+            "print(sorted(m for m in sys.modules if m.startswith('prometeo')))"
+        )
+        root = os.path.dirname(os.path.dirname(prometeo.__file__))
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], cwd=root, text=True
+        )
+        self.assertEqual("['prometeo', 'prometeo.client']", output.strip())
+
+    def test_subpackage_attributes(self):
+        self.assertIs(CurpAPIClient, prometeo.curp.CurpAPIClient)
+        self.assertIn("crossborder", dir(prometeo))
+        with self.assertRaises(AttributeError):
+            prometeo.unknown
+
+    def test_api_clients(self):
+        client = Client("test_key")
+        self.assertIsInstance(client.curp, CurpAPIClient)
+        self.assertIsInstance(client.sat, SatAPIClient)
+        self.assertIs(client.curp, client.curp)
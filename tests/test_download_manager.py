@@ -0,0 +1,133 @@
+import asyncio
+import os
+import tempfile
+
+from prometeo import exceptions
+from prometeo.base_client import Download
+from prometeo.dian.client import DianAPIClient
+from prometeo.download_manager import DownloadManager, default_file_name
+from tests.base_test_case import BaseTestCase
+import httpx
+import respx
+
+
+class TestDownloadManager(BaseTestCase):
+    def setUp(self):
+        super(TestDownloadManager, self).setUp()
+        self.client = DianAPIClient("test_api_key", "sandbox")
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = self.tmp_dir.name
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_default_file_name(self):
+        download = Download(self.client, "/download/form-001.pdf")
+        name = default_file_name(download)
+        self.assertTrue(name.endswith(".pdf"))
+        self.assertEqual(name, default_file_name(Download(self.client, download.url)))
+        self.assertNotEqual(
+            name, default_file_name(Download(self.client, "/download/form-002.pdf"))
+        )
+
+    @respx.mock
+    async def test_download_all(self):
+        respx.get("/download/a.pdf").mock(
+            return_value=httpx.Response(200, content=b"a" * 100)
+        )
+        respx.get("/download/b.pdf").mock(
+            return_value=httpx.Response(200, content=b"b" * 50)
+        )
+        self.mock_get_request(respx, "/download/c.pdf", status_code=404, json={})
+        manager = DownloadManager(self.path)
+        results = await manager.download_all(
+            [
+                (Download(self.client, "/download/a.pdf"), "a.pdf"),
+                Download(self.client, "/download/b.pdf"),
+                Download(self.client, "/download/c.pdf"),
+            ]
+        )
+        by_url = {result.key: result for result in results}
+        self.assertEqual(
+            os.path.join(self.path, "a.pdf"), by_url["/download/a.pdf"].result
+        )
+        with open(by_url["/download/b.pdf"].result, "rb") as f:
+            self.assertEqual(b"b" * 50, f.read())
+        self.assertIsInstance(by_url["/download/c.pdf"].error, exceptions.NotFoundError)
+        self.assertEqual(
+            {"a.pdf", os.path.basename(by_url["/download/b.pdf"].result)},
+            set(os.listdir(self.path)),
+        )
+        self.assertEqual(2, manager.stats.downloaded)
+        self.assertEqual(1, manager.stats.failed)
+        self.assertEqual(150, manager.stats.bytes)
+
+    @respx.mock
+    async def test_skip_existing(self):
+        route = respx.get("/download/a.pdf").mock(
+            return_value=httpx.Response(200, content=b"new")
+        )
+        with open(os.path.join(self.path, "a.pdf"), "wb") as f:
+            f.write(b"old")
+        manager = DownloadManager(self.path)
+        download = Download(self.client, "/download/a.pdf")
+        await manager.download_all([(download, "a.pdf")])
+        self.assertFalse(route.called)
+        self.assertEqual(1, manager.stats.skipped)
+
+        manager = DownloadManager(self.path, overwrite=True)
+        await manager.download_all([(download, "a.pdf")])
+        with open(os.path.join(self.path, "a.pdf"), "rb") as f:
+            self.assertEqual(b"new", f.read())
+
+    @respx.mock
+    async def test_host_concurrency(self):
+        in_flight = 0
+        max_in_flight = 0
+
+        async def handler(request):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, content=b"data")
+
+        respx.get(url__regex=r"/download/\d+\.pdf").mock(side_effect=handler)
+        manager = DownloadManager(self.path, concurrency=10, host_concurrency=2)
+        downloads = [
+            Download(self.client, "/download/{}.pdf".format(i)) for i in range(8)
+        ]
+        results = await manager.download_all(downloads)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(2, max_in_flight)
+        self.assertGreater(manager.stats.throughput, 0)
+
+    @respx.mock
+    async def test_same_file_is_downloaded_once(self):
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, content=b"data")
+
+        route = respx.get("/download/a.pdf").mock(side_effect=handler)
+        manager = DownloadManager(self.path)
+        download = Download(self.client, "/download/a.pdf")
+        results = await manager.download_all([download] * 3)
+        self.assertTrue(all(result.ok for result in results))
+        self.assertEqual(1, route.call_count)
+        stats = manager.stats
+        self.assertEqual((1, 2, 0), (stats.downloaded, stats.skipped, stats.failed))
+        self.assertEqual([default_file_name(download)], os.listdir(self.path))
+
+    @respx.mock
+    async def test_concurrent_saves(self):
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, content=b"data")
+
+        respx.get("/download/a.pdf").mock(side_effect=handler)
+        download = Download(self.client, "/download/a.pdf")
+        file_path = os.path.join(self.path, "a.pdf")
+        sizes = await asyncio.gather(*[download.save(file_path) for _ in range(3)])
+        self.assertEqual([4, 4, 4], sizes)
+        self.assertEqual(["a.pdf"], os.listdir(self.path))
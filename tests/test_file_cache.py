@@ -0,0 +1,84 @@
+import asyncio
+import tempfile
+
+from prometeo import exceptions
+from prometeo.base_client import Download
+from prometeo.curp.client import CurpAPIClient
+from prometeo.file_cache import FileCache
+from tests.base_test_case import BaseTestCase
+import httpx
+import respx
+
+
+class TestFileCache(BaseTestCase):
+    def setUp(self):
+        super(TestFileCache, self).setUp()
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.cache = FileCache(self.tmp_dir.name, max_size=100)
+        self.client = CurpAPIClient("test_api_key", "sandbox", file_cache=self.cache)
+
+    def tearDown(self):
+        self.cache.close()
+        self.tmp_dir.cleanup()
+
+    @respx.mock
+    async def test_get_file_cached(self):
+        route = respx.get("/pdf/a.pdf").mock(
+            return_value=httpx.Response(200, content=b"a" * 10)
+        )
+        download = Download(self.client, "/pdf/a.pdf")
+        self.assertEqual(b"a" * 10, bytes(await download.get_file()))
+        self.assertEqual(b"a" * 10, bytes(await download.get_file()))
+        self.assertEqual(1, route.call_count)
+        self.assertEqual(b"a" * 10, bytes(self.cache.get(download.full_url)))
+
+    @respx.mock
+    async def test_concurrent_requests_deduplicated(self):
+        async def handler(request):
+            await asyncio.sleep(0.01)
+            return httpx.Response(200, content=b"content")
+
+        route = respx.get("/pdf/a.pdf").mock(side_effect=handler)
+        download = Download(self.client, "/pdf/a.pdf")
+        files = await asyncio.gather(*[download.get_file() for _ in range(5)])
+        self.assertEqual(1, route.call_count)
+        self.assertEqual({b"content"}, {bytes(file) for file in files})
+
+    @respx.mock
+    async def test_same_content_stored_once(self):
+        respx.get(url__regex=r"/pdf/[ab]\.pdf").mock(
+            return_value=httpx.Response(200, content=b"x" * 40)
+        )
+        await Download(self.client, "/pdf/a.pdf").get_file()
+        await Download(self.client, "/pdf/b.pdf").get_file()
+        self.assertEqual(40, self.cache.size())
+
+    @respx.mock
+    async def test_lru_eviction(self):
+        for name in "abc":
+            respx.get("/pdf/{}.pdf".format(name)).mock(
+                return_value=httpx.Response(200, content=name.encode() * 40)
+            )
+        a = Download(self.client, "/pdf/a.pdf")
+        b = Download(self.client, "/pdf/b.pdf")
+        c = Download(self.client, "/pdf/c.pdf")
+        await a.get_file()
+        await b.get_file()
+        await a.get_file()
+        await c.get_file()
+        self.assertIsNotNone(self.cache.get(a.full_url))
+        self.assertIsNone(self.cache.get(b.full_url))
+        self.assertIsNotNone(self.cache.get(c.full_url))
+        self.assertEqual(80, self.cache.size())
+
+    @respx.mock
+    async def test_errors_not_cached(self):
+        route = respx.get("/pdf/a.pdf")
+        route.side_effect = [
+            httpx.Response(500, json={"message": "error"}),
+            httpx.Response(200, content=b"content"),
+        ]
+        download = Download(self.client, "/pdf/a.pdf")
+        with self.assertRaises(exceptions.InternalAPIError):
+            await download.get_file()
+        self.assertEqual(b"content", bytes(await download.get_file()))
@@ -0,0 +1,91 @@
+import asyncio
+import time
+from datetime import datetime
+from unittest import TestCase, mock
+
+from prometeo import utils
+
+
+class TestParseDate(TestCase):
+    def test_fixed_formats(self):
+        self.assertEqual(
+            datetime(2019, 1, 12), utils.parse_date("12/01/2019", "%d/%m/%Y")
+        )
+        self.assertEqual(
+            datetime(1988, 3, 4), utils.parse_date("1988-03-04", "%Y-%m-%d")
+        )
+        self.assertEqual(
+            datetime(2018, 8, 29, 20, 50, 3),
+            utils.parse_date("2018-08-29T20:50:03", "%Y-%m-%dT%H:%M:%S"),
+        )
+
+    def test_matches_strptime(self):
+        values = [
+            ("1/2/2019", "%d/%m/%Y"),
+            ("2019-2-1", "%Y-%m-%d"),
+            ("01/02/2019 10:00", "%d/%m/%Y %H:%M"),
+        ]
+        for value, fmt in values:
+            self.assertEqual(
+                datetime.strptime(value, fmt), utils.parse_date(value, fmt)
+            )
+
+    def test_invalid_dates(self):
+        for value, fmt in [
+            ("31/02/2019", "%d/%m/%Y"),
+            ("2019-13-01", "%Y-%m-%d"),
+            ("12-01-2019", "%d/%m/%Y"),
+            ("2018-08-29 20:50:03", "%Y-%m-%dT%H:%M:%S"),
+            ("+1/01/2019", "%d/%m/%Y"),
+        ]:
+            with self.assertRaises(ValueError):
+                utils.parse_date(value, fmt)
+
+    def test_cached(self):
+        utils.parse_date.cache_clear()
+        first = utils.parse_date("12/01/2019", "%d/%m/%Y")
+        self.assertIs(first, utils.parse_date("12/01/2019", "%d/%m/%Y"))
+        self.assertEqual(1, utils.parse_date.cache_info().hits)
+
+
+class TestRateLimiter(TestCase):
+    def test_spacing(self):
+        limiter = utils.RateLimiter(100)
+
+        async def run():
+            start = time.monotonic()
+            for _ in range(6):
+                await limiter.acquire()
+            return time.monotonic() - start
+
+        elapsed = asyncio.get_event_loop().run_until_complete(run())
+        self.assertGreaterEqual(elapsed, 0.05)
+
+    def test_invalid_rate(self):
+        with self.assertRaises(ValueError):
+            utils.RateLimiter(0)
+
+
+class TestTTLCache(TestCase):
+    def test_expiration(self):
+        cache = utils.TTLCache(ttl=10)
+        with mock.patch("prometeo.utils.time.monotonic", return_value=100):
+            cache.set("key", None)
+            self.assertIn("key", cache)
+            self.assertEqual("default", cache.get("other", "default"))
+        with mock.patch("prometeo.utils.time.monotonic", return_value=110):
+            self.assertNotIn("key", cache)
+            self.assertEqual(0, len(cache))
+
+    def test_maxsize(self):
+        cache = utils.TTLCache(ttl=10, maxsize=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("a", 3)
+        cache.set("c", 4)
+        self.assertEqual(None, cache.get("b"))
+        self.assertEqual(3, cache.get("a"))
+        self.assertEqual(4, cache.get("c"))
+        cache.delete("a")
+        cache.delete("missing")
+        self.assertNotIn("a", cache)
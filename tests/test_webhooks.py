@@ -0,0 +1,180 @@
+import asyncio
+import json
+
+from prometeo import exceptions
+from prometeo.payment.models import PaymentIntent
+from prometeo.webhooks import LocalWebhookServer, WebhookHandler, make_delivery
+from tests.base_test_case import BaseTestCase
+import httpx
+
+
+def load_intent():
+    with open("tests/fixtures/payment/valid_intent_paid.json") as f:
+        return json.load(f)
+
+
+def make_event(event_id, event_type="payment.approved", payload=None):
+    return {
+        "event_type": event_type,
+        "event_id": event_id,
+        "timestamp": "2023-12-04T12:43:51Z",
+        "payload": payload if payload is not None else load_intent(),
+    }
+
+
+class TestWebhookHandler(BaseTestCase):
+    def setUp(self):
+        self.webhooks = WebhookHandler(verify_token="token", secret="secret")
+        self.received = []
+
+        @self.webhooks.on("payment.approved", model=PaymentIntent)
+        async def on_payment(event):
+            self.received.append(event)
+
+    async def test_handle(self):
+        body, headers = make_delivery(
+            [make_event("1"), make_event("2")], verify_token="token", secret="secret"
+        )
+        async with self.webhooks:
+            accepted = await self.webhooks.handle(body, headers)
+        self.assertEqual(["1", "2"], [event.event_id for event in accepted])
+        self.assertEqual(2, len(self.received))
+        self.assertIsInstance(self.received[0].payload, PaymentIntent)
+        self.assertEqual("intent_approved", self.received[0].payload.current_status)
+
+    async def test_redeliveries_dropped(self):
+        async with self.webhooks:
+            for events in ([make_event("1")], [make_event("1"), make_event("2")]):
+                body, headers = make_delivery(
+                    events, verify_token="token", secret="secret"
+                )
+                await self.webhooks.handle(body, headers)
+        self.assertEqual(["1", "2"], [event.event_id for event in self.received])
+
+    async def test_invalid_signature(self):
+        body, headers = make_delivery([make_event("1")], verify_token="token")
+        with self.assertRaises(exceptions.InvalidSignatureError):
+            await self.webhooks.handle(body, headers)
+        headers["X-Signature"] = "0" * 64
+        with self.assertRaises(exceptions.InvalidSignatureError):
+            await self.webhooks.handle(body, headers)
+        body, headers = make_delivery(
+            [make_event("1")], verify_token="other", secret="secret"
+        )
+        with self.assertRaises(exceptions.InvalidSignatureError):
+            await self.webhooks.handle(body, headers)
+        body, headers = make_delivery(
+            [make_event("1")], verify_token="tökën", secret="secret"
+        )
+        with self.assertRaises(exceptions.InvalidSignatureError):
+            await self.webhooks.handle(body, headers)
+        headers["X-Signature"] = "sïgnature"
+        with self.assertRaises(exceptions.InvalidSignatureError):
+            await self.webhooks.handle(body, headers)
+        body, headers = make_delivery([make_event("1")], verify_token=123)
+        with self.assertRaises(exceptions.InvalidSignatureError):
+            WebhookHandler(verify_token="token").parse(body, headers)
+        await self.webhooks.stop()
+        self.assertEqual([], self.received)
+
+    def test_verification_required(self):
+        with self.assertRaises(ValueError):
+            WebhookHandler()
+        WebhookHandler(secret="secret")
+
+    async def test_malformed_delivery(self):
+        webhooks = WebhookHandler(insecure=True)
+        webhooks.on("payment.approved", model=PaymentIntent)(asyncio.sleep)
+        with self.assertRaises(exceptions.WebhookError):
+            webhooks.parse(b"not json")
+        body, _ = make_delivery([make_event("1", payload={"intent_id": "1"})])
+        with self.assertRaises(exceptions.WebhookError):
+            webhooks.parse(body)
+        body, _ = make_delivery([make_event("1", "other", payload={"id": "1"})])
+        self.assertEqual({"id": "1"}, webhooks.parse(body)[0].payload)
+
+    async def test_handler_errors(self):
+        errors = []
+        webhooks = WebhookHandler(
+            on_error=lambda event, e: errors.append(e), insecure=True
+        )
+
+        @webhooks.on("*")
+        async def fail(event):
+            raise ValueError(event.event_id)
+
+        body, _ = make_delivery([make_event("1"), make_event("2")])
+        async with webhooks:
+            await webhooks.handle(body)
+        self.assertEqual({"1", "2"}, {str(e) for e in errors})
+
+    async def test_on_error_errors(self):
+        handled = []
+
+        def on_error(event, e):
+            raise RuntimeError("on_error failed")
+
+        webhooks = WebhookHandler(workers=1, on_error=on_error, insecure=True)
+
+        @webhooks.on("*")
+        async def fail_first(event):
+            handled.append(event.event_id)
+            if event.event_id == "1":
+                raise ValueError(event.event_id)
+
+        body, _ = make_delivery([make_event("1"), make_event("2")])
+        async with webhooks:
+            await webhooks.handle(body)
+        self.assertEqual(["1", "2"], handled)
+
+    async def test_failed_events_are_redelivered(self):
+        attempts = []
+        webhooks = WebhookHandler(on_error=lambda event, e: None, insecure=True)
+
+        @webhooks.on("*")
+        async def fail_once(event):
+            attempts.append(event.event_id)
+            if len(attempts) == 1:
+                raise ValueError(event.event_id)
+
+        body, _ = make_delivery([make_event("1")])
+        async with webhooks:
+            for _ in range(3):
+                await webhooks.handle(body)
+                await webhooks._queue.join()
+        self.assertEqual(["1", "1"], attempts)
+
+    async def test_bounded_workers(self):
+        running = 0
+        max_running = 0
+        webhooks = WebhookHandler(workers=2, queue_size=1, insecure=True)
+
+        @webhooks.on("*")
+        async def slow(event):
+            nonlocal running, max_running
+            running += 1
+            max_running = max(max_running, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+        body, _ = make_delivery([make_event(str(i)) for i in range(6)])
+        async with webhooks:
+            await webhooks.handle(body)
+        self.assertEqual(2, max_running)
+
+    async def test_local_server(self):
+        async with LocalWebhookServer(self.webhooks) as server:
+            body, headers = make_delivery(
+                [make_event("1")], verify_token="token", secret="secret"
+            )
+            async with httpx.AsyncClient() as client:
+                response = await client.post(server.url, content=body, headers=headers)
+                self.assertEqual(200, response.status_code)
+                self.assertEqual({"accepted": 1}, response.json())
+                response = await client.post(
+                    server.url, content=body, headers={"X-Signature": "bad"}
+                )
+                self.assertEqual(401, response.status_code)
+                response = await client.post(server.url, content=b"[")
+                self.assertEqual(401, response.status_code)
+        self.assertEqual(1, len(self.received))